@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Autocomplete index benchmark.
+
+Builds the suggestion index over the synthetic catalog used by the search
+benchmark and reports build time, node count and p50/p99 lookup latency for
+1- to 6-character prefixes (including the normalization `suggest` does).
+
+Usage (from backend/):
+    python -m benchmarks.autocomplete [--documents 100000] [--queries 20000]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import synthetic_catalog, percentile
+from services.autocomplete import AutocompleteIndex, AutocompleteService, Suggestion
+
+
+def suggestions_for(alternatives, recipes):
+    suggestions = [Suggestion(a["name"], "alternative", a["id"], a["rating"] * a["review_count"]) for a in alternatives]
+    suggestions += [Suggestion(r["title"], "recipe", r["id"], r["rating"] * r["review_count"]) for r in recipes]
+    brands = {}
+    for alternative in alternatives:
+        brands[alternative["brand"]] = brands.get(alternative["brand"], 0) + alternative["rating"] * alternative["review_count"]
+    suggestions += [Suggestion(brand, "brand", None, popularity) for brand, popularity in brands.items()]
+    return suggestions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    alternatives, recipes = synthetic_catalog(args.documents)
+    suggestions = suggestions_for(alternatives, recipes)
+
+    service = AutocompleteService(top_k=10, refresh_interval=3600)
+    start = time.perf_counter()
+    service.index = AutocompleteIndex(suggestions, service.top_k)
+    build_seconds = time.perf_counter() - start
+    index = service.index
+    print(
+        f"Indexed {len(suggestions)} suggestions as {len(index.keys)} keys "
+        f"({len(index.dense)} precomputed prefixes) in {build_seconds:.2f}s"
+    )
+
+    rng = random.Random(5)
+    texts = [suggestion.text for suggestion in suggestions]
+    print(f"{'prefix':<10}{'p50 us':>10}{'p99 us':>10}{'hits':>8}")
+    for length in range(1, 7):
+        prefixes = [rng.choice(texts)[:length] for _ in range(args.queries)]
+        samples, hits = [], 0
+        for prefix in prefixes:
+            begin = time.perf_counter()
+            results = service.suggest(prefix, 8)
+            samples.append((time.perf_counter() - begin) * 1_000_000)
+            hits += bool(results)
+        print(f"{length:<10}{percentile(samples, 0.5):>10.1f}{percentile(samples, 0.99):>10.1f}{hits / len(prefixes):>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Dashboard stats benchmark.
+
+Compares the legacy sequential `count_documents` implementation of the admin
+dashboard against `DashboardStatsEngine`: server round trips per call, p50/p99
+latency, and whether both produce the same `DashboardStats`. The engine is
+measured twice: over the raw `analytics` events and over the daily rollups.
+
+Usage (from backend/):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.dashboard_stats --seed
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+from models.analytics import DashboardStats
+from services.database import DatabaseService
+from services.dashboard_stats import DashboardStatsEngine
+from services.analytics import AnalyticsService
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Count commands sent to the server."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def legacy_dashboard_stats(database: DatabaseService) -> DashboardStats:
+    """The original route body, kept verbatim as the baseline."""
+    users_collection = await database.get_collection("users")
+    alternatives_collection = await database.get_collection("alternatives")
+    recipes_collection = await database.get_collection("recipes")
+    reviews_collection = await database.get_collection("reviews")
+    analytics_collection = await database.get_collection("analytics")
+
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_ago = today - timedelta(days=7)
+    month_ago = today - timedelta(days=30)
+
+    total_users = await users_collection.count_documents({})
+    active_users_today = await analytics_collection.count_documents({
+        "event_type": "user_login", "timestamp": {"$gte": today}
+    })
+    active_users_week = await analytics_collection.count_documents({
+        "event_type": "user_login", "timestamp": {"$gte": week_ago}
+    })
+    active_users_month = await analytics_collection.count_documents({
+        "event_type": "user_login", "timestamp": {"$gte": month_ago}
+    })
+    total_searches = await analytics_collection.count_documents({"event_type": "search"})
+    searches_today = await analytics_collection.count_documents({
+        "event_type": "search", "timestamp": {"$gte": today}
+    })
+    total_alternatives = await alternatives_collection.count_documents({})
+    total_recipes = await recipes_collection.count_documents({})
+    total_reviews = await reviews_collection.count_documents({})
+    pending_reviews = await reviews_collection.count_documents({"status": "pending"})
+
+    popular_searches = await analytics_collection.aggregate([
+        {"$match": {"event_type": "search"}},
+        {"$group": {"_id": "$event_data.meat_type", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": 10}
+    ]).to_list(length=None)
+
+    user_growth = []
+    for i in range(7):
+        date = today - timedelta(days=i)
+        count = await users_collection.count_documents({
+            "created_at": {"$gte": date, "$lt": date + timedelta(days=1)}
+        })
+        user_growth.append({"date": date.strftime("%Y-%m-%d"), "users": count})
+
+    search_trends = []
+    for i in range(7):
+        date = today - timedelta(days=i)
+        count = await analytics_collection.count_documents({
+            "event_type": "search",
+            "timestamp": {"$gte": date, "$lt": date + timedelta(days=1)}
+        })
+        search_trends.append({"date": date.strftime("%Y-%m-%d"), "searches": count})
+
+    return DashboardStats(
+        total_users=total_users,
+        active_users_today=active_users_today,
+        active_users_week=active_users_week,
+        active_users_month=active_users_month,
+        total_searches=total_searches,
+        searches_today=searches_today,
+        total_alternatives=total_alternatives,
+        total_recipes=total_recipes,
+        total_reviews=total_reviews,
+        pending_reviews=pending_reviews,
+        popular_searches=popular_searches,
+        user_growth=user_growth,
+        search_trends=search_trends
+    )
+
+
+async def seed(database: DatabaseService, users: int, events: int):
+    """Fill the benchmark database with synthetic users, reviews and events."""
+    now = datetime.utcnow()
+    meat_types = ["beef", "chicken", "pork", "fish", "lamb", "turkey", "duck"]
+    for name in ("users", "alternatives", "recipes", "reviews", "analytics"):
+        await (await database.get_collection(name)).delete_many({})
+
+    await (await database.get_collection("users")).insert_many([
+        {"email": f"user{i}@example.com", "created_at": now - timedelta(days=random.randint(0, 60))}
+        for i in range(users)
+    ])
+    await (await database.get_collection("alternatives")).insert_many([{"name": f"alt {i}"} for i in range(200)])
+    await (await database.get_collection("recipes")).insert_many([{"title": f"recipe {i}"} for i in range(100)])
+    await (await database.get_collection("reviews")).insert_many([
+        {"status": random.choice(["pending", "approved", "rejected"])} for _ in range(500)
+    ])
+
+    batch = []
+    for _ in range(events):
+        batch.append({
+            "event_type": random.choice(["search", "search", "user_login", "page_view"]),
+            "event_data": {"meat_type": random.choice(meat_types)},
+            "timestamp": now - timedelta(minutes=random.randint(0, 60 * 24 * 45)),
+        })
+        if len(batch) == 10000:
+            await (await database.get_collection("analytics")).insert_many(batch)
+            batch = []
+    if batch:
+        await (await database.get_collection("analytics")).insert_many(batch)
+
+    await (await database.get_collection("analytics")).create_index("event_type")
+    await (await database.get_collection("analytics")).create_index("timestamp")
+    await (await database.get_collection("users")).create_index("created_at")
+    await (await database.get_collection("reviews")).create_index("status")
+
+
+def comparable(stats: DashboardStats):
+    """Stats as a dict with popular-search ties put in a stable order."""
+    data = stats.model_dump()
+    data["popular_searches"] = sorted(data["popular_searches"], key=lambda item: (-item["count"], str(item["_id"])))
+    return data
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def measure(name, func, counter, iterations):
+    counter.count = 0
+    await func()
+    round_trips = counter.count
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    print(f"{name:<12} round trips: {round_trips:>3}   "
+          f"p50: {percentile(samples, 50):8.2f} ms   p99: {percentile(samples, 99):8.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="reset and seed the benchmark database")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--events", type=int, default=200000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--db", default=os.getenv("BENCH_DB_NAME", "cravekind_benchmark"))
+    args = parser.parse_args()
+
+    counter = RoundTripCounter()
+    database = DatabaseService()
+    database.client = AsyncIOMotorClient(os.environ["MONGO_URL"], event_listeners=[counter])
+    database.db = database.client[args.db]
+
+    if args.seed:
+        print(f"Seeding {args.users} users and {args.events} analytics events into '{args.db}'...")
+        await seed(database, args.users, args.events)
+
+    engine = DashboardStatsEngine(database, use_rollups=False)
+    rollup_engine = DashboardStatsEngine(database, use_rollups=True)
+    await AnalyticsService(database).rebuild_rollups()
+
+    legacy = await legacy_dashboard_stats(database)
+    current = await engine.compute()
+    from_rollups = await rollup_engine.compute()
+    print(f"Identical output: {comparable(legacy) == comparable(current)}")
+    print(f"Identical output (rollups): {comparable(legacy) == comparable(from_rollups)}")
+
+    await measure("legacy", lambda: legacy_dashboard_stats(database), counter, args.iterations)
+    await measure("engine", engine.compute, counter, args.iterations)
+    await measure("rollups", rollup_engine.compute, counter, args.iterations)
+
+    database.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
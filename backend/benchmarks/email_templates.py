@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Email template rendering micro-benchmark.
+
+Per-message cost of building the verification email with the previous
+inline f-string versus the compiled template, and of bulk rendering one
+template for many recipients with a shared, pre-bound body.
+
+Usage (from backend/):
+    python -m benchmarks.email_templates
+"""
+
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.email_templates import email_templates, EmailTemplateRegistry, layout
+
+
+def fstring_verification(user_name: str, verification_url: str) -> str:
+    """The previous inline f-string construction, reduced to its shape."""
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <style>
+                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
+                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
+                .header {{ background-color: #16a34a; color: white; padding: 30px; text-align: center; }}
+                .content {{ padding: 30px; background-color: #f8f9fa; }}
+                .button {{ background-color: #16a34a; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; }}
+                .footer {{ text-align: center; padding: 20px; font-size: 12px; color: #666; }}
+            </style>
+        </head>
+        <body>
+            <div class="container">
+                <div class="header">
+                    <h1>Welcome to CraveKind!</h1>
+                    <p>Satisfy your cravings, stay kind.</p>
+                </div>
+                <div class="content">
+                    <h2>Hi {user_name},</h2>
+                    <p>To get started, please verify your email address by clicking the button below:</p>
+                    <p style="text-align: center; margin: 30px 0;">
+                        <a href="{verification_url}" class="button">Verify Email Address</a>
+                    </p>
+                    <p><a href="{verification_url}">{verification_url}</a></p>
+                </div>
+                <div class="footer">
+                    <p>Happy exploring!<br>The CraveKind Team</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+
+def per_message_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    number = 20000
+    context = {"user_name": "Sarah <Green>", "verification_url": "https://cravekind.ca/verify-email?token=abc&x=1"}
+
+    print(f"{'f-string (unescaped)':<34} {per_message_us(lambda: fstring_verification(**context), number):7.2f} us/message")
+    print(f"{'compiled template (escaped)':<34} {per_message_us(lambda: email_templates.render('verification', **context), number):7.2f} us/message")
+
+    # Newsletter: large shared body, per-recipient name only
+    registry = EmailTemplateRegistry({
+        "newsletter": {
+            "subject": "CraveKind news for {{ user_name }}",
+            "html": layout("<h1>CraveKind News</h1>\n", "<h2>Hi {{ user_name }},</h2>\n{{ body|nl2br }}\n", ""),
+            "text": "Hi {{ user_name }},\n\n{{ body }}\n"
+        }
+    })
+    body = "Plant-based tips & new recipes this week.\n" * 200
+    recipients = [{"user_name": f"Reader {i}"} for i in range(10000)]
+
+    one_by_one = min(timeit.repeat(
+        lambda: [registry.render("newsletter", body=body, **recipient) for recipient in recipients], number=1, repeat=3
+    )) / len(recipients) * 1e6
+    bulk = min(timeit.repeat(
+        lambda: registry.render_many("newsletter", recipients, shared={"body": body}), number=1, repeat=3
+    )) / len(recipients) * 1e6
+
+    print(f"{'newsletter, render per recipient':<34} {one_by_one:7.2f} us/message")
+    print(f"{'newsletter, render_many (bound)':<34} {bulk:7.2f} us/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Facet index benchmark.
+
+Loads a synthetic set of alternatives into the bitset facet index and
+reports build time and p50/p99 latency of a combined call (filters plus
+counts for every dimension plus the first page of results) for a few
+typical filter combinations.
+
+Usage (from backend/):
+    python -m benchmarks.facets [--documents 100000] [--queries 500]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import percentile
+from services.facets import FacetIndex
+
+MEAT_TYPES = ["beef", "chicken", "pork", "fish", "lamb", "turkey", "duck"]
+TYPES = ["plant_based_meat", "whole_food", "supplement"]
+CERTIFICATIONS = ["Vegan", "Non-GMO", "Kosher", "Organic", "Gluten-Free", "Halal"]
+ALLERGENS = ["Soy", "Wheat", "Gluten", "Nuts", "Coconut", "Sesame"]
+
+
+def synthetic_alternatives(count: int, seed: int = 13):
+    rng = random.Random(seed)
+    brands = [f"Brand {i}" for i in range(200)]
+    return [
+        {
+            "id": f"alt-{i}",
+            "name": f"Alternative {i}",
+            "brand": rng.choice(brands),
+            "type": rng.choice(TYPES),
+            "meat_type": rng.choice(MEAT_TYPES),
+            "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 3)),
+            "allergens": rng.sample(ALLERGENS, rng.randint(0, 2)),
+            "price_range": f"${rng.randint(1, 14)}-{rng.randint(15, 20)} per package",
+            "rating": round(rng.uniform(3, 5), 1),
+            "review_count": rng.randint(0, 500),
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    alternatives = synthetic_alternatives(args.documents)
+    index = FacetIndex()
+    start = time.perf_counter()
+    index.load(alternatives)
+    print(f"Indexed {len(alternatives)} alternatives in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(17)
+    workloads = {
+        "no filters": lambda: ({}, []),
+        "meat type": lambda: ({"meat_type": [rng.choice(MEAT_TYPES)]}, []),
+        "meat type, no soy": lambda: ({"meat_type": [rng.choice(MEAT_TYPES)]}, ["Soy"]),
+        "3 dimensions": lambda: (
+            {"meat_type": [rng.choice(MEAT_TYPES)], "certification": ["Vegan"], "price_range": ["$3-6", "$6-10"]},
+            rng.sample(ALLERGENS, 2)
+        ),
+    }
+
+    print(f"{'workload':<22}{'p50 ms':>10}{'p99 ms':>10}{'matches':>10}")
+    for name, make in workloads.items():
+        samples, total = [], 0
+        for _ in range(args.queries):
+            filters, excluded = make()
+            begin = time.perf_counter()
+            result = index.query(filters, excluded)
+            samples.append((time.perf_counter() - begin) * 1000)
+            total += result["total"]
+        print(f"{name:<22}{percentile(samples, 0.5):>10.3f}{percentile(samples, 0.99):>10.3f}{total // args.queries:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Fuzzy (typo-tolerant) search benchmark.
+
+Indexes the names, brands and titles of the synthetic search-benchmark
+catalog, then queries misspelled names: one random edit per word longer
+than three characters. Reports build time, p50/p99 latency and how often
+the intended name (the document the query was made from, or one with the
+same name) comes back in the top 10.
+
+Usage (from backend/):
+    python -m benchmarks.fuzzy_index [--documents 100000] [--queries 1000]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import synthetic_catalog, percentile
+from services.fuzzy_index import FuzzyIndex
+from services.search_index import tokenize
+
+
+def misspell(rng: random.Random, word: str) -> str:
+    if len(word) <= 3:
+        return word
+    position = rng.randrange(len(word))
+    edit = rng.choice(["delete", "insert", "replace", "swap"])
+    if edit == "delete":
+        return word[:position] + word[position + 1:]
+    if edit == "insert":
+        return word[:position] + rng.choice(string.ascii_lowercase) + word[position:]
+    if edit == "replace":
+        return word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+    position = min(position, len(word) - 2)
+    return word[:position] + word[position + 1] + word[position] + word[position + 2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    alternatives, recipes = synthetic_catalog(args.documents)
+    index = FuzzyIndex()
+    start = time.perf_counter()
+    index.load({"alternatives": alternatives, "recipes": recipes})
+    print(f"Indexed {len(index._entries)} names in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(3)
+    documents = [("alternatives", a, a["name"]) for a in alternatives] + [("recipes", r, r["title"]) for r in recipes]
+    samples, found = [], 0
+    for _ in range(args.queries):
+        collection_name, document, name = rng.choice(documents)
+        query = " ".join(misspell(rng, word) for word in tokenize(name))
+        begin = time.perf_counter()
+        results = index.search(query, limit=10)
+        samples.append((time.perf_counter() - begin) * 1000)
+        found += any(
+            result["id"] == document["id"] or tokenize(result["document"].get("name") or result["document"].get("title")) == tokenize(name)
+            for result in results
+        )
+
+    print(f"p50 {percentile(samples, 0.5):.3f} ms, p99 {percentile(samples, 0.99):.3f} ms, "
+          f"intended name in top 10: {found / args.queries:.1%}")
+
+
+if __name__ == "__main__":
+    main()
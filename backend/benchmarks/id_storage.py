@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Document id storage benchmark.
+
+Inserts the same synthetic analytics-style documents (an `id` and a
+`user_id` each) into two scratch collections, one with string ids and one
+with binary UUIDs through `IdCodec`. Indexes `id` and `user_id` in both,
+then compares document and index sizes from `collStats` and the p50/p99
+latency of lookups by `id` and by `user_id`, codec included. Without
+MONGO_URL only the BSON size of one document and the codec's cost per
+document are reported.
+
+Usage (from backend/):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.id_storage [--documents 200000] [--lookups 2000]
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+
+import bson
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import percentile
+from services.id_codec import IdCodec, decode_ids
+
+MODES = ("string", "binary")
+
+
+def synthetic_documents(count: int, users: int, seed: int = 11):
+    rng = random.Random(seed)
+    user_ids = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(users)]
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "user_id": rng.choice(user_ids),
+            "event_type": "search",
+            "event_data": {"meat_type": "beef"},
+            "timestamp": start + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ], user_ids
+
+
+def codec_cost(documents):
+    codec = IdCodec("binary")
+    start = time.perf_counter()
+    encoded = [codec.encode(document) for document in documents]
+    encode_us = (time.perf_counter() - start) * 1e6 / len(documents)
+    start = time.perf_counter()
+    for document in encoded:
+        decode_ids(document)
+    decode_us = (time.perf_counter() - start) * 1e6 / len(documents)
+    return encoded, encode_us, decode_us
+
+
+async def lookups(collection, field: str, values, iterations: int):
+    samples = []
+    for value in values[:iterations]:
+        start = time.perf_counter()
+        await collection.find_one({field: value}, {"_id": 0})
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200_000)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--db", default=os.getenv("BENCH_DB_NAME", "cravekind_benchmark"))
+    args = parser.parse_args()
+
+    documents, user_ids = synthetic_documents(args.documents, args.users)
+    encoded, encode_us, decode_us = codec_cost(documents)
+    print(f"BSON document: {len(bson.encode(documents[0]))} bytes with string ids, "
+          f"{len(bson.encode(encoded[0]))} with binary ids")
+    print(f"codec: encode {encode_us:.2f} us, decode {decode_us:.2f} us per document")
+
+    if not os.getenv("MONGO_URL"):
+        print("MONGO_URL not set: skipping the storage and lookup comparison")
+        return
+
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[args.db]
+    rng = random.Random(5)
+    probe_ids = [document["id"] for document in rng.sample(documents, min(args.lookups, len(documents)))]
+    probe_users = [rng.choice(user_ids) for _ in range(args.lookups)]
+
+    print(f"\n{'':<8}{'data MB':>10}{'id idx MB':>11}{'user idx MB':>13}"
+          f"{'id p50':>9}{'id p99':>9}{'user p50':>10}{'user p99':>10}   (ms)")
+    try:
+        for mode in MODES:
+            raw = db[f"id_storage_{mode}"]
+            await raw.drop()
+            codec = IdCodec("binary" if mode == "binary" else "string")
+            collection = codec.wrap(raw)
+            for start in range(0, len(documents), 10_000):
+                await collection.insert_many([dict(document) for document in documents[start:start + 10_000]], ordered=False)
+            await raw.create_index("id", unique=True)
+            await raw.create_index("user_id")
+            stats = await db.command("collStats", raw.name)
+            sizes = stats.get("indexSizes", {})
+
+            by_id = await lookups(collection, "id", probe_ids, args.lookups)
+            by_user = await lookups(collection, "user_id", probe_users, args.lookups)
+            print(f"{mode:<8}{stats['size'] / 2**20:>10.2f}{sizes.get('id_1', 0) / 2**20:>11.2f}"
+                  f"{sizes.get('user_id_1', 0) / 2**20:>13.2f}"
+                  f"{percentile(by_id, 0.5):>9.3f}{percentile(by_id, 0.99):>9.3f}"
+                  f"{percentile(by_user, 0.5):>10.3f}{percentile(by_user, 0.99):>10.3f}")
+    finally:
+        for mode in MODES:
+            await db[f"id_storage_{mode}"].drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Ingredient index benchmark.
+
+"Recipes I can make with these ingredients, ranked by coverage" over a
+large synthetic recipe corpus, answered two ways: scanning every recipe's
+normalized ingredient set in Python (what `$in` plus post-filtering amounts
+to) and the ingredient index.
+
+Usage (from backend/):
+    python -m benchmarks.ingredient_index [--recipes 200000] [--queries 200] [--have 8]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import percentile, vocabulary
+from models.recipes import PANTRY_STAPLES, normalize_ingredients
+from services.ingredient_index import IngredientIndex
+
+AMOUNTS = ["1 cup", "2 tbsp", "1 tsp", "1/2 cup", "3", "1 can", "200g", ""]
+PREPARATIONS = ["", ", diced", ", minced", ", chopped", ", drained and rinsed"]
+
+
+def synthetic_recipes(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    names, cumulative = vocabulary(rng, 3_000)
+    recipes = []
+    for i in range(count):
+        ingredients = {rng.choices(names, cum_weights=cumulative)[0] for _ in range(rng.randint(5, 14))}
+        lines = [f"{rng.choice(AMOUNTS)} {name}{rng.choice(PREPARATIONS)}".strip() for name in ingredients]
+        if rng.random() < 0.7:
+            lines.append("Salt and pepper")
+        recipes.append({
+            "id": f"recipe-{i}",
+            "title": f"Recipe {i}",
+            "ingredients": lines,
+            "rating": round(rng.uniform(3, 5), 1),
+            "review_count": rng.randint(0, 500),
+        })
+    return recipes, names, cumulative
+
+
+def python_query(recipe_sets, have, limit: int = 20):
+    """Coverage of every recipe by set intersection, then a full sort."""
+    available = set(have) | PANTRY_STAPLES
+    scored = []
+    for position, names in enumerate(recipe_sets):
+        if names and not names.isdisjoint(have):
+            matched = len(names & available)
+            scored.append((-matched / len(names), len(names) - matched, position))
+    scored.sort()
+    return len(scored), [round(-coverage, 4) for coverage, _, _ in scored[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recipes", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--have", type=int, default=8)
+    args = parser.parse_args()
+
+    recipes, names, cumulative = synthetic_recipes(args.recipes)
+    index = IngredientIndex()
+    start = time.perf_counter()
+    index.load(recipes)
+    print(f"Indexed {args.recipes} recipes in {time.perf_counter() - start:.2f}s")
+    recipe_sets = [set(normalize_ingredients(recipe["ingredients"])) for recipe in recipes]
+
+    rng = random.Random(3)
+    python_samples, index_samples, mismatches = [], [], 0
+    for _ in range(args.queries):
+        have = {rng.choices(names, cum_weights=cumulative)[0] for _ in range(args.have)}
+
+        start = time.perf_counter()
+        expected_total, expected = python_query(recipe_sets, have)
+        python_samples.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        result = index.query(have)
+        index_samples.append((time.perf_counter() - start) * 1000)
+
+        coverages = [item["coverage"] for item in result["items"]]
+        mismatches += result["total"] != expected_total or coverages != expected
+
+    for label, samples in (("python scan", python_samples), ("ingredient index", index_samples)):
+        print(f"{label:18s} p50 {percentile(samples, 0.5):8.2f} ms  p99 {percentile(samples, 0.99):8.2f} ms")
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Nutrition query benchmark.
+
+"protein >= 15g and sodium <= 400mg, sorted by protein per calorie" over a
+synthetic catalog, answered two ways: parsing each document's nutrition
+strings in Python (what any query had to do before nutrition_values), and
+the NumPy nutrition store.
+
+Usage (from backend/):
+    python -m benchmarks.nutrition [--documents 100000] [--iterations 50]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.alternatives import NUTRIENT_UNITS, parse_quantity
+from services.nutrition import NutritionStore, parse_condition, parse_sort
+
+
+def synthetic_alternatives(count: int, seed: int = 21):
+    rng = random.Random(seed)
+    alternatives = []
+    for i in range(count):
+        nutrition = {
+            "protein": f"{rng.randint(2, 30)}g",
+            "iron": f"{rng.uniform(0.5, 8):.1f}mg",
+            "calories": str(rng.randint(80, 400)),
+            "fat": f"{rng.randint(0, 25)}g",
+            "fiber": f"{rng.randint(0, 12)}g",
+            "b12": f"{rng.uniform(0, 3):.1f}mcg",
+            "sodium": f"{rng.randint(5, 900)}mg",
+        }
+        if rng.random() < 0.8:
+            nutrition["cholesterol"] = "0mg"
+        alternatives.append({"id": f"alt-{i}", "name": f"Alternative {i}", "nutrition": nutrition})
+    return alternatives
+
+
+def python_query(alternatives, limit: int = 20):
+    """Per-document parsing, filtering and sorting."""
+    matches = []
+    for alternative in alternatives:
+        nutrition = alternative["nutrition"]
+        protein = parse_quantity(nutrition.get("protein"), NUTRIENT_UNITS["protein"])
+        sodium = parse_quantity(nutrition.get("sodium"), NUTRIENT_UNITS["sodium"])
+        calories = parse_quantity(nutrition.get("calories"), NUTRIENT_UNITS["calories"])
+        if protein is None or sodium is None or protein < 15 or sodium > 400:
+            continue
+        matches.append((protein / calories if calories else float("-inf"), alternative["id"]))
+    matches.sort(key=lambda match: -match[0])
+    return matches[:limit]
+
+
+def timed(function, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return result, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    alternatives = synthetic_alternatives(args.documents)
+    store = NutritionStore()
+    start = time.perf_counter()
+    store.load(alternatives)
+    print(f"Loaded {args.documents} alternatives in {time.perf_counter() - start:.2f}s")
+
+    conditions = [parse_condition("protein>=15g"), parse_condition("sodium<=400mg")]
+    sort = parse_sort("protein/calories")
+    expected, python_ms = timed(lambda: python_query(alternatives), max(1, args.iterations // 10))
+    result, numpy_ms = timed(lambda: store.query(conditions, sort), args.iterations)
+
+    # Ties may come back in a different order, so compare the scores
+    same = [round(score, 6) for score, _ in expected] == [item["sort_value"] for item in result["items"]]
+    print(f"python parse+filter+sort  median {python_ms:8.2f} ms")
+    print(f"numpy store               median {numpy_ms:8.2f} ms  ({python_ms / numpy_ms:.0f}x)")
+    print(f"matches {result['total']}, same top 20: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+In-memory search index benchmark.
+
+Builds the BM25 index over a synthetic catalog (default 100k documents,
+split between alternatives and recipes) and reports build time,
+p50/p99 latency for full-word, multi-word and prefix queries, and recall
+against an exhaustive search (no stop terms, no round limit): the share
+of results scoring at least the exhaustive top 10's last score.
+
+Usage (from backend/):
+    python -m benchmarks.search_index [--documents 100000] [--queries 2000] [--max-rounds 80]
+"""
+
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.search_index import SearchIndex
+
+MEAT_TYPES = ["beef", "chicken", "pork", "fish", "seafood", "turkey", "lamb", "bacon", "sausage", "deli_meat"]
+BRANDS = ["Beyond", "Impossible", "Gardein", "Tofurky", "Quorn", "Lightlife", "Field Roast", "MorningStar", "Sweet Earth", "Oumph"]
+WORDS = (
+    "plant based protein crispy smoky savory juicy tender grilled seasoned marinated tempeh seitan tofu "
+    "jackfruit mushroom lentil chickpea soy pea wheat oat coconut spicy sweet tangy burger patty nugget "
+    "strip fillet sausage bacon crumble ground roast slice wing meatball shred taco chili curry stew "
+    "quick easy weeknight family classic hearty light fresh golden rich creamy umami"
+).split()
+SYLLABLES = ["ba", "ko", "ri", "ta", "men", "lo", "su", "ve", "na", "dor", "pi", "ex", "ul", "gra", "fen", "mo"]
+
+
+def vocabulary(rng: random.Random, size: int):
+    """Food words plus generated words, with Zipf-like (1/rank) frequencies."""
+    words = list(WORDS)
+    generated = set()
+    while len(generated) < size:
+        generated.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    words.extend(sorted(generated))
+    rng.shuffle(words)
+    cumulative, total = [], 0.0
+    for rank in range(1, len(words) + 1):
+        total += 1.0 / rank
+        cumulative.append(total)
+    return words, cumulative
+
+
+def sentence(rng: random.Random, words, cumulative, length: int) -> str:
+    return " ".join(rng.choices(words, cum_weights=cumulative, k=length))
+
+
+def synthetic_catalog(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    words, cumulative = vocabulary(rng, 20_000)
+    alternatives, recipes = [], []
+    for i in range(count):
+        if i % 2 == 0:
+            alternatives.append({
+                "id": f"alt-{i}",
+                "name": f"{sentence(rng, words, cumulative, 2).title()} {rng.choice(MEAT_TYPES).title()}",
+                "brand": rng.choice(BRANDS),
+                "description": sentence(rng, words, cumulative, rng.randint(8, 30)),
+                "meat_type": rng.choice(MEAT_TYPES),
+                "rating": round(rng.uniform(3, 5), 1),
+                "review_count": rng.randint(0, 500),
+            })
+        else:
+            recipes.append({
+                "id": f"recipe-{i}",
+                "title": f"{sentence(rng, words, cumulative, 3).title()}",
+                "description": sentence(rng, words, cumulative, rng.randint(10, 40)),
+                "meat_type": rng.choice(MEAT_TYPES),
+                "rating": round(rng.uniform(3, 5), 1),
+                "review_count": rng.randint(0, 500),
+            })
+    return alternatives, recipes
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(index: SearchIndex, queries, collection_name=None):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, collection_name, limit=10)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def recall(index: SearchIndex, queries, limit: int = 10) -> float:
+    bounds = index.stop_term_ratio, index.max_rounds
+    index.stop_term_ratio, index.max_rounds = 1.0, sys.maxsize
+    exhaustive = [[result["score"] for result in index.search(query, limit=limit)] for query in queries]
+    index.stop_term_ratio, index.max_rounds = bounds
+    shares = []
+    for query, expected in zip(queries, exhaustive):
+        if expected:
+            found = [result["score"] for result in index.search(query, limit=limit)]
+            shares.append(sum(score >= expected[-1] for score in found) / len(expected))
+    return statistics.mean(shares) if shares else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--max-rounds", type=int, help="threshold algorithm rounds (default: the index's)")
+    args = parser.parse_args()
+
+    alternatives, recipes = synthetic_catalog(args.documents)
+    index = SearchIndex()
+    if args.max_rounds:
+        index.max_rounds = args.max_rounds
+
+    start = time.perf_counter()
+    index.add_many("alternatives", alternatives)
+    index.add_many("recipes", recipes)
+    build_seconds = time.perf_counter() - start
+    print(f"Indexed {len(index)} documents, {len(index._postings)} terms in {build_seconds:.2f}s")
+
+    rng = random.Random(11)
+    names = [document["name"] for document in alternatives] + [document["title"] for document in recipes]
+    workloads = {
+        "brand": [rng.choice(BRANDS) for _ in range(args.queries)],
+        "common word": [rng.choice(WORDS) for _ in range(args.queries)],
+        "two words": [f"{rng.choice(WORDS)} {rng.choice(MEAT_TYPES)}" for _ in range(args.queries)],
+        "product name": [rng.choice(names) for _ in range(args.queries)],
+        "prefix (3 chars)": [rng.choice(names)[:3] for _ in range(args.queries)],
+    }
+
+    print(f"{'workload':<20}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'recall':>10}")
+    for name, queries in workloads.items():
+        samples = measure(index, queries)
+        print(
+            f"{name:<20}{percentile(samples, 0.5):>10.3f}{percentile(samples, 0.99):>10.3f}"
+            f"{statistics.mean(samples):>10.3f}{recall(index, queries[:300]):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
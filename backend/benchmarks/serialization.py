@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Response serialization benchmark.
+
+For each read endpoint that now answers through `ResponseSerializer`,
+serializes the same synthetic Mongo documents two ways and reports
+p50/p99 per response: the previous path (a model built per document,
+then FastAPI's `response_model` validation, `jsonable_encoder` and
+`json.dumps`) and the fast path (projection-shaped dicts encoded by
+orjson). Also checks that both produce the same JSON.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--iterations 200]
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.search_index import percentile
+from models.crm import Contact, ContactListItem, ContactPage, ContactResponse, ContactSource, ContactStatus
+from services.serialization import FastJSONResponse, ResponseSerializer
+from server import StatusCheck
+
+
+def synthetic_contacts(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    contacts = []
+    for i in range(count):
+        created_at = start + timedelta(minutes=i, milliseconds=rng.randint(0, 999))
+        contact = Contact(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"contact{i}@example.com",
+            company=rng.choice([None, "Plant Co", "Green Foods"]),
+            message="I would like to know more about plant-based alternatives.",
+            source=rng.choice(list(ContactSource)),
+            status=rng.choice(list(ContactStatus)),
+            tags=rng.sample(["vegan", "flexitarian", "b2b", "newsletter"], 2),
+            emails_sent=rng.randint(0, 5),
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        contacts.append({"_id": ObjectId(), **contact.model_dump()})
+    return contacts
+
+
+def synthetic_status_checks(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        {"_id": ObjectId(), **StatusCheck(client_name=f"client-{i}", timestamp=start + timedelta(seconds=i)).model_dump()}
+        for i in range(count)
+    ]
+
+
+def project(documents, projection):
+    """What Mongo returns for `projection`."""
+    return [{key: document[key] for key in projection if key != "_id" and key in document} for document in documents]
+
+
+async def legacy(response_model, documents, build):
+    field = create_response_field(name="response", type_=response_model)
+    content = await serialize_response(field=field, response_content=build(documents))
+    return JSONResponse(content).body
+
+
+async def measure(name: str, slow, fast, iterations: int):
+    identical = json.loads(await slow()) == json.loads(fast())
+    timings = {}
+    for label, func in (("legacy", slow), ("fast", fast)):
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            result = func()
+            if asyncio.iscoroutine(result):
+                await result
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[label] = samples
+    print(
+        f"{name:<24}{percentile(timings['legacy'], 0.5):>10.3f}{percentile(timings['legacy'], 0.99):>10.3f}"
+        f"{percentile(timings['fast'], 0.5):>10.3f}{percentile(timings['fast'], 0.99):>10.3f}"
+        f"{percentile(timings['legacy'], 0.5) / percentile(timings['fast'], 0.5):>9.1f}x   {identical}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    contacts = synthetic_contacts(1000)
+    status_checks = synthetic_status_checks(1000)
+    contact_serializer = ResponseSerializer(ContactResponse)
+    contact_list_serializer = ResponseSerializer(ContactListItem)
+    status_check_serializer = ResponseSerializer(StatusCheck)
+
+    contacts_page = project(contacts[:100], contact_serializer.projection)
+    list_page = project(contacts[:50], contact_list_serializer.projection)
+    one_contact = contacts_page[:1]
+    statuses = project(status_checks, status_check_serializer.projection)
+
+    print(f"{'endpoint':<24}{'legacy p50':>10}{'p99':>10}{'fast p50':>10}{'p99':>10}{'speedup':>10}   same JSON   (ms)")
+    await measure(
+        "GET /admin/contacts",
+        lambda: legacy(List[ContactResponse], contacts[:100], lambda rows: [ContactResponse(**row) for row in rows]),
+        lambda: contact_serializer.list_response(contacts_page).body,
+        args.iterations
+    )
+    await measure(
+        "GET /admin/contacts/page",
+        lambda: legacy(ContactPage, list_page, lambda rows: ContactPage(items=[ContactListItem(**row) for row in rows])),
+        lambda: FastJSONResponse({"items": contact_list_serializer.documents(list_page), "next_cursor": None}).body,
+        args.iterations
+    )
+    await measure(
+        "GET /admin/contacts/{id}",
+        lambda: legacy(ContactResponse, one_contact, lambda rows: ContactResponse(**rows[0])),
+        lambda: contact_serializer.response(one_contact[0]).body,
+        args.iterations
+    )
+    await measure(
+        "GET /api/status",
+        lambda: legacy(List[StatusCheck], status_checks, lambda rows: [StatusCheck(**row) for row in rows]),
+        lambda: status_check_serializer.list_response(statuses).body,
+        args.iterations
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
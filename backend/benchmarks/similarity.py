@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Nutrient-similarity benchmark.
+
+Builds the similarity index over a synthetic catalog, then times the ways
+to answer "alternatives most like this one": a Python loop computing cosine
+similarity per document, one NumPy matrix-vector product, and the
+precomputed neighbour list. Also times an incremental update of a few
+alternatives against a full rebuild.
+
+Usage (from backend/):
+    python -m benchmarks.similarity [--documents 20000] [--iterations 50] [--changed 5]
+"""
+
+from pathlib import Path
+import argparse
+import math
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.nutrition import synthetic_alternatives, timed
+from services.similarity import SimilarityIndex
+
+
+def python_similar(vectors, position: int, k: int = 10):
+    """Cosine similarity against every alternative, one document at a time."""
+    target = vectors[position]
+    scores = []
+    for other, vector in enumerate(vectors):
+        if other != position:
+            dot = sum(a * b for a, b in zip(target, vector))
+            norm = math.sqrt(sum(a * a for a in vector)) * math.sqrt(sum(a * a for a in target))
+            scores.append((dot / norm if norm else 0.0, other))
+    scores.sort(reverse=True)
+    return scores[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--changed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    alternatives = synthetic_alternatives(args.documents)
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    index.load(alternatives)
+    build_s = time.perf_counter() - start
+    print(f"Built neighbour lists for {args.documents} alternatives in {build_s:.2f}s")
+
+    vectors = index._vectors.tolist()
+    position = rng.randrange(args.documents)
+    alternative_id = alternatives[position]["id"]
+    expected, python_ms = timed(lambda: python_similar(vectors, position), max(1, args.iterations // 10))
+    _, matvec_ms = timed(lambda: index._top(index._vectors @ index._vectors[position], 11), args.iterations)
+    result, lookup_ms = timed(lambda: index.similar(alternative_id), args.iterations)
+
+    same = [round(score, 4) for score, _ in expected] == [item["similarity"] for item in result]
+    print(f"python cosine loop        median {python_ms:8.3f} ms")
+    print(f"numpy matrix-vector       median {matvec_ms:8.3f} ms  ({python_ms / matvec_ms:.0f}x)")
+    print(f"precomputed neighbours    median {lookup_ms:8.3f} ms  ({python_ms / lookup_ms:.0f}x)")
+    print(f"same top 10: {same}")
+
+    changed = []
+    for alternative in rng.sample(alternatives, args.changed):
+        changed.append(dict(alternative, nutrition=rng.choice(alternatives)["nutrition"]))
+    start = time.perf_counter()
+    index.update(changed)
+    update_ms = (time.perf_counter() - start) * 1000
+    print(f"incremental update of {args.changed}: {update_ms:.1f} ms (full rebuild {build_s * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
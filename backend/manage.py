@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+CraveKind backend management commands.
+
+Usage (from backend/):
+    python manage.py --help
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+import asyncio
+import logging
+
+import typer
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).parent / '.env')
+
+from services.database import db_service
+from services.id_codec import migrate_ids
+from services.indexes import reconcile_indexes
+from services.query_plans import advise
+from services.analytics import analytics_service
+from services.nutrition import nutrition_store
+from services.recommendations import recommendation_service
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+app = typer.Typer(help="CraveKind backend management commands.")
+
+
+def run(coro_factory, ensure_indexes: bool = True):
+    """Run an async command with a database connection."""
+    async def runner():
+        await db_service.connect(ensure_indexes)
+        try:
+            return await coro_factory()
+        finally:
+            await db_service.disconnect()
+
+    return asyncio.run(runner())
+
+
+@app.command("rebuild-rollups")
+def rebuild_rollups(
+    since: Optional[datetime] = typer.Option(None, help="Only rebuild days from this date onwards (UTC).")
+):
+    """Backfill or rebuild the daily analytics rollups from raw events."""
+    days = run(lambda: analytics_service.rebuild_rollups(since))
+    typer.echo(f"Rebuilt {days} rollup days")
+
+
+@app.command("normalize-nutrition")
+def normalize_nutrition():
+    """Parse every alternative's nutrition strings into numeric nutrition_values."""
+    updated = run(nutrition_store.backfill)
+    typer.echo(f"Updated nutrition_values on {updated} alternatives")
+    if updated:
+        typer.echo("Running servers pick them up after an admin cache invalidation or a restart")
+
+
+@app.command("compute-recommendations")
+def compute_recommendations(
+    full: bool = typer.Option(False, "--full", help="Recompute every row instead of only those changed since the last run.")
+):
+    """Recompute the "users who saved this also saved" table from favorites."""
+    result = run(lambda: recommendation_service.compute(full))
+    typer.echo(
+        f"{result['mode'].capitalize()} run: updated {result['rows_updated']} of {result['items']} alternatives "
+        f"from {result['favorites']} favorites in {result['seconds']}s"
+    )
+
+
+@app.command("sync-indexes")
+def sync_indexes(
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only report missing indexes.")
+):
+    """Create the indexes in the manifest that the database is missing."""
+    report = run(lambda: reconcile_indexes(db_service.db, dry_run=dry_run), ensure_indexes=False)
+    for result in report["collections"]:
+        if result["missing"] or result["conflicts"] or result["error"]:
+            outcome = f"error: {result['error']}" if result["error"] else f"{len(result['created'])} created"
+            typer.echo(
+                f"{result['collection']}: missing {', '.join(result['missing']) or '-'}; "
+                f"conflicting {', '.join(result['conflicts']) or '-'}; {outcome} ({result['ms']}ms)"
+            )
+    typer.echo(f"{report['created']} indexes created, {report['missing']} were missing, in {report['ms']}ms")
+    if report["errors"]:
+        raise typer.Exit(code=1)
+
+
+@app.command("migrate-ids")
+def migrate_ids_command(
+    to: str = typer.Option("binary", "--to", help="Target id storage: binary or string."),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Documents per bulk write."),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Only count the documents that would change.")
+):
+    """Convert stored document ids to binary UUIDs (run with ID_STORAGE=dual serving), or back to strings."""
+    report = run(lambda: migrate_ids(db_service.db, to, batch_size, dry_run), ensure_indexes=False)
+    for result in report["collections"]:
+        typer.echo(f"{result['collection']}: {result['updated']} of {result['scanned']} documents ({result['ms']}ms)")
+    verb = "would be converted" if dry_run else "converted"
+    typer.echo(f"{report['updated']} documents {verb} to {to} ids in {report['ms']}ms")
+
+
+@app.command("advise-indexes")
+def advise_indexes():
+    """Explain the registered query shapes; exit non-zero if any scans the collection or sorts in memory."""
+    report = run(lambda: advise(db_service.db))
+    for plan in report["plans"]:
+        if "error" in plan:
+            typer.echo(f"{plan['name']}: error: {plan['error']}")
+            continue
+        outcome = ", ".join(plan["problems"]) or f"index {', '.join(plan['indexes']) or '-'}"
+        typer.echo(f"{plan['name']}: {' <- '.join(plan['stages'])} ({outcome})")
+    for collection, proposals in report["proposed_indexes"].items():
+        for keys in proposals:
+            typer.echo(f"proposed index on {collection}: {keys}")
+    if report["scans"] or report["errors"]:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
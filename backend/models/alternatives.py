@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field, validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+import re
 import uuid
 
 class AlternativeType(str, Enum):
@@ -28,6 +29,69 @@ class NutritionInfo(BaseModel):
     sodium: Optional[str] = None
     cholesterol: Optional[str] = None
 
+# Canonical unit per nutrient; `nutrition_values` holds amounts in these units
+NUTRIENT_UNITS: Dict[str, str] = {
+    "protein": "g",
+    "iron": "mg",
+    "calories": "kcal",
+    "fat": "g",
+    "fiber": "g",
+    "b12": "mcg",
+    "sodium": "mg",
+    "cholesterol": "mg",
+}
+
+# Grams per unit (calories are their own scale)
+UNIT_SCALES: Dict[str, float] = {
+    "g": 1.0,
+    "mg": 1e-3,
+    "mcg": 1e-6,
+    "ug": 1e-6,
+    "µg": 1e-6,
+    "μg": 1e-6,
+    "kcal": 1.0,
+    "cal": 1.0,
+}
+
+# "1,200mg" uses a thousands separator, "2,5mg" a decimal comma
+THOUSANDS_PATTERN = re.compile(r"\d{1,3}(?:,\d{3})+")
+QUANTITY_PATTERN = re.compile(r"^\s*[<>~≈]?\s*(\d{1,3}(?:,\d{3})+|\d+(?:[.,]\d+)?)\s*([a-zµμ]*)", re.IGNORECASE)
+
+
+def parse_quantity(text: Optional[str], unit: str) -> Optional[float]:
+    """Parse an amount like "20g", "2.4 mcg" or "250" into `unit`; None if unparseable.
+
+    A missing unit means the amount is already in `unit`.
+    """
+    if text is None:
+        return None
+    match = QUANTITY_PATTERN.match(str(text))
+    if match is None:
+        return None
+    number = match.group(1)
+    if THOUSANDS_PATTERN.fullmatch(number):
+        amount = float(number.replace(",", ""))
+    else:
+        amount = float(number.replace(",", "."))
+    given = match.group(2).lower() or unit
+    if given not in UNIT_SCALES or (given in ("kcal", "cal")) != (unit == "kcal"):
+        return None
+    return round(amount * UNIT_SCALES[given] / UNIT_SCALES[unit], 6)
+
+
+def normalize_nutrition(nutrition: Any) -> Dict[str, float]:
+    """Nutrient amounts in canonical units, leaving out missing and unparseable values."""
+    if nutrition is None:
+        return {}
+    if isinstance(nutrition, BaseModel):
+        nutrition = nutrition.model_dump()
+    values = {}
+    for nutrient, unit in NUTRIENT_UNITS.items():
+        amount = parse_quantity(nutrition.get(nutrient), unit)
+        if amount is not None:
+            values[nutrient] = amount
+    return values
+
 class Alternative(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str = Field(..., min_length=1, max_length=200)
@@ -36,6 +100,7 @@ class Alternative(BaseModel):
     meat_type: MeatType
     description: Optional[str] = None
     nutrition: NutritionInfo
+    nutrition_values: Dict[str, float] = {}  # derived from nutrition, see NUTRIENT_UNITS
     benefits: List[str] = []
     availability: str
     price_range: Optional[str] = None
@@ -51,6 +116,10 @@ class Alternative(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
+    @validator('nutrition_values', always=True)
+    def derive_nutrition_values(cls, v, values):
+        return normalize_nutrition(values.get('nutrition'))
+
     class Config:
         schema_extra = {
             "example": {
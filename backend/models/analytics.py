@@ -14,6 +14,7 @@ class EventType(str, Enum):
     USER_LOGIN = "user_login"
     REVIEW_SUBMITTED = "review_submitted"
     PAGE_VIEW = "page_view"
+    CATALOG_SEARCH = "catalog_search"
 
 class AnalyticsEvent(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
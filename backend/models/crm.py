@@ -17,6 +17,10 @@ class ContactSource(str, Enum):
     REFERRAL = "referral"
     ORGANIC = "organic"
 
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
 class Contact(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     first_name: str = Field(..., min_length=1, max_length=100)
@@ -130,6 +134,8 @@ class CRMStats(BaseModel):
     business_inquiries: int
     email_engagement_rate: float
     recent_contacts: List[Dict[str, Any]]
+    generated_at: Optional[datetime] = None
+    age_seconds: float = 0.0  # how long ago the figures were computed
 
 class ContactResponse(BaseModel):
     id: str
@@ -156,4 +162,19 @@ class ContactResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     last_contacted: Optional[datetime]
-    assigned_to: Optional[str]
\ No newline at end of file
+    assigned_to: Optional[str]
+
+class ContactListItem(BaseModel):
+    id: str
+    first_name: str
+    last_name: str
+    email: str
+    company: Optional[str] = None
+    source: ContactSource
+    status: ContactStatus
+    is_business_inquiry: bool
+    created_at: datetime
+
+class ContactPage(BaseModel):
+    items: List[ContactListItem]
+    next_cursor: Optional[str] = None  # pass back as `cursor` for the next page
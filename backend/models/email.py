@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+import uuid
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    SENDING = "sending"
+    DELIVERED = "delivered"
+    FAILED = "failed"
+
+class DeliveryOutcome(str, Enum):
+    SENT = "sent"
+    RETRY = "retry"  # transient: connection lost, 4xx reply
+    REJECTED = "rejected"  # permanent: 5xx reply, e.g. recipient refused
+
+class OutgoingEmail(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    to_email: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+    attempts: int = Field(default=0, ge=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class OutboxRecord(OutgoingEmail):
+    source: str  # collection that produced the email, e.g. "contacts"
+    source_id: Optional[str] = None
+    status: OutboxStatus = OutboxStatus.PENDING
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    lease_id: Optional[str] = None
+    delivered_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
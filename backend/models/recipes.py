@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+import re
 import uuid
 
 class DifficultyLevel(str, Enum):
@@ -19,6 +21,88 @@ class CuisineType(str, Enum):
     MIDDLE_EASTERN = "middle_eastern"
     OTHER = "other"
 
+# Amounts, containers and preparation words that are not part of an ingredient's name
+INGREDIENT_UNITS = {
+    "cup", "cups", "tbsp", "tablespoon", "tablespoons", "tsp", "teaspoon", "teaspoons",
+    "g", "kg", "mg", "oz", "ounce", "ounces", "lb", "lbs", "pound", "pounds", "ml", "l",
+    "can", "cans", "package", "packages", "packet", "packets", "block", "blocks", "jar", "jars",
+    "clove", "cloves", "stalk", "stalks", "slice", "slices", "wedge", "wedges", "bunch",
+    "handful", "pinch", "dash", "sprig", "sprigs", "head", "heads", "piece", "pieces",
+}
+INGREDIENT_DESCRIPTORS = {
+    "chopped", "diced", "minced", "sliced", "shredded", "crushed", "grated", "drained", "rinsed",
+    "fresh", "freshly", "ground", "large", "medium", "small", "optional", "cooked", "dried",
+    "frozen", "raw", "ripe", "finely", "roughly", "thinly", "extra", "firm", "to", "taste", "of", "a", "an",
+}
+# Assumed to be in every kitchen when matching recipes against what a user has
+PANTRY_STAPLES = {"salt", "pepper", "black pepper", "water", "oil", "olive oil", "vegetable oil"}
+
+AMOUNT_PATTERN = re.compile(r"^[\d/.\u00bc-\u00be\u2150-\u215e-]+$")
+INGREDIENT_SEPARATORS = re.compile(r"\s+(?:and|&)\s+|\s*&\s*")
+INGREDIENT_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+PARENTHESES_PATTERN = re.compile(r"\(.*?\)")
+PURPOSE_PATTERN = re.compile(r"\s+for\s+")
+
+
+def singular(word: str) -> str:
+    """Rough English singular of an ingredient word ("tomatoes" -> "tomato")."""
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("oes"):
+        return word[:-2]
+    if word.endswith("s"):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=65536)
+def normalize_ingredient(text: Optional[str]) -> Tuple[str, ...]:
+    """Canonical ingredient names in one free-text ingredient line.
+
+    "2 carrots, diced" -> ("carrot",); "Salt and pepper" -> ("salt", "pepper");
+    "Herbs: basil, oregano, thyme" -> ("basil", "oregano", "thyme"). Lines
+    repeat across recipes a lot, so results are memoized.
+    """
+    if not text:
+        return ()
+    text = text.lower()
+    if ":" in text:
+        # "Herbs: basil, oregano" lists the ingredients after the colon
+        parts = text.split(":", 1)[1].split(",")
+    else:
+        # "1 onion, diced": what follows the comma is preparation
+        parts = [text.split(",", 1)[0]]
+
+    names = []
+    for part in parts:
+        part = PURPOSE_PATTERN.split(PARENTHESES_PATTERN.sub(" ", part), 1)[0]  # "(14 oz)", "Oil for frying"
+        for piece in INGREDIENT_SEPARATORS.split(part):
+            words = [
+                word for word in piece.split()
+                if not AMOUNT_PATTERN.match(word)
+            ]
+            words = [
+                word for word in INGREDIENT_WORD_PATTERN.findall(" ".join(words))
+                if word not in INGREDIENT_UNITS and word not in INGREDIENT_DESCRIPTORS and not word.isdigit()
+            ]
+            if words:
+                words[-1] = singular(words[-1])
+                name = " ".join(words)
+                if name not in names:
+                    names.append(name)
+    return tuple(names)
+
+
+def normalize_ingredients(ingredients: Optional[List[str]]) -> List[str]:
+    """Distinct canonical ingredient names across a recipe's ingredient lines."""
+    names: Dict[str, None] = {}
+    for line in ingredients or []:
+        for name in normalize_ingredient(line):
+            names[name] = None
+    return list(names)
+
 class Recipe(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str = Field(..., min_length=1, max_length=200)
@@ -1,12 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 
 from models.user import User, UserRole
-from models.crm import Contact, ContactResponse, ContactUpdate, CRMStats
+from models.crm import (
+    Contact, ContactResponse, ContactUpdate, CRMStats, ContactListItem, ContactPage,
+    ContactStatus, ContactSource, ExportFormat
+)
 from models.analytics import DashboardStats
 from services.database import db_service
+from services.query_plans import QUERY_SHAPES, advise
+from services.dashboard_stats import dashboard_stats_engine
+from services.crm_stats import crm_stats_engine
+from services.analytics_pipeline import analytics_pipeline
+from services.cache import catalog_cache
+from services.catalog_events import catalog_events
+from services.pagination import encode_cursor, decode_cursor, keyset_filter
+from services.export import stream_contacts
+from services.serialization import FastJSONResponse, ResponseSerializer
 from routes.users import get_admin_user
 
 router = APIRouter()
@@ -16,98 +29,7 @@ logger = logging.getLogger(__name__)
 async def get_dashboard_stats(admin_user: User = Depends(get_admin_user)):
     """Get admin dashboard statistics."""
     try:
-        # Get collections
-        users_collection = await db_service.get_collection("users")
-        contacts_collection = await db_service.get_collection("contacts")
-        alternatives_collection = await db_service.get_collection("alternatives")
-        recipes_collection = await db_service.get_collection("recipes")
-        reviews_collection = await db_service.get_collection("reviews")
-        analytics_collection = await db_service.get_collection("analytics")
-        
-        # Calculate date ranges
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        week_ago = today - timedelta(days=7)
-        month_ago = today - timedelta(days=30)
-        
-        # User stats
-        total_users = await users_collection.count_documents({})
-        active_users_today = await analytics_collection.count_documents({
-            "event_type": "user_login",
-            "timestamp": {"$gte": today}
-        })
-        active_users_week = await analytics_collection.count_documents({
-            "event_type": "user_login",
-            "timestamp": {"$gte": week_ago}
-        })
-        active_users_month = await analytics_collection.count_documents({
-            "event_type": "user_login",
-            "timestamp": {"$gte": month_ago}
-        })
-        
-        # Search stats
-        total_searches = await analytics_collection.count_documents({"event_type": "search"})
-        searches_today = await analytics_collection.count_documents({
-            "event_type": "search",
-            "timestamp": {"$gte": today}
-        })
-        
-        # Content stats
-        total_alternatives = await alternatives_collection.count_documents({})
-        total_recipes = await recipes_collection.count_documents({})
-        total_reviews = await reviews_collection.count_documents({})
-        pending_reviews = await reviews_collection.count_documents({"status": "pending"})
-        
-        # Popular searches
-        popular_searches = await analytics_collection.aggregate([
-            {"$match": {"event_type": "search"}},
-            {"$group": {"_id": "$event_data.meat_type", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]).to_list(length=None)
-        
-        # User growth (last 7 days)
-        user_growth = []
-        for i in range(7):
-            date = today - timedelta(days=i)
-            next_date = date + timedelta(days=1)
-            count = await users_collection.count_documents({
-                "created_at": {"$gte": date, "$lt": next_date}
-            })
-            user_growth.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "users": count
-            })
-        
-        # Search trends (last 7 days)
-        search_trends = []
-        for i in range(7):
-            date = today - timedelta(days=i)
-            next_date = date + timedelta(days=1)
-            count = await analytics_collection.count_documents({
-                "event_type": "search",
-                "timestamp": {"$gte": date, "$lt": next_date}
-            })
-            search_trends.append({
-                "date": date.strftime("%Y-%m-%d"),
-                "searches": count
-            })
-        
-        return DashboardStats(
-            total_users=total_users,
-            active_users_today=active_users_today,
-            active_users_week=active_users_week,
-            active_users_month=active_users_month,
-            total_searches=total_searches,
-            searches_today=searches_today,
-            total_alternatives=total_alternatives,
-            total_recipes=total_recipes,
-            total_reviews=total_reviews,
-            pending_reviews=pending_reviews,
-            popular_searches=popular_searches,
-            user_growth=user_growth,
-            search_trends=search_trends
-        )
-        
+        return await dashboard_stats_engine.compute()
     except Exception as e:
         logger.error(f"Dashboard stats error: {str(e)}")
         raise HTTPException(
@@ -115,6 +37,55 @@ async def get_dashboard_stats(admin_user: User = Depends(get_admin_user)):
             detail="Failed to get dashboard statistics"
         )
 
+@router.get("/analytics/pipeline")
+async def get_analytics_pipeline_stats(admin_user: User = Depends(get_admin_user)):
+    """Get analytics ingestion pipeline counters."""
+    return analytics_pipeline.stats()
+
+@router.get("/database/pool")
+async def get_database_pool_stats(admin_user: User = Depends(get_admin_user)):
+    """Get MongoDB connection pool settings and checkout wait times."""
+    return db_service.pool_stats()
+
+@router.get("/database/query-plans")
+async def get_query_plans(
+    recorded: bool = False,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Explain the registered (or recorded) query shapes and flag collection scans and in-memory sorts."""
+    try:
+        shapes = db_service.query_recorder.shapes() if recorded else QUERY_SHAPES
+        return await advise(db_service.db, shapes)
+    except Exception as e:
+        logger.error(f"Query plan advice error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to explain query plans"
+        )
+
+@router.get("/cache")
+async def get_cache_stats(admin_user: User = Depends(get_admin_user)):
+    """Get catalog cache hit/miss statistics."""
+    return catalog_cache.stats()
+
+@router.post("/cache/invalidate")
+async def invalidate_cache(
+    collection: Optional[str] = None,
+    admin_user: User = Depends(get_admin_user)
+):
+    """Invalidate the catalog cache and in-memory indexes after editing catalog data."""
+    if collection is not None and collection not in catalog_cache.caches:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown catalog collection"
+        )
+    for name in [collection] if collection else list(catalog_cache.caches):
+        await catalog_events.publish(name)
+    return {"message": "Cache invalidated"}
+
+contact_serializer = ResponseSerializer(ContactResponse)
+contact_list_serializer = ResponseSerializer(ContactListItem)
+
 @router.get("/contacts", response_model=List[ContactResponse])
 async def get_contacts(
     skip: int = 0,
@@ -125,9 +96,11 @@ async def get_contacts(
     try:
         contacts_collection = await db_service.get_collection("contacts")
         
-        contacts = await contacts_collection.find().skip(skip).limit(limit).sort("created_at", -1).to_list(length=None)
+        contacts = await contacts_collection.find({}, contact_serializer.projection).skip(skip).limit(limit).sort(
+            "created_at", -1
+        ).to_list(length=None)
         
-        return [ContactResponse(**contact) for contact in contacts]
+        return contact_serializer.list_response(contacts)
         
     except Exception as e:
         logger.error(f"Get contacts error: {str(e)}")
@@ -136,6 +109,82 @@ async def get_contacts(
             detail="Failed to get contacts"
         )
 
+@router.get("/contacts/page", response_model=ContactPage)
+async def get_contacts_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Get one page of contacts, newest first, using keyset pagination."""
+    query = {}
+    if cursor:
+        try:
+            query = keyset_filter(*decode_cursor(cursor))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    try:
+        contacts_collection = await db_service.get_collection("contacts")
+        
+        # Fetch one extra row to know whether another page follows
+        contacts = await contacts_collection.find(query, {**contact_list_serializer.projection, "_id": 1}).sort(
+            [("created_at", -1), ("_id", -1)]
+        ).limit(limit + 1).to_list(length=None)
+        
+        next_cursor = None
+        if len(contacts) > limit:
+            contacts = contacts[:limit]
+            next_cursor = encode_cursor(contacts[-1]["created_at"], str(contacts[-1]["_id"]))
+        
+        return FastJSONResponse({
+            "items": contact_list_serializer.documents(contacts),
+            "next_cursor": next_cursor
+        })
+        
+    except Exception as e:
+        logger.error(f"Get contacts page error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to get contacts"
+        )
+
+@router.get("/contacts/export")
+async def export_contacts(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    status_filter: Optional[ContactStatus] = Query(None, alias="status"),
+    source: Optional[ContactSource] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    batch_size: int = Query(1000, ge=1, le=10000),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Stream contacts as NDJSON or CSV straight from the database cursor."""
+    query = {}
+    if status_filter:
+        query["status"] = status_filter.value
+    if source:
+        query["source"] = source.value
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lt"] = created_to
+
+    contacts_collection = await db_service.get_collection("contacts")
+    cursor = contacts_collection.find(query, {"_id": 0}).sort([("created_at", -1), ("_id", -1)])
+
+    media_type = "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    filename = f"contacts-{datetime.utcnow().strftime('%Y%m%d')}.{export_format.value}"
+    return StreamingResponse(
+        stream_contacts(cursor, export_format, batch_size),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @router.get("/contacts/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: str,
@@ -145,14 +194,14 @@ async def get_contact(
     try:
         contacts_collection = await db_service.get_collection("contacts")
         
-        contact = await contacts_collection.find_one({"id": contact_id})
+        contact = await contacts_collection.find_one({"id": contact_id}, contact_serializer.projection)
         if not contact:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Contact not found"
             )
         
-        return ContactResponse(**contact)
+        return contact_serializer.response(contact)
         
     except HTTPException:
         raise
@@ -174,7 +223,7 @@ async def update_contact(
         contacts_collection = await db_service.get_collection("contacts")
         
         # Prepare update data
-        update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+        update_dict = {k: v for k, v in update_data.model_dump().items() if v is not None}
         update_dict["updated_at"] = datetime.utcnow()
         
         # Update contact
@@ -189,9 +238,11 @@ async def update_contact(
                 detail="Contact not found"
             )
         
+        crm_stats_engine.invalidate()
+        
         # Get updated contact
-        updated_contact = await contacts_collection.find_one({"id": contact_id})
-        return ContactResponse(**updated_contact)
+        updated_contact = await contacts_collection.find_one({"id": contact_id}, contact_serializer.projection)
+        return contact_serializer.response(updated_contact)
         
     except HTTPException:
         raise
@@ -206,69 +257,7 @@ async def update_contact(
 async def get_crm_stats(admin_user: User = Depends(get_admin_user)):
     """Get CRM statistics."""
     try:
-        contacts_collection = await db_service.get_collection("contacts")
-        
-        # Basic counts
-        total_contacts = await contacts_collection.count_documents({})
-        
-        # Time-based counts
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        month_ago = datetime.utcnow() - timedelta(days=30)
-        
-        new_contacts_this_week = await contacts_collection.count_documents({
-            "created_at": {"$gte": week_ago}
-        })
-        new_contacts_this_month = await contacts_collection.count_documents({
-            "created_at": {"$gte": month_ago}
-        })
-        
-        # Contacts by status
-        status_counts = await contacts_collection.aggregate([
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]).to_list(length=None)
-        contacts_by_status = {item["_id"]: item["count"] for item in status_counts}
-        
-        # Contacts by source
-        source_counts = await contacts_collection.aggregate([
-            {"$group": {"_id": "$source", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]).to_list(length=None)
-        contacts_by_source = {item["_id"]: item["count"] for item in source_counts}
-        
-        # Business inquiries
-        business_inquiries = await contacts_collection.count_documents({"is_business_inquiry": True})
-        
-        # Email engagement rate
-        total_emails_sent = await contacts_collection.aggregate([
-            {"$group": {"_id": None, "total": {"$sum": "$emails_sent"}}}
-        ]).to_list(length=None)
-        
-        total_emails_opened = await contacts_collection.aggregate([
-            {"$group": {"_id": None, "total": {"$sum": "$email_opens"}}}
-        ]).to_list(length=None)
-        
-        emails_sent = total_emails_sent[0]["total"] if total_emails_sent else 0
-        emails_opened = total_emails_opened[0]["total"] if total_emails_opened else 0
-        email_engagement_rate = (emails_opened / emails_sent * 100) if emails_sent > 0 else 0
-        
-        # Recent contacts
-        recent_contacts = await contacts_collection.find(
-            {},
-            {"first_name": 1, "last_name": 1, "email": 1, "created_at": 1, "is_business_inquiry": 1}
-        ).sort("created_at", -1).limit(10).to_list(length=None)
-        
-        return CRMStats(
-            total_contacts=total_contacts,
-            new_contacts_this_week=new_contacts_this_week,
-            new_contacts_this_month=new_contacts_this_month,
-            contacts_by_status=contacts_by_status,
-            contacts_by_source=contacts_by_source,
-            business_inquiries=business_inquiries,
-            email_engagement_rate=email_engagement_rate,
-            recent_contacts=recent_contacts
-        )
-        
+        return await crm_stats_engine.get()
     except Exception as e:
         logger.error(f"CRM stats error: {str(e)}")
         raise HTTPException(
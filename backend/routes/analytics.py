@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from typing import Optional
+import logging
+
+from models.analytics import AnalyticsEventCreate, EventType
+from services.analytics_pipeline import analytics_pipeline
+from services.auth import verify_token
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Events a browser may report; favorites, reviews, logins and signups are
+# recorded by the server when they actually happen
+CLIENT_EVENT_TYPES = {
+    EventType.PAGE_VIEW,
+    EventType.SEARCH,
+    EventType.VIEW_ALTERNATIVE,
+    EventType.VIEW_RECIPE,
+}
+
+optional_bearer = HTTPBearer(auto_error=False)
+
+def get_optional_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer)
+) -> Optional[str]:
+    """User id from a valid bearer token, or None for anonymous requests."""
+    if credentials is None:
+        return None
+    payload = verify_token(credentials.credentials)
+    return payload.get("sub") if payload else None
+
+@router.post("/analytics/events", status_code=status.HTTP_202_ACCEPTED)
+async def track_event(
+    event: AnalyticsEventCreate,
+    request: Request,
+    user_id: Optional[str] = Depends(get_optional_user_id)
+):
+    """Queue an analytics event for batched storage."""
+    if event.event_type not in CLIENT_EVENT_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Event type '{event.event_type.value}' cannot be reported by clients"
+        )
+
+    # Identity and address come from the request, never from the body
+    event.user_id = user_id
+    event.ip_address = request.client.host if request.client else None
+    if not event.user_agent:
+        event.user_agent = request.headers.get("user-agent")
+
+    if not await analytics_pipeline.enqueue(event):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics queue is full"
+        )
+
+    return {"accepted": True}
@@ -0,0 +1,189 @@
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from typing import List, Optional
+import logging
+
+from models.alternatives import MeatType
+from models.analytics import AnalyticsEventCreate, EventType
+from services.analytics_pipeline import analytics_pipeline
+from services.search_index import search_index
+from services.fuzzy_index import fuzzy_index
+from services.autocomplete import autocomplete_service
+from services.facets import facet_index
+from services.nutrition import nutrition_store, parse_condition, parse_sort
+from services.similarity import similarity_index
+from services.ingredient_index import ingredient_index
+from services.recommendations import recommendation_service
+from services.craving_bundles import craving_bundles
+from services.catalog_feed import catalog_feed
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/catalog/search")
+async def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200),
+    collection: Optional[str] = Query(None, pattern="^(alternatives|recipes)$"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """Search alternatives and recipes, best match first.
+
+    When nothing matches exactly, or some query word is in no document
+    ("beyon beef"), typo-tolerant matches on names come first, followed by
+    the exact matches they do not already include.
+    """
+    results = search_index.search(q, collection, limit)
+    fuzzy = not results or bool(search_index.unmatched_terms(q))
+    if fuzzy:
+        matches = fuzzy_index.search(q, collection, limit)
+        listed = {(match["collection"], match["id"]) for match in matches}
+        results = (matches + [result for result in results if (result["collection"], result["id"]) not in listed])[:limit]
+
+    await analytics_pipeline.enqueue(AnalyticsEventCreate(
+        event_type=EventType.CATALOG_SEARCH,
+        event_data={"query": q, "collection": collection, "result_count": len(results), "fuzzy": fuzzy}
+    ))
+    return {"query": q, "fuzzy": fuzzy, "results": results}
+
+@router.get("/catalog/autocomplete")
+async def autocomplete(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """As-you-type suggestions, most popular first."""
+    return {"query": q, "suggestions": autocomplete_service.suggest(q, limit)}
+
+@router.get("/catalog/alternatives/facets")
+async def browse_alternatives(
+    meat_type: List[str] = Query([]),
+    type: List[str] = Query([]),
+    brand: List[str] = Query([]),
+    certification: List[str] = Query([]),
+    price_range: List[str] = Query([]),
+    exclude_allergen: List[str] = Query([]),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Filter alternatives and get counts for every facet value.
+
+    Repeat a parameter to match any of several values (`?brand=A&brand=B`).
+    """
+    filters = {
+        "meat_type": meat_type,
+        "type": type,
+        "brand": brand,
+        "certification": certification,
+        "price_range": price_range,
+    }
+    return facet_index.query(filters, exclude_allergen, limit, offset)
+
+@router.get("/catalog/alternatives/nutrition")
+async def query_nutrition(
+    where: List[str] = Query([]),
+    sort: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Filter and rank alternatives by nutrients.
+
+    `where` takes conditions like `protein>=15g` or `sodium<=400mg` (repeat
+    for several); `sort` takes a nutrient or a ratio like `protein/calories`.
+    """
+    try:
+        conditions = [parse_condition(condition) for condition in where]
+        sort_key = parse_sort(sort) if sort else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return nutrition_store.query(conditions, sort_key, order == "desc", limit, offset)
+
+@router.get("/catalog/alternatives/{alternative_id}/similar")
+async def similar_alternatives(alternative_id: str, limit: int = Query(10, ge=1, le=10)):
+    """Alternatives with the most similar nutrient profile, for substitution."""
+    results = similarity_index.similar(alternative_id, limit)
+    if results is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Alternative not found"
+        )
+    return {"alternative_id": alternative_id, "results": results}
+
+@router.get("/catalog/alternatives/{alternative_id}/also-saved")
+async def also_saved(alternative_id: str, limit: int = Query(10, ge=1, le=20)):
+    """The "users who saved this also saved" list, from the precomputed recommendations table."""
+    return {
+        "alternative_id": alternative_id,
+        "results": await recommendation_service.also_saved(alternative_id, limit)
+    }
+
+@router.get("/catalog/cravings/{meat_type}/alternatives")
+async def alternatives_for_craving(
+    meat_type: MeatType,
+    limit: int = Query(10, ge=1, le=50),
+    same_meat_type: bool = False
+):
+    """Alternatives richest in the nutrients a craving for `meat_type` points to."""
+    return {
+        "meat_type": meat_type.value,
+        "results": similarity_index.for_craving(meat_type.value, limit, same_meat_type)
+    }
+
+@router.get("/catalog/recipes/by-ingredients")
+async def recipes_by_ingredients(
+    have: List[str] = Query(..., min_length=1),
+    max_missing: Optional[int] = Query(None, ge=0),
+    min_coverage: float = Query(0.0, ge=0, le=1),
+    assume_staples: bool = True,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """Recipes you can cook with what you have, best ingredient coverage first.
+
+    Repeat `have` per ingredient (`?have=chickpeas&have=2 cups flour`);
+    `max_missing=0` returns only recipes needing nothing else.
+    """
+    return ingredient_index.query(have, max_missing, min_coverage, assume_staples, limit, offset)
+
+@router.get("/catalog/cravings/{meat_type}/bundle")
+async def craving_bundle(meat_type: MeatType, if_none_match: Optional[str] = Header(None)):
+    """The craving explanation, top alternatives and featured recipes for a meat type, in one pre-rendered document."""
+    bundle = craving_bundles.get(meat_type.value)
+    if bundle is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Craving bundles are not built yet"
+        )
+    if if_none_match == bundle.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": bundle.etag})
+    return Response(content=bundle.body, media_type="application/json", headers={"ETag": bundle.etag})
+
+@router.get("/catalog/snapshot")
+async def catalog_snapshot(
+    if_none_match: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None)
+):
+    """All active alternatives, recipes and meat cravings, with the catalog version.
+
+    Gzipped when the client accepts it. Keep the version and sync with
+    `/catalog/changes` afterwards instead of downloading the snapshot again.
+    """
+    snapshot = await catalog_feed.snapshot()
+    gzipped = "gzip" in (accept_encoding or "").lower()
+    etag = f'{snapshot.etag[:-1]}-gzip"' if gzipped else snapshot.etag
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "X-Catalog-Version": str(snapshot.version)}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzipped, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+@router.get("/catalog/changes")
+async def catalog_changes(
+    since: int = Query(..., ge=0),
+    limit: int = Query(500, ge=1, le=2000)
+):
+    """Catalog documents changed after version `since`; deactivated ones are listed as removed."""
+    return await catalog_feed.changes(since, limit)
@@ -5,8 +5,9 @@ from datetime import datetime
 import logging
 
 from models.crm import Contact, ContactCreate, ContactSource
-from services.database import db_service
-from services.email import email_service
+from models.email import OutboxRecord
+from services.outbox import email_outbox, outbox_relay
+from services.email_templates import email_templates
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -32,51 +33,39 @@ async def submit_contact_form(form_data: ContactFormSubmission):
                 ['business', 'partnership', 'collaboration', 'sponsor', 'advertise', 'invest']) else False
         )
         
-        # Save to database
-        contacts_collection = await db_service.get_collection("contacts")
-        await contacts_collection.insert_one(contact.dict())
-        
-        # Send email notification to admin
-        admin_email_content = f"""
-        New Contact Form Submission
-
-        Name: {form_data.firstName} {form_data.lastName}
-        Email: {form_data.email}
-        Message: {form_data.message}
-
-        Submitted: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')} UTC
-        Business Inquiry: {'Yes' if contact.is_business_inquiry else 'No'}
-        """
+        # Email notification to admin
+        admin_email = email_templates.render(
+            "contact_notification",
+            first_name=form_data.firstName,
+            last_name=form_data.lastName,
+            email=form_data.email,
+            message=form_data.message,
+            submitted_at=datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+            business_inquiry='Yes' if contact.is_business_inquiry else 'No'
+        )
         
-        # Send to your email
-        email_service.send_email(
-            to_email="cravekind@gmail.com",
-            subject=f"New Contact Form Submission from {form_data.firstName} {form_data.lastName}",
-            html_content=admin_email_content.replace('\n', '<br>'),
-            text_content=admin_email_content
+        # Confirmation email to user
+        user_email = email_templates.render(
+            "contact_confirmation",
+            first_name=form_data.firstName,
+            message=form_data.message
         )
         
-        # Send confirmation email to user
-        user_email_content = f"""
-        Hi {form_data.firstName},
-
-        Thank you for contacting CraveKind! We've received your message and will get back to you within 24 hours.
-
-        Your message:
-        {form_data.message}
-
-        We're excited to help you on your plant-based journey!
-
-        Best regards,
-        The CraveKind Team
-        """
+        emails = [
+            OutboxRecord(
+                to_email=to_email,
+                subject=email.subject,
+                html_content=email.html,
+                text_content=email.text,
+                source="contacts",
+                source_id=contact.id
+            )
+            for to_email, email in (("cravekind@gmail.com", admin_email), (form_data.email, user_email))
+        ]
         
-        email_service.send_email(
-            to_email=form_data.email,
-            subject="Thank you for contacting CraveKind!",
-            html_content=user_email_content.replace('\n', '<br>'),
-            text_content=user_email_content
-        )
+        # Save the contact together with its emails; the outbox relay sends them
+        await email_outbox.insert_with_emails("contacts", contact.model_dump(), emails)
+        outbox_relay.notify()
         
         logger.info(f"Contact form submitted by {form_data.email}")
         
@@ -1,8 +1,6 @@
 from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
@@ -12,16 +10,25 @@ from datetime import datetime
 
 # Import services and routes
 from services.database import db_service
+from services.serialization import ResponseSerializer
+from services.analytics_pipeline import analytics_pipeline
+from services.email_dispatcher import email_dispatcher
+from services.outbox import outbox_relay
+from services.search_index import search_index
+from services.fuzzy_index import fuzzy_index
+from services.facets import facet_index
+from services.nutrition import nutrition_store
+from services.similarity import similarity_index
+from services.ingredient_index import ingredient_index
+from services.craving_bundles import craving_bundles
+from services.autocomplete import autocomplete_service
 from routes.contact import router as contact_router
+from routes.analytics import router as analytics_router
+from routes.catalog import router as catalog_router
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -45,19 +52,29 @@ async def root():
 
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
+    status_dict = input.model_dump()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    status_collection = await db_service.get_collection("status_checks")
+    _ = await status_collection.insert_one(status_obj.model_dump())
     return status_obj
 
+status_check_serializer = ResponseSerializer(StatusCheck)
+
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
+    status_collection = await db_service.get_collection("status_checks")
+    status_checks = await status_collection.find({}, status_check_serializer.projection).to_list(1000)
+    return status_check_serializer.list_response(status_checks)
 
 # Include contact router
 api_router.include_router(contact_router)
 
+# Include analytics router
+api_router.include_router(analytics_router)
+
+# Include catalog router
+api_router.include_router(catalog_router)
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -80,9 +97,25 @@ logger = logging.getLogger(__name__)
 async def startup_db_client():
     """Initialize database connection on startup."""
     await db_service.connect()
+    await analytics_pipeline.start()
+    await outbox_relay.start()
+    try:
+        await search_index.build()
+        await fuzzy_index.build()
+        await facet_index.build()
+        await nutrition_store.build()
+        await similarity_index.build()
+        await ingredient_index.build()
+        await craving_bundles.build()
+    except Exception as e:
+        logger.error(f"Failed to build search indexes: {str(e)}")
+    await autocomplete_service.start()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    """Close database connection on shutdown."""
+    """Flush queued analytics events, stop the email relay and close database connection on shutdown."""
+    await analytics_pipeline.stop()
+    await autocomplete_service.stop()
+    await outbox_relay.stop()
+    await email_dispatcher.close()
     await db_service.disconnect()
-    client.close()
@@ -0,0 +1,205 @@
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional
+from collections import Counter, defaultdict
+import logging
+
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from models.alternatives import MeatType
+from models.analytics import AnalyticsEvent, AnalyticsEventCreate
+from services.database import db_service, DatabaseService
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "analytics_daily"
+DAY_FORMAT = "%Y-%m-%d"
+NO_MEAT_TYPE = "__none__"
+OTHER_MEAT_TYPE = "__other__"
+MEAT_TYPE_VALUES = {meat_type.value for meat_type in MeatType}
+
+
+def rollup_day(timestamp: datetime) -> str:
+    """Rollup document id for the UTC day containing `timestamp`."""
+    return timestamp.strftime(DAY_FORMAT)
+
+
+def meat_type_key(value: Any) -> str:
+    """Rollup field name for an `event_data.meat_type` value.
+
+    Only MeatType values get a counter of their own: a missing or empty
+    value counts as NO_MEAT_TYPE and anything else as OTHER_MEAT_TYPE, so
+    client-sent strings can neither make an invalid field path nor keep
+    adding fields to the day documents.
+    """
+    value = getattr(value, "value", value)
+    if value is None or value == "":
+        return NO_MEAT_TYPE
+    if isinstance(value, str) and value in MEAT_TYPE_VALUES:
+        return value
+    return OTHER_MEAT_TYPE
+
+
+def meat_type_value(key: str) -> Optional[str]:
+    """Inverse of `meat_type_key` for the sentinels."""
+    if key == NO_MEAT_TYPE:
+        return None
+    if key == OTHER_MEAT_TYPE:
+        return "other"
+    return key
+
+
+class AnalyticsService:
+    """Store analytics events and maintain per-day rollup counters.
+
+    Each document in `analytics_daily` covers one UTC day:
+    `{"_id": "2024-05-01", "day": <datetime>, "events": {<event_type>: n},
+    "meat_types": {<event_type>: {<meat_type>: n}}}`.
+    """
+
+    def __init__(self, database: DatabaseService = db_service):
+        self.db = database
+        # Earliest day whose rollups missed events after a failed update;
+        # the next successful update rebuilds from there instead
+        self.rollups_stale_since: Optional[datetime] = None
+
+    async def track_event(self, event_data: AnalyticsEventCreate) -> AnalyticsEvent:
+        """Persist a single event and count it in the rollups."""
+        event = AnalyticsEvent(**event_data.model_dump())
+        analytics_collection = await self.db.get_collection("analytics")
+        await analytics_collection.insert_one(event.model_dump())
+        await self.count_in_rollups([event.model_dump()])
+        return event
+
+    async def insert_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert a batch of event documents unordered.
+
+        Returns the events that were stored; the rest failed individually.
+        """
+        analytics_collection = await self.db.get_collection("analytics")
+        try:
+            await analytics_collection.insert_many(events, ordered=False)
+            return events
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            logger.error(f"Failed to store {len(failed)} of {len(events)} analytics events")
+            return [event for index, event in enumerate(events) if index not in failed]
+
+    async def count_in_rollups(self, events: List[Dict[str, Any]]) -> bool:
+        """Count stored events in the rollups, repairing days left behind by earlier failures.
+
+        Returns False if the rollups could not be updated; the affected days
+        are then rebuilt from the raw events by the next successful call.
+        """
+        if not events:
+            return True
+        since = min(event["timestamp"] for event in events)
+        try:
+            if self.rollups_stale_since is None:
+                await self.increment_rollups(events)
+            else:
+                # The rebuild reads the raw events, including this batch
+                since = min(since, self.rollups_stale_since)
+                await self.rebuild_rollups(since)
+                self.rollups_stale_since = None
+            return True
+        except Exception as e:
+            self.rollups_stale_since = since
+            logger.error(f"Failed to update analytics rollups for {len(events)} stored events: {str(e)}")
+            return False
+
+    async def increment_rollups(self, events: Iterable[Dict[str, Any]]):
+        """Apply `$inc` counters for a batch of event documents, one upsert per day."""
+        increments: Dict[str, Counter] = defaultdict(Counter)
+        for event in events:
+            event_type = event["event_type"]
+            event_type = getattr(event_type, "value", event_type)
+            meat_type = (event.get("event_data") or {}).get("meat_type")
+            counters = increments[rollup_day(event["timestamp"])]
+            counters[f"events.{event_type}"] += 1
+            counters[f"meat_types.{event_type}.{meat_type_key(meat_type)}"] += 1
+
+        if not increments:
+            return
+
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": day},
+                {
+                    "$inc": dict(counters),
+                    "$set": {"updated_at": now},
+                    "$setOnInsert": {"day": datetime.strptime(day, DAY_FORMAT)}
+                },
+                upsert=True
+            )
+            for day, counters in increments.items()
+        ]
+        rollups_collection = await self.db.get_collection(ROLLUP_COLLECTION)
+        await rollups_collection.bulk_write(operations, ordered=False)
+
+    async def rebuild_rollups(self, since: Optional[datetime] = None) -> int:
+        """Recompute rollups from the raw events, for all history or from `since` onwards.
+
+        Returns the number of day documents written.
+        """
+        analytics_collection = await self.db.get_collection("analytics")
+        rollups_collection = await self.db.get_collection(ROLLUP_COLLECTION)
+
+        pipeline: List[Dict[str, Any]] = []
+        if since is not None:
+            since = since.replace(hour=0, minute=0, second=0, microsecond=0)
+            pipeline.append({"$match": {"timestamp": {"$gte": since}}})
+        pipeline.append({"$group": {
+            "_id": {
+                "day": {"$dateToString": {"format": DAY_FORMAT, "date": "$timestamp"}},
+                "event_type": "$event_type",
+                "meat_type": "$event_data.meat_type"
+            },
+            "count": {"$sum": 1}
+        }})
+
+        days: Dict[str, Dict[str, Any]] = {}
+        async for row in analytics_collection.aggregate(pipeline, allowDiskUse=True):
+            key = row["_id"]
+            if key.get("day") is None:
+                continue
+            doc = days.setdefault(key["day"], {"events": Counter(), "meat_types": defaultdict(Counter)})
+            doc["events"][key["event_type"]] += row["count"]
+            doc["meat_types"][key["event_type"]][meat_type_key(key.get("meat_type"))] += row["count"]
+
+        now = datetime.utcnow()
+        operations = [
+            ReplaceOne(
+                {"_id": day},
+                {
+                    "day": datetime.strptime(day, DAY_FORMAT),
+                    "events": dict(doc["events"]),
+                    "meat_types": {event_type: dict(counts) for event_type, counts in doc["meat_types"].items()},
+                    "updated_at": now
+                },
+                upsert=True
+            )
+            for day, doc in days.items()
+        ]
+
+        # Days without any events left are stale rollups and must go too
+        stale_filter: Dict[str, Any] = {"_id": {"$nin": list(days)}}
+        if since is not None:
+            stale_filter["day"] = {"$gte": since}
+        await rollups_collection.delete_many(stale_filter)
+
+        if operations:
+            await rollups_collection.bulk_write(operations, ordered=False)
+
+        logger.info(f"Rebuilt {len(operations)} analytics rollup days")
+        return len(operations)
+
+    async def get_rollups(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Fetch rollup documents, oldest first."""
+        rollups_collection = await self.db.get_collection(ROLLUP_COLLECTION)
+        query = {"day": {"$gte": since}} if since is not None else {}
+        return await rollups_collection.find(query).sort("day", 1).to_list(length=None)
+
+# Create global instance
+analytics_service = AnalyticsService()
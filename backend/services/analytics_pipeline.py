@@ -0,0 +1,144 @@
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import os
+import time
+
+from models.analytics import AnalyticsEvent, AnalyticsEventCreate
+from services.analytics import analytics_service, AnalyticsService
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsIngestionPipeline:
+    """Buffer analytics events in memory and write them to Mongo in batches.
+
+    Events are flushed with one unordered `insert_many` once `batch_size`
+    events are waiting or `flush_interval` seconds after the first one
+    arrived, whichever comes first, and then counted in the rollups. When
+    the queue is full, `enqueue` waits up to `enqueue_timeout` seconds for
+    room and then drops the event.
+
+    `failed` counts events that could not be stored; `rollups_failed`
+    counts stored events whose rollup update failed, whose days are rebuilt
+    from the raw events on the next successful flush.
+    """
+
+    def __init__(
+        self,
+        analytics: AnalyticsService = analytics_service,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None,
+        drain_timeout: Optional[float] = None
+    ):
+        self.analytics = analytics
+        self.max_queue_size = max_queue_size if max_queue_size is not None else int(os.getenv("ANALYTICS_QUEUE_SIZE", "10000"))
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("ANALYTICS_BATCH_SIZE", "500"))
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "1.0"))
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else float(os.getenv("ANALYTICS_ENQUEUE_TIMEOUT", "0.05"))
+        self.drain_timeout = drain_timeout if drain_timeout is not None else float(os.getenv("ANALYTICS_DRAIN_TIMEOUT", "10"))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._accepting = False
+
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.rollups_failed = 0
+        self.batches = 0
+
+    async def start(self):
+        """Start the background flush worker."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._accepting = True
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Analytics pipeline started (queue size {self.max_queue_size}, batch size {self.batch_size})")
+
+    async def stop(self):
+        """Stop accepting events, flush everything still queued and stop the worker."""
+        if self._worker is None:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Analytics pipeline drain timed out with {self._queue.qsize()} events queued")
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        logger.info(f"Analytics pipeline stopped: {self.stats()}")
+
+    async def enqueue(self, event_data: AnalyticsEventCreate) -> bool:
+        """Queue an event, waiting briefly for room. Returns False if it was dropped."""
+        if not self._accepting:
+            self.dropped += 1
+            return False
+
+        event = AnalyticsEvent(**event_data.model_dump())
+        try:
+            await asyncio.wait_for(self._queue.put(event.model_dump()), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.dropped += 1
+            return False
+
+        self.queued += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """Pipeline counters."""
+        return {
+            "queued": self.queued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "rollups_failed": self.rollups_failed,
+            "rollups_stale_since": self.analytics.rollups_stale_since,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_capacity": self.max_queue_size,
+        }
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        try:
+            stored = await self.analytics.insert_events(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Failed to flush {len(batch)} analytics events: {str(e)}")
+        else:
+            self.flushed += len(stored)
+            self.failed += len(batch) - len(stored)
+            # Stored events stay stored; a failed rollup update is repaired later
+            if not await self.analytics.count_in_rollups(stored):
+                self.rollups_failed += len(stored)
+        finally:
+            self.batches += 1
+            for _ in batch:
+                self._queue.task_done()
+
+# Create global instance
+analytics_pipeline = AnalyticsIngestionPipeline()
@@ -0,0 +1,202 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+import asyncio
+import heapq
+import logging
+import os
+
+from models.alternatives import MeatType
+from models.analytics import EventType
+from services.analytics import analytics_service, AnalyticsService, meat_type_value
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.search_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class Suggestion(NamedTuple):
+    text: str
+    kind: str  # alternative, brand, recipe or meat_type
+    id: Optional[str]
+    popularity: float
+
+
+# Sorts after every character a key can contain, so [prefix, prefix + KEY_END) is a prefix range
+KEY_END = "\x7f"
+
+
+def suggestion_key(text: str) -> str:
+    """Normalized form suggestions are matched on ("Crème Brûlée!" -> "creme brulee")."""
+    return " ".join(tokenize(text))
+
+
+class AutocompleteIndex:
+    """Sorted array of suggestion keys with precomputed top-k for crowded prefixes.
+
+    Each suggestion is keyed once per word it contains ("beyond burger" and
+    "burger"), so typing any word of a name finds it. Suggestions are
+    numbered most popular first, so the top k for a prefix are the k
+    smallest distinct numbers among the keys in its (bisected) range. Ranges
+    larger than `dense_range` have their answer precomputed; smaller ones
+    are scanned on lookup.
+    """
+
+    def __init__(self, suggestions: List[Suggestion], top_k: int, dense_range: int = 256):
+        self.top_k = top_k
+        self.dense_range = dense_range
+        self.suggestions = sorted(suggestions, key=lambda s: (-s.popularity, len(s.text), s.text))
+
+        entries = []
+        for index, suggestion in enumerate(self.suggestions):
+            words = suggestion_key(suggestion.text).split(" ")
+            entries.extend((" ".join(words[start:]), index) for start in range(len(words)))
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.owners = [index for _, index in entries]
+        self.dense: Dict[str, List[int]] = {}
+        self._precompute(0, len(self.keys), 1)
+
+    def lookup(self, prefix: str, limit: int) -> List[Suggestion]:
+        top = self.dense.get(prefix)
+        if top is None:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + KEY_END, lo)
+            top = self._top(lo, hi)
+        return [self.suggestions[index] for index in top[:limit]]
+
+    def _top(self, lo: int, hi: int) -> List[int]:
+        return heapq.nsmallest(self.top_k, set(self.owners[lo:hi]))
+
+    def _precompute(self, lo: int, hi: int, length: int):
+        """Store the top k of every prefix of `length` characters or more whose range exceeds `dense_range`."""
+        keys = self.keys
+        while lo < hi:
+            if len(keys[lo]) < length:
+                lo += 1
+                continue
+            prefix = keys[lo][:length]
+            end = bisect_left(keys, prefix + KEY_END, lo, hi)
+            if end - lo > self.dense_range:
+                self.dense[prefix] = self._top(lo, end)
+                self._precompute(lo, end, length + 1)
+            lo = end
+
+
+class AutocompleteService:
+    """As-you-type suggestions across alternative names, brands, recipe titles and meat types.
+
+    Popularity is `rating * review_count` for alternatives and recipes, the
+    sum of that over a brand's alternatives for brands, and the number of
+    searches in the last `search_window_days` days for meat types. The index
+    is rebuilt when the catalog changes and every `refresh_interval` seconds
+    to pick up new search counts.
+    """
+
+    def __init__(
+        self,
+        cache: CatalogCache = catalog_cache,
+        analytics: AnalyticsService = analytics_service,
+        top_k: Optional[int] = None,
+        refresh_interval: Optional[float] = None,
+        search_window_days: int = 30
+    ):
+        self.cache = cache
+        self.analytics = analytics
+        self.top_k = top_k if top_k is not None else int(os.getenv("AUTOCOMPLETE_TOP_K", "10"))
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(os.getenv("AUTOCOMPLETE_REFRESH_INTERVAL", "600"))
+        self.search_window_days = search_window_days
+        self.index = AutocompleteIndex([], self.top_k)
+        self.built_at: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Build the index and keep refreshing it in the background."""
+        if self._task is None:
+            try:
+                await self.build()
+            except Exception as e:
+                logger.error(f"Failed to build autocomplete index: {str(e)}")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background refresh."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Most popular suggestions with a word starting with `prefix`."""
+        key = suggestion_key(prefix)
+        if not key:
+            return []
+        return [suggestion._asdict() for suggestion in self.index.lookup(key, min(limit, self.top_k))]
+
+    async def build(self):
+        """Rebuild the index from the catalog and recent search counts."""
+        alternatives, recipes, cravings, search_counts = await asyncio.gather(
+            self.cache.find("alternatives", {"is_active": {"$ne": False}}),
+            self.cache.find("recipes", {"is_active": {"$ne": False}}),
+            self.cache.find("meat_cravings"),
+            self._search_counts()
+        )
+
+        suggestions = []
+        brands: Dict[str, float] = defaultdict(float)
+        for alternative in alternatives:
+            popularity = self._popularity(alternative)
+            suggestions.append(Suggestion(alternative["name"], "alternative", alternative["id"], popularity))
+            if alternative.get("brand"):
+                brands[alternative["brand"]] += popularity
+        suggestions.extend(Suggestion(brand, "brand", None, popularity) for brand, popularity in brands.items())
+        for recipe in recipes:
+            suggestions.append(Suggestion(recipe["title"], "recipe", recipe["id"], self._popularity(recipe)))
+
+        # Meat types keep the craving's display name, or a title-cased value without one
+        names = {craving["meat_type"]: craving["name"] for craving in cravings}
+        for meat_type in MeatType:
+            name = names.get(meat_type.value, meat_type.value.replace("_", " ").title())
+            suggestions.append(Suggestion(name, "meat_type", meat_type.value, float(search_counts.get(meat_type.value, 0))))
+
+        self.index = AutocompleteIndex(suggestions, self.top_k)
+        self.built_at = datetime.utcnow()
+        logger.info(f"Autocomplete index built with {len(suggestions)} suggestions")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: rebuild after any catalog change."""
+        await self.build()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.build()
+            except Exception as e:
+                logger.error(f"Autocomplete refresh error: {str(e)}")
+
+    async def _search_counts(self) -> Dict[str, int]:
+        since = datetime.utcnow() - timedelta(days=self.search_window_days)
+        counts: Dict[str, int] = defaultdict(int)
+        for rollup in await self.analytics.get_rollups(since):
+            for key, count in rollup.get("meat_types", {}).get(EventType.SEARCH.value, {}).items():
+                meat_type = meat_type_value(key)
+                if meat_type is not None:
+                    counts[meat_type] += count
+        return counts
+
+    @staticmethod
+    def _popularity(document: Dict[str, Any]) -> float:
+        return float(document.get("rating") or 0) * (document.get("review_count") or 0)
+
+# Create global instance
+autocomplete_service = AutocompleteService()
+
+for _collection_name in ("alternatives", "recipes", "meat_cravings"):
+    catalog_events.subscribe(_collection_name, autocomplete_service.reload)
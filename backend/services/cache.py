@@ -0,0 +1,183 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+import time
+
+from services.database import db_service, DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """An LRU-bounded cache whose entries expire after `ttl` seconds.
+
+    `get_or_load` is single-flight: concurrent misses for the same key share
+    one loader call instead of each going to the database.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for `key`, loading it on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        # An invalidation while loading means the value may already be stale
+        if generation == self._generation:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries beyond `maxsize`."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when no key is given."""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Default TTL (seconds) per catalog collection; override with CACHE_TTL_<COLLECTION>
+CATALOG_TTLS = {
+    "alternatives": 300,
+    "recipes": 300,
+    "meat_cravings": 3600,
+    "testimonials": 600,
+}
+
+
+class CatalogCache:
+    """Read-through cache for the read-mostly catalog collections.
+
+    Cached documents are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, database: DatabaseService = db_service):
+        self.db = database
+        maxsize = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+        self.caches: Dict[str, TTLCache] = {
+            name: TTLCache(name, float(os.getenv(f"CACHE_TTL_{name.upper()}", ttl)), maxsize)
+            for name, ttl in CATALOG_TTLS.items()
+        }
+
+    async def find(
+        self,
+        collection_name: str,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Cached equivalent of `find(query, projection).sort(sort).limit(limit)`."""
+        query = query or {}
+        projection = projection or {"_id": 0}
+        key = self._key("find", query, projection, sort, limit)
+
+        async def load():
+            collection = await self.db.get_collection(collection_name)
+            cursor = collection.find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(length=None)
+
+        return await self.caches[collection_name].get_or_load(key, load)
+
+    async def find_one(
+        self,
+        collection_name: str,
+        query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cached equivalent of `find_one(query, projection)`."""
+        projection = projection or {"_id": 0}
+        key = self._key("find_one", query, projection)
+
+        async def load():
+            collection = await self.db.get_collection(collection_name)
+            return await collection.find_one(query, projection)
+
+        return await self.caches[collection_name].get_or_load(key, load)
+
+    def invalidate(self, collection_name: Optional[str] = None):
+        """Drop cached reads for one catalog collection, or for all of them."""
+        names = [collection_name] if collection_name else list(self.caches)
+        for name in names:
+            if name in self.caches:
+                self.caches[name].invalidate()
+        logger.info(f"Catalog cache invalidated: {', '.join(names)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss statistics per collection."""
+        return {name: cache.stats() for name, cache in self.caches.items()}
+
+    @staticmethod
+    def _key(*parts: Any) -> str:
+        return json.dumps(parts, sort_keys=True, default=str)
+
+# Create global instance
+catalog_cache = CatalogCache()
@@ -0,0 +1,40 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import inspect
+import logging
+
+from services.cache import catalog_cache
+
+logger = logging.getLogger(__name__)
+
+# listener(collection_name, documents); documents is None when the whole collection changed
+CatalogListener = Callable[[str, Optional[List[Dict[str, Any]]]], Optional[Awaitable[None]]]
+
+
+class CatalogEvents:
+    """Notify in-memory catalog structures that catalog documents changed.
+
+    Writers (the seeder, admin edits) call `publish` after writing. The
+    catalog cache is always invalidated first, so listeners that reload
+    through it see fresh data.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, List[CatalogListener]] = {}
+
+    def subscribe(self, collection_name: str, listener: CatalogListener):
+        """Call `listener` whenever documents in `collection_name` change."""
+        self._listeners.setdefault(collection_name, []).append(listener)
+
+    async def publish(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Announce changed documents, or a change to the whole collection when `documents` is None."""
+        catalog_cache.invalidate(collection_name)
+        for listener in self._listeners.get(collection_name, []):
+            try:
+                result = listener(collection_name, documents)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Catalog listener failed for {collection_name}: {str(e)}")
+
+# Create global instance
+catalog_events = CatalogEvents()
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from services.database import db_service, DatabaseService
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+
+logger = logging.getLogger(__name__)
+
+# Collections shipped to clients
+FEED_COLLECTIONS = ("alternatives", "recipes", "meat_cravings")
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def catalog_version(timestamp: Optional[datetime]) -> int:
+    """Version number of an `updated_at`: milliseconds since the epoch, as MongoDB stores it."""
+    if timestamp is None:
+        return 0
+    return (timestamp.replace(tzinfo=None) - EPOCH) // timedelta(milliseconds=1)
+
+
+def version_timestamp(version: int) -> datetime:
+    return EPOCH + timedelta(milliseconds=version)
+
+
+class Snapshot(NamedTuple):
+    version: int
+    body: bytes  # serialized JSON
+    gzipped: bytes
+    etag: str  # strong ETag of `body`; the gzip representation gets its own
+
+
+class CatalogFeed:
+    """Versioned catalog snapshot plus a "changes since version N" delta feed.
+
+    The catalog version is the newest `updated_at` across the feed
+    collections, in epoch milliseconds. The snapshot (all active documents)
+    is serialized and gzipped once per catalog change and served as bytes.
+    The delta feed returns documents with `updated_at` after the client's
+    version; deactivated documents come back as removals. Writers must bump
+    `updated_at` on every change, and deletions must be deactivations for
+    clients to see them.
+
+    Changes made in this process invalidate the snapshot through catalog
+    events. Changes made elsewhere (another server, a `manage.py` command)
+    are noticed by re-reading the catalog version at most every
+    `check_interval` seconds; a newer version drops the cached catalog
+    reads and renders a new snapshot.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseService = db_service,
+        cache: CatalogCache = catalog_cache,
+        check_interval: Optional[float] = None
+    ):
+        self.db = database
+        self.cache = cache
+        self.check_interval = check_interval if check_interval is not None else float(os.getenv("CATALOG_FEED_CHECK_INTERVAL", "5"))
+        self._snapshot: Optional[Snapshot] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._generation = 0
+
+    async def snapshot(self) -> Snapshot:
+        """The current snapshot, rendering it if the catalog changed since the last one."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked_at < self.check_interval:
+                return snapshot
+            generation = self._generation
+            version = await self._version()
+            self._checked_at = time.monotonic()
+            if snapshot is not None:
+                if version == snapshot.version:
+                    return snapshot
+                # Changed by another process, so the cached reads are stale as well
+                for collection_name in FEED_COLLECTIONS:
+                    self.cache.invalidate(collection_name)
+            snapshot = await self._render(version)
+            # A change while rendering means the snapshot may already be stale
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def invalidate(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: render a new snapshot on the next request."""
+        self._generation += 1
+        self._snapshot = None
+
+    async def changes(self, since: int, limit: int = 500) -> Dict[str, Any]:
+        """Documents changed after version `since`, at most `limit` per collection.
+
+        When a collection has more, `has_more` is set and `version` stops
+        before its first undelivered document; request again from `version`.
+        """
+        after = version_timestamp(since)
+        batches = {}
+        cutoff = None
+        for collection_name in FEED_COLLECTIONS:
+            collection = await self.db.get_collection(collection_name)
+            documents = await collection.find(
+                {"updated_at": {"$gt": after}}, {"_id": 0}
+            ).sort([("updated_at", 1), ("id", 1)]).limit(limit + 1).to_list(length=None)
+            if len(documents) > limit:
+                # Stop before the first undelivered timestamp so nothing sharing it is skipped
+                boundary = documents[limit]["updated_at"]
+                documents = [document for document in documents if document["updated_at"] < boundary]
+                if not documents:
+                    # More than `limit` documents share one timestamp: deliver them all
+                    documents = await collection.find({"updated_at": boundary}, {"_id": 0}).to_list(length=None)
+                    batch_cutoff = catalog_version(boundary)
+                else:
+                    batch_cutoff = catalog_version(boundary) - 1
+                cutoff = batch_cutoff if cutoff is None else min(cutoff, batch_cutoff)
+            batches[collection_name] = documents
+
+        version = since
+        changes = {}
+        for collection_name, documents in batches.items():
+            if cutoff is not None:
+                documents = [document for document in documents if catalog_version(document["updated_at"]) <= cutoff]
+            for document in documents:
+                version = max(version, catalog_version(document["updated_at"]))
+            changes[collection_name] = {
+                "upserted": [document for document in documents if document.get("is_active", True)],
+                "removed": [document["id"] for document in documents if not document.get("is_active", True)],
+            }
+        if cutoff is not None:
+            version = max(version, cutoff)
+
+        return jsonable_encoder({"since": since, "version": version, "has_more": cutoff is not None, "changes": changes})
+
+    async def _version(self) -> int:
+        """Newest `updated_at` across the feed collections, deactivated documents included."""
+        version = 0
+        for collection_name in FEED_COLLECTIONS:
+            collection = await self.db.get_collection(collection_name)
+            newest = await collection.find_one({}, {"_id": 0, "updated_at": 1}, sort=[("updated_at", -1)])
+            if newest:
+                version = max(version, catalog_version(newest.get("updated_at")))
+        return version
+
+    async def _render(self, version: int) -> Snapshot:
+        # The version is read before the documents: anything changed while
+        # they load is newer and comes again as a change
+        catalog = {
+            collection_name: await self.cache.find(collection_name, {"is_active": {"$ne": False}})
+            for collection_name in FEED_COLLECTIONS
+        }
+        body = json.dumps(jsonable_encoder({"version": version, **catalog}), separators=(",", ":")).encode()
+        gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+        snapshot = Snapshot(version, body, gzipped, f'"{hashlib.sha1(body).hexdigest()}"')
+        logger.info(f"Catalog snapshot v{version}: {len(body)} bytes, {len(gzipped)} gzipped")
+        return snapshot
+
+# Create global instance
+catalog_feed = CatalogFeed()
+
+for _collection_name in FEED_COLLECTIONS:
+    catalog_events.subscribe(_collection_name, catalog_feed.invalidate)
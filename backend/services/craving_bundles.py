@@ -0,0 +1,138 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+import hashlib
+import json
+import logging
+import os
+
+from fastapi.encoders import jsonable_encoder
+
+from models.alternatives import MeatType
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+
+logger = logging.getLogger(__name__)
+
+# Collections a bundle is made of
+BUNDLE_COLLECTIONS = ("meat_cravings", "alternatives", "recipes")
+
+
+class Bundle(NamedTuple):
+    body: bytes  # serialized JSON
+    etag: str
+
+
+def bundle_meat_type(value: Any) -> Optional[str]:
+    """MeatType value of a document's `meat_type` (stored as an enum value or a plain string)."""
+    value = getattr(value, "value", value)
+    return value.lower() if isinstance(value, str) else None
+
+
+class CravingBundles:
+    """One pre-serialized JSON document per MeatType for the main craving flow.
+
+    A bundle holds the craving explanation, the top rated alternatives and
+    the featured recipes for a meat type, rendered to bytes ahead of time
+    so a request is a dict lookup. The materializer keeps each collection's
+    active documents grouped by meat type; when documents change, only the
+    meat types whose groups changed are re-rendered.
+    """
+
+    def __init__(
+        self,
+        cache: CatalogCache = catalog_cache,
+        alternatives_per_bundle: Optional[int] = None,
+        recipes_per_bundle: Optional[int] = None
+    ):
+        self.cache = cache
+        self.alternatives_per_bundle = alternatives_per_bundle if alternatives_per_bundle is not None else int(os.getenv("BUNDLE_ALTERNATIVES", "12"))
+        self.recipes_per_bundle = recipes_per_bundle if recipes_per_bundle is not None else int(os.getenv("BUNDLE_RECIPES", "6"))
+        self._groups: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {name: {} for name in BUNDLE_COLLECTIONS}
+        self._bundles: Dict[str, Bundle] = {}
+        self.renders = 0
+
+    async def build(self):
+        """Load every bundle collection and render all bundles."""
+        for collection_name in BUNDLE_COLLECTIONS:
+            self._groups[collection_name] = self._group(await self._load(collection_name))
+        self._render([meat_type.value for meat_type in MeatType])
+        logger.info(f"Craving bundles built for {len(self._bundles)} meat types")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: re-render the bundles whose inputs changed."""
+        if documents is None:
+            groups = self._group(await self._load(collection_name))
+            previous = self._groups[collection_name]
+            changed = {
+                meat_type for meat_type in set(groups) | set(previous)
+                if groups.get(meat_type) != previous.get(meat_type)
+            }
+            self._groups[collection_name] = groups
+        else:
+            changed = self.apply(collection_name, documents)
+        changed &= {meat_type.value for meat_type in MeatType}
+        if changed:
+            self._render(sorted(changed))
+            logger.info(f"Craving bundles re-rendered: {', '.join(sorted(changed))}")
+
+    def apply(self, collection_name: str, documents: List[Dict[str, Any]]) -> Set[str]:
+        """Upsert (or drop inactive) documents in the groups; returns the meat types touched."""
+        groups = self._groups[collection_name]
+        changed = set()
+        for document in documents:
+            for meat_type, members in groups.items():
+                if members.pop(document["id"], None) is not None:
+                    changed.add(meat_type)
+            meat_type = bundle_meat_type(document.get("meat_type"))
+            if meat_type is not None and document.get("is_active") is not False:
+                groups.setdefault(meat_type, {})[document["id"]] = {
+                    key: value for key, value in document.items() if key != "_id"
+                }
+                changed.add(meat_type)
+        return changed
+
+    def get(self, meat_type: str) -> Optional[Bundle]:
+        """The pre-rendered bundle for a meat type, if built."""
+        return self._bundles.get(meat_type)
+
+    def _render(self, meat_types: List[str]):
+        for meat_type in meat_types:
+            cravings = list(self._groups["meat_cravings"].get(meat_type, {}).values())
+            alternatives = sorted(
+                self._groups["alternatives"].get(meat_type, {}).values(),
+                key=lambda document: (-(document.get("rating") or 0), -(document.get("review_count") or 0), document["id"])
+            )
+            # Featured recipes first, then the best rated to fill the bundle
+            recipes = sorted(
+                self._groups["recipes"].get(meat_type, {}).values(),
+                key=lambda document: (not document.get("is_featured"), -(document.get("rating") or 0), document["id"])
+            )
+            body = json.dumps(jsonable_encoder({
+                "meat_type": meat_type,
+                "craving": cravings[0] if cravings else None,
+                "alternatives": alternatives[:self.alternatives_per_bundle],
+                "recipes": recipes[:self.recipes_per_bundle],
+                "generated_at": datetime.utcnow(),
+            }), separators=(",", ":")).encode()
+            self._bundles[meat_type] = Bundle(body, f'"{hashlib.sha1(body).hexdigest()}"')
+            self.renders += 1
+
+    async def _load(self, collection_name: str) -> List[Dict[str, Any]]:
+        if collection_name == "meat_cravings":
+            return await self.cache.find(collection_name)
+        return await self.cache.find(collection_name, {"is_active": {"$ne": False}})
+
+    @staticmethod
+    def _group(documents: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for document in documents:
+            meat_type = bundle_meat_type(document.get("meat_type"))
+            if meat_type is not None:
+                groups.setdefault(meat_type, {})[document["id"]] = document
+        return groups
+
+# Create global instance
+craving_bundles = CravingBundles()
+
+for _collection_name in BUNDLE_COLLECTIONS:
+    catalog_events.subscribe(_collection_name, craving_bundles.reload)
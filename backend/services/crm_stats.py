@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import os
+
+from models.crm import CRMStats
+from services.cache import TTLCache
+from services.database import db_service, DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class CRMStatsEngine:
+    """CRM statistics from one `$facet` pass over `contacts`, memoized for a few seconds.
+
+    Concurrent requests while the cache is cold share a single computation;
+    responses carry `generated_at` and `age_seconds` so clients can tell how
+    stale they are.
+    """
+
+    def __init__(self, database: DatabaseService = db_service, ttl: Optional[float] = None):
+        self.database = database
+        self.ttl = ttl if ttl is not None else float(os.getenv("CRM_STATS_TTL", "30"))
+        self._cache = TTLCache("crm_stats", self.ttl, maxsize=1)
+
+    async def get(self) -> CRMStats:
+        """Return memoized stats, computing them if expired."""
+        stats = await self._cache.get_or_load("crm_stats", self.compute)
+        age = (datetime.utcnow() - stats.generated_at).total_seconds()
+        return stats.model_copy(update={"age_seconds": round(age, 3)})
+
+    def invalidate(self):
+        self._cache.invalidate()
+
+    async def compute(self) -> CRMStats:
+        """Compute fresh stats: one aggregation plus the indexed recent-contacts query."""
+        contacts_collection = await self.database.get_collection("contacts")
+        now = datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+        month_ago = now - timedelta(days=30)
+
+        aggregation = contacts_collection.aggregate([
+            {"$facet": {
+                "totals": [
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "week": {"$sum": {"$cond": [{"$gte": ["$created_at", week_ago]}, 1, 0]}},
+                        "month": {"$sum": {"$cond": [{"$gte": ["$created_at", month_ago]}, 1, 0]}},
+                        "business": {"$sum": {"$cond": [{"$eq": ["$is_business_inquiry", True]}, 1, 0]}},
+                        "emails_sent": {"$sum": "$emails_sent"},
+                        "emails_opened": {"$sum": "$email_opens"}
+                    }}
+                ],
+                "by_status": [
+                    {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}}
+                ],
+                "by_source": [
+                    {"$group": {"_id": "$source", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}}
+                ]
+            }}
+        ]).to_list(length=None)
+
+        recent = contacts_collection.find(
+            {},
+            {"_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1, "created_at": 1, "is_business_inquiry": 1}
+        ).sort("created_at", -1).limit(10).to_list(length=None)
+
+        result, recent_contacts = await asyncio.gather(aggregation, recent)
+
+        facets: Dict[str, Any] = result[0] if result else {}
+        totals = (facets.get("totals") or [{}])[0]
+        emails_sent = totals.get("emails_sent", 0)
+        emails_opened = totals.get("emails_opened", 0)
+
+        return CRMStats(
+            total_contacts=totals.get("total", 0),
+            new_contacts_this_week=totals.get("week", 0),
+            new_contacts_this_month=totals.get("month", 0),
+            contacts_by_status={item["_id"]: item["count"] for item in facets.get("by_status", [])},
+            contacts_by_source={item["_id"]: item["count"] for item in facets.get("by_source", [])},
+            business_inquiries=totals.get("business", 0),
+            email_engagement_rate=(emails_opened / emails_sent * 100) if emails_sent > 0 else 0,
+            recent_contacts=recent_contacts,
+            generated_at=now
+        )
+
+# Create global instance
+crm_stats_engine = CRMStatsEngine()
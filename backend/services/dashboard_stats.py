@@ -0,0 +1,227 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from collections import Counter
+import asyncio
+import logging
+import os
+
+from models.analytics import DashboardStats
+from services.database import db_service, DatabaseService
+from services.analytics import ROLLUP_COLLECTION, meat_type_value
+
+logger = logging.getLogger(__name__)
+
+TREND_DAYS = 7
+DAY_FORMAT = "%Y-%m-%d"
+
+
+class DashboardStatsEngine:
+    """Compute the admin dashboard in one aggregation round trip per collection.
+
+    With `use_rollups` the analytics figures come from the `analytics_daily`
+    rollups instead of the raw events, so their cost depends on the number of
+    days rather than the number of events.
+    """
+
+    def __init__(self, database: DatabaseService = db_service, use_rollups: Optional[bool] = None):
+        self.database = database
+        if use_rollups is None:
+            use_rollups = os.getenv("DASHBOARD_USE_ROLLUPS", "false").lower() == "true"
+        self.use_rollups = use_rollups
+
+    async def compute(self) -> DashboardStats:
+        """Run the per-collection pipelines concurrently and assemble the stats."""
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        users, analytics, total_alternatives, total_recipes, reviews = await asyncio.gather(
+            self._user_stats(today),
+            self._rollup_stats(today) if self.use_rollups else self._analytics_stats(today),
+            self._count("alternatives"),
+            self._count("recipes"),
+            self._review_stats(),
+        )
+
+        return DashboardStats(
+            total_users=users["total_users"],
+            active_users_today=analytics["active_users_today"],
+            active_users_week=analytics["active_users_week"],
+            active_users_month=analytics["active_users_month"],
+            total_searches=analytics["total_searches"],
+            searches_today=analytics["searches_today"],
+            total_alternatives=total_alternatives,
+            total_recipes=total_recipes,
+            total_reviews=reviews["total_reviews"],
+            pending_reviews=reviews["pending_reviews"],
+            popular_searches=analytics["popular_searches"],
+            user_growth=self._fill_days(today, users["growth"], "users"),
+            search_trends=self._fill_days(today, analytics["search_trends"], "searches"),
+        )
+
+    async def _count(self, name: str) -> int:
+        collection = await self.database.get_collection(name)
+        return await collection.count_documents({})
+
+    async def _user_stats(self, today: datetime) -> Dict[str, Any]:
+        """Total users plus signups per day for the trend window."""
+        users_collection = await self.database.get_collection("users")
+        window_start = today - timedelta(days=TREND_DAYS - 1)
+        window_end = today + timedelta(days=1)
+
+        result = await users_collection.aggregate([
+            {"$facet": {
+                "total": [{"$count": "count"}],
+                "growth": [
+                    {"$match": {"created_at": {"$gte": window_start, "$lt": window_end}}},
+                    {"$group": {
+                        "_id": {"$dateToString": {"format": DAY_FORMAT, "date": "$created_at"}},
+                        "count": {"$sum": 1}
+                    }}
+                ]
+            }}
+        ]).to_list(length=None)
+
+        facets = result[0] if result else {}
+        return {
+            "total_users": self._facet_count(facets.get("total")),
+            "growth": {item["_id"]: item["count"] for item in facets.get("growth", [])},
+        }
+
+    async def _analytics_stats(self, today: datetime) -> Dict[str, Any]:
+        """Login and search counters, popular searches and daily search trend."""
+        analytics_collection = await self.database.get_collection("analytics")
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+        window_start = today - timedelta(days=TREND_DAYS - 1)
+        window_end = today + timedelta(days=1)
+
+        result = await analytics_collection.aggregate([
+            {"$match": {"event_type": {"$in": ["user_login", "search"]}}},
+            {"$facet": {
+                "logins": [
+                    {"$match": {"event_type": "user_login", "timestamp": {"$gte": month_ago}}},
+                    {"$group": {
+                        "_id": None,
+                        "today": {"$sum": {"$cond": [{"$gte": ["$timestamp", today]}, 1, 0]}},
+                        "week": {"$sum": {"$cond": [{"$gte": ["$timestamp", week_ago]}, 1, 0]}},
+                        "month": {"$sum": 1}
+                    }}
+                ],
+                "searches": [
+                    {"$match": {"event_type": "search"}},
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "today": {"$sum": {"$cond": [{"$gte": ["$timestamp", today]}, 1, 0]}}
+                    }}
+                ],
+                "popular_searches": [
+                    {"$match": {"event_type": "search"}},
+                    {"$group": {"_id": "$event_data.meat_type", "count": {"$sum": 1}}},
+                    {"$sort": {"count": -1}},
+                    {"$limit": 10}
+                ],
+                "search_trends": [
+                    {"$match": {
+                        "event_type": "search",
+                        "timestamp": {"$gte": window_start, "$lt": window_end}
+                    }},
+                    {"$group": {
+                        "_id": {"$dateToString": {"format": DAY_FORMAT, "date": "$timestamp"}},
+                        "count": {"$sum": 1}
+                    }}
+                ]
+            }}
+        ]).to_list(length=None)
+
+        facets = result[0] if result else {}
+        logins = (facets.get("logins") or [{}])[0]
+        searches = (facets.get("searches") or [{}])[0]
+        return {
+            "active_users_today": logins.get("today", 0),
+            "active_users_week": logins.get("week", 0),
+            "active_users_month": logins.get("month", 0),
+            "total_searches": searches.get("total", 0),
+            "searches_today": searches.get("today", 0),
+            "popular_searches": facets.get("popular_searches", []),
+            "search_trends": {item["_id"]: item["count"] for item in facets.get("search_trends", [])},
+        }
+
+    async def _rollup_stats(self, today: datetime) -> Dict[str, Any]:
+        """Same figures as `_analytics_stats`, summed from the daily rollups."""
+        rollups_collection = await self.database.get_collection(ROLLUP_COLLECTION)
+        week_ago = today - timedelta(days=7)
+        month_ago = today - timedelta(days=30)
+        window_start = today - timedelta(days=TREND_DAYS - 1)
+
+        rollups = await rollups_collection.find(
+            {},
+            {"day": 1, "events.user_login": 1, "events.search": 1, "meat_types.search": 1}
+        ).to_list(length=None)
+
+        stats = {
+            "active_users_today": 0,
+            "active_users_week": 0,
+            "active_users_month": 0,
+            "total_searches": 0,
+            "searches_today": 0,
+        }
+        search_trends: Dict[str, int] = {}
+        popular = Counter()
+
+        for rollup in rollups:
+            day = rollup["day"]
+            events = rollup.get("events", {})
+            logins = events.get("user_login", 0)
+            searches = events.get("search", 0)
+
+            if day >= today:
+                stats["active_users_today"] += logins
+                stats["searches_today"] += searches
+            if day >= week_ago:
+                stats["active_users_week"] += logins
+            if day >= month_ago:
+                stats["active_users_month"] += logins
+            if day >= window_start:
+                search_trends[rollup["_id"]] = searches
+            stats["total_searches"] += searches
+            popular.update(rollup.get("meat_types", {}).get("search", {}))
+
+        stats["popular_searches"] = [
+            {"_id": meat_type_value(key), "count": count} for key, count in popular.most_common(10)
+        ]
+        stats["search_trends"] = search_trends
+        return stats
+
+    async def _review_stats(self) -> Dict[str, Any]:
+        """Total and pending review counts."""
+        reviews_collection = await self.database.get_collection("reviews")
+
+        result = await reviews_collection.aggregate([
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "pending": {"$sum": {"$cond": [{"$eq": ["$status", "pending"]}, 1, 0]}}
+            }}
+        ]).to_list(length=None)
+
+        totals = result[0] if result else {}
+        return {
+            "total_reviews": totals.get("total", 0),
+            "pending_reviews": totals.get("pending", 0),
+        }
+
+    @staticmethod
+    def _facet_count(facet: List[Dict[str, Any]]) -> int:
+        return facet[0]["count"] if facet else 0
+
+    @staticmethod
+    def _fill_days(today: datetime, buckets: Dict[str, int], field: str) -> List[Dict[str, Any]]:
+        """Expand day buckets into the newest-first series the dashboard expects."""
+        series = []
+        for i in range(TREND_DAYS):
+            day = (today - timedelta(days=i)).strftime(DAY_FORMAT)
+            series.append({"date": day, field: buckets.get(day, 0)})
+        return series
+
+# Create global instance
+dashboard_stats_engine = DashboardStatsEngine()
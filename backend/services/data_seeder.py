@@ -5,6 +5,7 @@ from models.user import User, UserRole
 from models.alternatives import MeatCraving
 from services.database import db_service
 from services.auth import get_password_hash
+from services.catalog_events import catalog_events
 from typing import List
 import logging
 
@@ -88,10 +89,11 @@ class DataSeeder:
         for craving in meat_cravings:
             await collection.replace_one(
                 {"meat_type": craving.meat_type},
-                craving.dict(),
+                craving.model_dump(),
                 upsert=True
             )
         
+        await catalog_events.publish("meat_cravings")
         logger.info("Meat cravings seeded successfully")
 
     async def seed_alternatives(self):
@@ -292,10 +294,11 @@ class DataSeeder:
         for alternative in alternatives:
             await collection.replace_one(
                 {"name": alternative.name, "brand": alternative.brand},
-                alternative.dict(),
+                alternative.model_dump(),
                 upsert=True
             )
         
+        await catalog_events.publish("alternatives")
         logger.info("Alternatives seeded successfully")
 
     async def seed_recipes(self):
@@ -447,10 +450,11 @@ class DataSeeder:
         for recipe in recipes:
             await collection.replace_one(
                 {"title": recipe.title},
-                recipe.dict(),
+                recipe.model_dump(),
                 upsert=True
             )
         
+        await catalog_events.publish("recipes")
         logger.info("Recipes seeded successfully")
 
     async def seed_admin_user(self):
@@ -470,7 +474,7 @@ class DataSeeder:
         collection = await self.db.get_collection("users")
         await collection.replace_one(
             {"email": admin_user.email},
-            admin_user.dict(),
+            admin_user.model_dump(),
             upsert=True
         )
         
@@ -512,10 +516,11 @@ class DataSeeder:
         for testimonial in testimonials:
             await collection.replace_one(
                 {"user_name": testimonial.user_name, "title": testimonial.title},
-                testimonial.dict(),
+                testimonial.model_dump(),
                 upsert=True
             )
         
+        await catalog_events.publish("testimonials")
         logger.info("Testimonials seeded successfully")
 
     async def seed_all(self):
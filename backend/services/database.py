@@ -1,100 +1,259 @@
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from collections import deque
 from typing import Optional, Dict, Any, List
+import asyncio
 import os
 import logging
+import threading
+import time
+
+from services.id_codec import IdCodec
+from services.indexes import acquire_leadership, reconcile_indexes, release_leadership
+from services.query_plans import QueryRecorder
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds (ms) of the checkout wait histogram buckets
+WAIT_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf")]
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters and checkout wait times, from PyMongo pool events.
+
+    Motor runs each operation on a worker thread, where the pool emits
+    "checkout started" and then "checked out" (or "checkout failed"); the
+    time between the two is how long the operation waited for a connection.
+    """
+
+    def __init__(self, samples: int = 2048):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._recent: deque = deque(maxlen=samples)
+        self._buckets = [0] * len(WAIT_BUCKETS_MS)
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.pools_cleared = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._wait_ms()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+            if wait_ms is not None:
+                self.total_wait_ms += wait_ms
+                self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+                self._recent.append(wait_ms)
+                self._buckets[next(i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait_ms <= bound)] += 1
+
+    def connection_check_out_failed(self, event):
+        self._wait_ms()
+        with self._lock:
+            reason = str(event.reason)
+            self.checkout_failures[reason] = self.checkout_failures.get(reason, 0) + 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Checkout wait times and connection counts since startup."""
+        with self._lock:
+            recent = sorted(self._recent)
+            buckets = dict(zip(
+                [f"le_{bound:g}ms" if bound != float("inf") else "gt_1000ms" for bound in WAIT_BUCKETS_MS],
+                self._buckets
+            ))
+            return {
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "open_connections": self.connections_created - self.connections_closed,
+                "connections_created": self.connections_created,
+                "pools_cleared": self.pools_cleared,
+                "wait_ms": {
+                    "mean": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                    "p50": round(recent[len(recent) // 2], 3) if recent else 0.0,
+                    "p99": round(recent[min(len(recent) - 1, int(len(recent) * 0.99))], 3) if recent else 0.0,
+                    "max": round(self.max_wait_ms, 3),
+                    "buckets": buckets,
+                },
+            }
+
+    def _wait_ms(self) -> Optional[float]:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return None if started is None else (time.perf_counter() - started) * 1000
+
+
+def pool_options() -> Dict[str, Any]:
+    """Client pool settings from the environment (MONGO_MAX_POOL_SIZE, MONGO_READ_PREFERENCE, ...)."""
+    return {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "10")),
+        "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")),
+        "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000")),
+        "readPreference": os.getenv("MONGO_READ_PREFERENCE", "primary"),
+    }
+
+
 class DatabaseService:
+    """Owns the process's single MongoDB client and its connection pool.
+
+    Every service and route goes through `db_service`, so a worker holds one
+    pool, sized and timed out by `pool_options`. `connect` pre-warms
+    `MONGO_PREWARM_CONNECTIONS` connections (the pool minimum by default) so
+    the first requests do not pay for connection setup. With
+    MONGO_RECORD_QUERY_SHAPES=1 the distinct query shapes sent are recorded
+    for `services.query_plans.advise`. ID_STORAGE selects how document ids
+    are stored (see `IdCodec`).
+    """
+
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
         self.db: Optional[AsyncIOMotorDatabase] = None
+        self.pool_metrics = PoolMetrics()
+        self.query_recorder = QueryRecorder()
+        self.id_codec = IdCodec("string")
+        self.options: Dict[str, Any] = {}
 
-    async def connect(self):
-        """Connect to MongoDB."""
+    async def connect(self, ensure_indexes: bool = True):
+        """Connect to MongoDB (once per process) and reconcile indexes unless told not to."""
+        if self.client is not None:
+            return
         try:
             mongo_url = os.getenv('MONGO_URL')
             if not mongo_url:
                 raise ValueError("MONGO_URL environment variable is not set")
             
-            self.client = AsyncIOMotorClient(mongo_url)
+            self.options = pool_options()
+            self.id_codec = IdCodec()
+            listeners: List[Any] = [self.pool_metrics]
+            if os.getenv("MONGO_RECORD_QUERY_SHAPES") == "1":
+                listeners.append(self.query_recorder)
+            self.client = AsyncIOMotorClient(mongo_url, event_listeners=listeners, **self.options)
             self.db = self.client[os.getenv('DB_NAME', 'cravekind')]
             
             # Test connection
             await self.client.admin.command('ping')
             logger.info("Successfully connected to MongoDB")
             
-            # Create indexes
-            await self.create_indexes()
+            await self.prewarm(int(os.getenv("MONGO_PREWARM_CONNECTIONS", str(self.options["minPoolSize"]))))
+            
+            if ensure_indexes:
+                try:
+                    await self.ensure_indexes()
+                except Exception as e:
+                    # Missing indexes slow queries down but do not stop the app from serving
+                    logger.error(f"Index reconciliation failed: {str(e)}")
             
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {str(e)}")
+            # Leave no half-connected client behind, so the next connect() retries
+            if self.client is not None:
+                self.client.close()
+            self.client = None
+            self.db = None
             raise
 
+    async def prewarm(self, connections: int):
+        """Open up to `connections` pooled connections now by running that many pings concurrently."""
+        connections = min(connections, self.options.get("maxPoolSize", connections))
+        if connections <= 0:
+            return
+        start = time.perf_counter()
+        await asyncio.gather(*(self.client.admin.command('ping') for _ in range(connections)))
+        logger.info(f"Pre-warmed {connections} MongoDB connections in {(time.perf_counter() - start) * 1000:.0f}ms")
+
     async def disconnect(self):
         """Disconnect from MongoDB."""
         if self.client:
             self.client.close()
+            self.client = None
+            self.db = None
             logger.info("Disconnected from MongoDB")
 
-    async def create_indexes(self):
-        """Create database indexes for optimal performance."""
+    async def ensure_indexes(self, mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Reconcile indexes with the manifest according to MONGO_INDEX_MODE.
+
+        "startup" reconciles on every worker, "leader" only on the worker
+        that takes the reconciliation lease, and "off" leaves it to
+        `python manage.py sync-indexes`. Returns the report, or None when skipped.
+        """
+        mode = mode or os.getenv("MONGO_INDEX_MODE", "startup")
+        if mode == "off":
+            logger.info("Index reconciliation skipped (MONGO_INDEX_MODE=off)")
+            return None
+        if mode not in ("startup", "leader"):
+            raise ValueError(f"Invalid MONGO_INDEX_MODE: {mode}")
+
+        if mode == "leader" and not await acquire_leadership(self.db):
+            logger.info("Index reconciliation skipped: another worker holds the lease")
+            return None
         try:
-            # User indexes
-            await self.db.users.create_index("email", unique=True)
-            await self.db.users.create_index("verification_token")
-            await self.db.users.create_index("reset_token")
-            await self.db.users.create_index("created_at")
-            
-            # Alternative indexes
-            await self.db.alternatives.create_index("meat_type")
-            await self.db.alternatives.create_index("brand")
-            await self.db.alternatives.create_index("type")
-            await self.db.alternatives.create_index("is_active")
-            await self.db.alternatives.create_index("rating")
-            await self.db.alternatives.create_index([("name", "text"), ("brand", "text"), ("description", "text")])
-            
-            # Recipe indexes
-            await self.db.recipes.create_index("meat_type")
-            await self.db.recipes.create_index("difficulty")
-            await self.db.recipes.create_index("cuisine_type")
-            await self.db.recipes.create_index("is_active")
-            await self.db.recipes.create_index("is_featured")
-            await self.db.recipes.create_index("rating")
-            await self.db.recipes.create_index([("title", "text"), ("description", "text")])
-            
-            # Review indexes
-            await self.db.reviews.create_index("user_id")
-            await self.db.reviews.create_index("target_id")
-            await self.db.reviews.create_index("type")
-            await self.db.reviews.create_index("status")
-            await self.db.reviews.create_index("is_featured")
-            await self.db.reviews.create_index("created_at")
-            
-            # Analytics indexes
-            await self.db.analytics.create_index("user_id")
-            await self.db.analytics.create_index("event_type")
-            await self.db.analytics.create_index("timestamp")
-            await self.db.analytics.create_index("session_id")
-            
-            # Testimonial indexes
-            await self.db.testimonials.create_index("is_featured")
-            await self.db.testimonials.create_index("rating")
-            await self.db.testimonials.create_index("created_at")
-            
-            # Meat craving indexes
-            await self.db.meat_cravings.create_index("meat_type", unique=True)
-            
-            logger.info("Database indexes created successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to create database indexes: {str(e)}")
+            report = await reconcile_indexes(self.db)
+        except Exception:
+            if mode == "leader":
+                await release_leadership(self.db)
+            raise
+        if mode == "leader" and report["errors"]:
+            await release_leadership(self.db)
+        logger.info(
+            f"Index reconciliation took {report['ms']}ms: {report['created']} created, "
+            f"{report['errors']} collections failed"
+        )
+        return report
 
     async def get_collection(self, name: str):
         """Get a collection from the database."""
         if self.db is None:
             raise RuntimeError("Database not connected")
-        return self.db[name]
+        return self.id_codec.wrap(self.db[name])
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool settings and checkout metrics, for sizing the pool against request concurrency."""
+        return {
+            "options": dict(self.options),
+            **self.pool_metrics.stats(),
+        }
 
     async def health_check(self) -> Dict[str, Any]:
         """Check database health."""
@@ -113,7 +272,8 @@ class DatabaseService:
                 "database": self.db.name,
                 "collections": stats.get("collections", 0),
                 "data_size": stats.get("dataSize", 0),
-                "storage_size": stats.get("storageSize", 0)
+                "storage_size": stats.get("storageSize", 0),
+                "pool": self.pool_stats()
             }
             
         except Exception as e:
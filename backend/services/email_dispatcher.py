@@ -0,0 +1,170 @@
+"""Asynchronous email delivery over a pool of persistent SMTP connections.
+
+smtplib is blocking, so every SMTP exchange runs in a worker thread. Emails
+reach the dispatcher through the outbox relay (services/outbox.py), which
+also owns retries and backoff.
+
+To try it against a local stand-in server:
+    python -m aiosmtpd -n -l localhost:8025
+    EMAIL_BACKEND=smtp SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_STARTTLS=false
+"""
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+import asyncio
+import logging
+import os
+import smtplib
+import time
+
+from models.email import DeliveryOutcome, OutgoingEmail
+from services.email import email_service, EmailService
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """A bounded pool of authenticated SMTP connections reused across messages."""
+
+    def __init__(self, email: EmailService, size: int, max_idle: float):
+        self.email = email
+        self.size = size
+        self.max_idle = max_idle
+        self._idle: Deque[Tuple[smtplib.SMTP, float]] = deque()
+        self._open = 0
+        self._available = asyncio.Condition()
+
+    async def acquire(self) -> smtplib.SMTP:
+        """Take an idle connection, open a new one, or wait for one to be released."""
+        async with self._available:
+            while not self._idle and self._open >= self.size:
+                await self._available.wait()
+            if self._idle:
+                connection, last_used = self._idle.pop()
+            else:
+                connection, last_used = None, 0.0
+                self._open += 1
+
+        try:
+            if connection is not None and time.monotonic() - last_used > self.max_idle:
+                if not await asyncio.to_thread(self._is_alive, connection):
+                    await asyncio.to_thread(self._close, connection)
+                    connection = None
+            if connection is None:
+                connection = await asyncio.to_thread(self.email.open_connection)
+            return connection
+        except Exception:
+            await self._discard()
+            raise
+
+    async def release(self, connection: smtplib.SMTP, broken: bool = False):
+        """Return a connection to the pool, or close it if it is no longer usable."""
+        if broken:
+            await asyncio.to_thread(self._close, connection)
+            await self._discard()
+            return
+        async with self._available:
+            self._idle.append((connection, time.monotonic()))
+            self._available.notify()
+
+    async def close(self):
+        """Close all idle connections."""
+        async with self._available:
+            connections = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(connections)
+        for connection in connections:
+            await asyncio.to_thread(self._close, connection, True)
+
+    async def _discard(self):
+        async with self._available:
+            self._open -= 1
+            self._available.notify()
+
+    @staticmethod
+    def _is_alive(connection: smtplib.SMTP) -> bool:
+        try:
+            return connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(connection: smtplib.SMTP, graceful: bool = False):
+        try:
+            if graceful:
+                connection.quit()
+            else:
+                connection.close()
+        except Exception:
+            pass
+
+
+class EmailDispatcher:
+    """Send batches of emails over pooled SMTP connections.
+
+    Each `deliver` call holds one pooled connection and sends its messages
+    over that single checkout; callers spread a batch over `pool_size`
+    concurrent calls. Failed messages are reported, not retried: as
+    transient (worth retrying later) or permanent (5xx replies).
+    """
+
+    def __init__(self, email: EmailService = email_service, pool_size: Optional[int] = None):
+        self.email = email
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("SMTP_POOL_SIZE", "2"))
+        self.pool = SMTPConnectionPool(email, self.pool_size, float(os.getenv("SMTP_MAX_IDLE", "60")))
+
+    async def close(self):
+        """Close the pooled connections."""
+        await self.pool.close()
+
+    async def deliver(self, messages: List[OutgoingEmail]) -> List[DeliveryOutcome]:
+        """Send messages over one pooled connection and report the outcome per message."""
+        if self.email.is_console:
+            for message in messages:
+                self.email.log_email(message.to_email, message.subject, message.html_content, message.text_content)
+            return [DeliveryOutcome.SENT] * len(messages)
+
+        try:
+            connection = await self.pool.acquire()
+        except Exception as e:
+            logger.error(f"Failed to open SMTP connection: {str(e)}")
+            return [DeliveryOutcome.RETRY] * len(messages)
+
+        results, broken = await asyncio.to_thread(self._send_all, connection, messages)
+        await self.pool.release(connection, broken=broken)
+        return results
+
+    def _send_all(self, connection: smtplib.SMTP, messages: List[OutgoingEmail]) -> Tuple[List[DeliveryOutcome], bool]:
+        """Send messages on a worker thread; stop at the first connection-level error."""
+        results = [DeliveryOutcome.RETRY] * len(messages)
+        for index, message in enumerate(messages):
+            try:
+                connection.send_message(self.email.build_message(
+                    message.to_email, message.subject, message.html_content, message.text_content
+                ))
+                results[index] = DeliveryOutcome.SENT
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPHeloError) as e:
+                logger.error(f"SMTP connection lost while sending to {message.to_email}: {str(e)}")
+                return results, True
+            except smtplib.SMTPException as e:
+                # Checked before OSError, which SMTPException subclasses
+                logger.error(f"Failed to send email to {message.to_email}: {str(e)}")
+                if self._is_permanent(e):
+                    results[index] = DeliveryOutcome.REJECTED
+            except OSError as e:
+                logger.error(f"SMTP connection lost while sending to {message.to_email}: {str(e)}")
+                return results, True
+        return results, False
+
+    @staticmethod
+    def _is_permanent(error: smtplib.SMTPException) -> bool:
+        """Whether the server refused for good (5xx), rather than for now (4xx)."""
+        if isinstance(error, smtplib.SMTPRecipientsRefused):
+            codes = [code for code, _ in error.recipients.values()]
+            return bool(codes) and all(code >= 500 for code in codes)
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code >= 500
+        return False
+
+# Create global instance
+email_dispatcher = EmailDispatcher()
@@ -0,0 +1,299 @@
+from html import escape
+from typing import Dict, Any, Iterable, List, NamedTuple, Optional, Tuple, Union
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)(?:\s*\|\s*(\w+))?\s*\}\}")
+
+Slot = Tuple[str, Optional[str]]
+
+
+def _nl2br(value: str) -> str:
+    return value.replace("\n", "<br>")
+
+
+class CompiledTemplate:
+    """A template split once into static text and `{{ name }}` / `{{ name|filter }}` slots.
+
+    Rendering only converts and escapes the slot values and joins them with
+    the precomputed static fragments. Supported filters: `nl2br`.
+    """
+
+    def __init__(self, source: str, autoescape: bool = True):
+        self.autoescape = autoescape
+        self.parts: List[Union[str, Slot]] = []
+
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self._append(source[position:match.start()])
+            if match.group(2) and match.group(2) != "nl2br":
+                raise ValueError(f"Unknown template filter: {match.group(2)}")
+            self.parts.append((match.group(1), match.group(2)))
+            position = match.end()
+        self._append(source[position:])
+
+    @property
+    def slots(self) -> List[str]:
+        return [part[0] for part in self.parts if isinstance(part, tuple)]
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Fill the slots from `context`; missing names raise KeyError."""
+        return "".join(
+            part if isinstance(part, str) else self._format(context[part[0]], part[1])
+            for part in self.parts
+        )
+
+    def bind(self, context: Dict[str, Any]) -> "CompiledTemplate":
+        """Pre-render the slots that `context` provides and fold them into the static text."""
+        bound = CompiledTemplate.__new__(CompiledTemplate)
+        bound.autoescape = self.autoescape
+        bound.parts = []
+        for part in self.parts:
+            if isinstance(part, tuple) and part[0] in context:
+                bound._append(self._format(context[part[0]], part[1]))
+            else:
+                bound._append(part)
+        return bound
+
+    def _format(self, value: Any, filter_name: Optional[str]) -> str:
+        if value is None:
+            return ""
+        text = escape(str(value)) if self.autoescape else str(value)
+        if filter_name == "nl2br":
+            text = _nl2br(text)
+        return text
+
+    def _append(self, part: Union[str, Slot]):
+        if isinstance(part, str):
+            if not part:
+                return
+            if self.parts and isinstance(self.parts[-1], str):
+                self.parts[-1] += part
+                return
+        self.parts.append(part)
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+class EmailTemplate:
+    """Subject, HTML and plain-text templates for one kind of email."""
+
+    def __init__(self, subject: str, html: str, text: str):
+        self.subject = CompiledTemplate(subject, autoescape=False)
+        self.html = CompiledTemplate(html)
+        self.text = CompiledTemplate(text, autoescape=False)
+
+    def render(self, context: Dict[str, Any]) -> RenderedEmail:
+        return RenderedEmail(
+            self.subject.render(context),
+            self.html.render(context),
+            self.text.render(context)
+        )
+
+    def bind(self, context: Dict[str, Any]) -> "EmailTemplate":
+        bound = EmailTemplate.__new__(EmailTemplate)
+        bound.subject = self.subject.bind(context)
+        bound.html = self.html.bind(context)
+        bound.text = self.text.bind(context)
+        return bound
+
+
+# Shared layout: everything outside the content block is static and compiled
+# into the first and last fragment of every HTML template.
+LAYOUT_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background-color: #16a34a; color: white; padding: 30px; text-align: center; }
+        .content { padding: 30px; background-color: #f8f9fa; }
+        .button { background-color: #16a34a; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; display: inline-block; }
+        .footer { text-align: center; padding: 20px; font-size: 12px; color: #666; }
+    </style>
+</head>
+<body>
+    <div class="container">
+"""
+
+LAYOUT_TAIL = """    </div>
+</body>
+</html>
+"""
+
+
+def layout(header: str, content: str, footer: str) -> str:
+    """Wrap the header, content and footer blocks in the shared HTML layout."""
+    return (
+        LAYOUT_HEAD
+        + f'        <div class="header">\n{header}        </div>\n'
+        + f'        <div class="content">\n{content}        </div>\n'
+        + f'        <div class="footer">\n{footer}        </div>\n'
+        + LAYOUT_TAIL
+    )
+
+
+TEMPLATES: Dict[str, Dict[str, str]] = {
+    "verification": {
+        "subject": "Welcome to CraveKind - Verify Your Email",
+        "html": layout(
+            header="""            <h1>Welcome to CraveKind!</h1>
+            <p>Satisfy your cravings, stay kind.</p>
+""",
+            content="""            <h2>Hi {{ user_name }},</h2>
+            <p>Thank you for joining CraveKind! We're excited to help you discover amazing plant-based alternatives to your favorite foods.</p>
+            <p>To get started, please verify your email address by clicking the button below:</p>
+            <p style="text-align: center; margin: 30px 0;">
+                <a href="{{ verification_url }}" class="button">Verify Email Address</a>
+            </p>
+            <p>If the button doesn't work, copy and paste this link into your browser:</p>
+            <p><a href="{{ verification_url }}">{{ verification_url }}</a></p>
+            <p>Once verified, you'll be able to:</p>
+            <ul>
+                <li>Save your favorite alternatives</li>
+                <li>Track your plant-based journey</li>
+                <li>Get personalized recommendations</li>
+                <li>Join our community of kind eaters</li>
+            </ul>
+""",
+            footer="""            <p>Happy exploring!<br>The CraveKind Team</p>
+            <p>If you didn't create an account, please ignore this email.</p>
+"""
+        ),
+        "text": """Welcome to CraveKind!
+
+Hi {{ user_name }},
+
+Thank you for joining CraveKind! Please verify your email address by clicking this link:
+{{ verification_url }}
+
+Happy exploring!
+The CraveKind Team
+"""
+    },
+    "password_reset": {
+        "subject": "Reset Your CraveKind Password",
+        "html": layout(
+            header="""            <h1>Password Reset</h1>
+""",
+            content="""            <h2>Hi {{ user_name }},</h2>
+            <p>We received a request to reset your CraveKind password. Click the button below to create a new password:</p>
+            <p style="text-align: center; margin: 30px 0;">
+                <a href="{{ reset_url }}" class="button">Reset Password</a>
+            </p>
+            <p>If the button doesn't work, copy and paste this link into your browser:</p>
+            <p><a href="{{ reset_url }}">{{ reset_url }}</a></p>
+            <p>This link will expire in 1 hour for security reasons.</p>
+            <p>If you didn't request a password reset, please ignore this email.</p>
+""",
+            footer="""            <p>Stay kind!<br>The CraveKind Team</p>
+"""
+        ),
+        "text": """Password Reset Request
+
+Hi {{ user_name }},
+
+We received a request to reset your CraveKind password. Click this link to create a new password:
+{{ reset_url }}
+
+This link will expire in 1 hour for security reasons.
+
+If you didn't request a password reset, please ignore this email.
+
+Stay kind!
+The CraveKind Team
+"""
+    },
+    "contact_notification": {
+        "subject": "New Contact Form Submission from {{ first_name }} {{ last_name }}",
+        "html": layout(
+            header="""            <h1>New Contact Form Submission</h1>
+""",
+            content="""            <p><strong>Name:</strong> {{ first_name }} {{ last_name }}</p>
+            <p><strong>Email:</strong> {{ email }}</p>
+            <p><strong>Message:</strong><br>{{ message|nl2br }}</p>
+            <p><strong>Submitted:</strong> {{ submitted_at }} UTC</p>
+            <p><strong>Business Inquiry:</strong> {{ business_inquiry }}</p>
+""",
+            footer=""
+        ),
+        "text": """New Contact Form Submission
+
+Name: {{ first_name }} {{ last_name }}
+Email: {{ email }}
+Message: {{ message }}
+
+Submitted: {{ submitted_at }} UTC
+Business Inquiry: {{ business_inquiry }}
+"""
+    },
+    "contact_confirmation": {
+        "subject": "Thank you for contacting CraveKind!",
+        "html": layout(
+            header="""            <h1>Thanks for reaching out!</h1>
+""",
+            content="""            <h2>Hi {{ first_name }},</h2>
+            <p>Thank you for contacting CraveKind! We've received your message and will get back to you within 24 hours.</p>
+            <p>Your message:</p>
+            <p>{{ message|nl2br }}</p>
+            <p>We're excited to help you on your plant-based journey!</p>
+""",
+            footer="""            <p>Best regards,<br>The CraveKind Team</p>
+"""
+        ),
+        "text": """Hi {{ first_name }},
+
+Thank you for contacting CraveKind! We've received your message and will get back to you within 24 hours.
+
+Your message:
+{{ message }}
+
+We're excited to help you on your plant-based journey!
+
+Best regards,
+The CraveKind Team
+"""
+    },
+}
+
+
+class EmailTemplateRegistry:
+    """Compiled email templates, looked up by name."""
+
+    def __init__(self, templates: Dict[str, Dict[str, str]] = TEMPLATES):
+        self.templates: Dict[str, EmailTemplate] = {}
+        for name, template in templates.items():
+            self.register(name, template["subject"], template["html"], template["text"])
+
+    def register(self, name: str, subject: str, html: str, text: str):
+        """Compile and register a template."""
+        self.templates[name] = EmailTemplate(subject, html, text)
+
+    def render(self, name: str, **context: Any) -> RenderedEmail:
+        """Render one email."""
+        return self.templates[name].render(context)
+
+    def render_many(
+        self,
+        name: str,
+        contexts: Iterable[Dict[str, Any]],
+        shared: Optional[Dict[str, Any]] = None
+    ) -> List[RenderedEmail]:
+        """Render one template for many recipients.
+
+        Values in `shared` (e.g. a newsletter body) are escaped and folded into
+        the template once, so each recipient only pays for their own slots.
+        """
+        template = self.templates[name]
+        if shared:
+            template = template.bind(shared)
+        return [template.render(context) for context in contexts]
+
+# Create global instance
+email_templates = EmailTemplateRegistry()
@@ -0,0 +1,58 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List
+import csv
+import io
+import json
+
+from models.crm import Contact, ExportFormat
+
+CONTACT_EXPORT_FIELDS: List[str] = list(Contact.model_fields)
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+def _ndjson_chunk(documents: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(document, default=_json_default) + "\n" for document in documents)
+
+
+def _csv_chunk(documents: List[Dict[str, Any]], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CONTACT_EXPORT_FIELDS)
+    for document in documents:
+        writer.writerow([_csv_value(document.get(field)) for field in CONTACT_EXPORT_FIELDS])
+    return buffer.getvalue()
+
+
+async def stream_contacts(cursor, export_format: ExportFormat, batch_size: int) -> AsyncIterator[str]:
+    """Encode a contacts cursor batch by batch, so memory stays flat however many rows follow."""
+    if export_format == ExportFormat.CSV:
+        yield _csv_chunk([], header=True)
+
+    batch: List[Dict[str, Any]] = []
+    async for document in cursor.batch_size(batch_size):
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield _csv_chunk(batch) if export_format == ExportFormat.CSV else _ndjson_chunk(batch)
+            batch = []
+
+    if batch:
+        yield _csv_chunk(batch) if export_format == ExportFormat.CSV else _ndjson_chunk(batch)
@@ -0,0 +1,191 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+import re
+
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.search_index import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Facet dimension -> Alternative field; list fields give a document several values
+FACET_FIELDS: Dict[str, str] = {
+    "meat_type": "meat_type",
+    "type": "type",
+    "brand": "brand",
+    "certification": "certifications",
+    "allergen": "allergens",
+    "price_range": "price_range",
+}
+
+# price_range is free text ("$6-8 per package"); facet on its lower bound instead
+PRICE_BUCKETS: List[Tuple[float, str]] = [
+    (3, "under $3"),
+    (6, "$3-6"),
+    (10, "$6-10"),
+    (float("inf"), "$10+"),
+]
+PRICE_PATTERN = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def price_bucket(price_range: Optional[str]) -> Optional[str]:
+    """Bucket label for a free-text price range, by its first number."""
+    match = PRICE_PATTERN.search(price_range or "")
+    if match is None:
+        return None
+    price = float(match.group(1))
+    for upper, label in PRICE_BUCKETS:
+        if price < upper:
+            return label
+    return None
+
+
+def facet_key(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+class FacetIndex:
+    """Bitset posting lists for filtering alternatives and counting facets.
+
+    Every active alternative gets a bit position; every facet value keeps a
+    Python int with the bits of the documents that have it. Filters are
+    ORed within a dimension and ANDed across dimensions, excluded allergens
+    are an AND-NOT, and a facet count is a popcount of an AND. Counts for a
+    dimension ignore that dimension's own filter, so the client can show
+    what selecting another value of it would give.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache):
+        self.cache = cache
+        self._documents: List[Dict[str, Any]] = []
+        self._all = 0
+        self._postings: Dict[str, Dict[str, int]] = {dimension: {} for dimension in FACET_FIELDS}
+        self._labels: Dict[str, Dict[str, str]] = {dimension: {} for dimension in FACET_FIELDS}
+        self._rank: List[int] = []
+
+    async def build(self):
+        """Rebuild the bitsets from all active alternatives."""
+        self.load(await self.cache.find("alternatives", {"is_active": {"$ne": False}}))
+
+    def load(self, alternatives: List[Dict[str, Any]]):
+        """Replace the index contents with `alternatives`."""
+        size = (len(alternatives) + 7) // 8
+        bitmaps: Dict[str, Dict[str, bytearray]] = {dimension: {} for dimension in FACET_FIELDS}
+        labels: Dict[str, Dict[str, str]] = {dimension: {} for dimension in FACET_FIELDS}
+
+        # Set bits in byte buffers and convert each to an int once; ORing into
+        # growing ints one document at a time would be quadratic
+        for position, alternative in enumerate(alternatives):
+            for dimension, values in self._values(alternative).items():
+                for value in values:
+                    key = facet_key(value)
+                    bitmap = bitmaps[dimension].get(key)
+                    if bitmap is None:
+                        bitmap = bitmaps[dimension][key] = bytearray(size)
+                        labels[dimension][key] = str(value)
+                    bitmap[position >> 3] |= 1 << (position & 7)
+
+        postings = {
+            dimension: {key: int.from_bytes(bitmap, "little") for key, bitmap in values.items()}
+            for dimension, values in bitmaps.items()
+        }
+
+        self._documents = [
+            {field: alternative.get(field) for field in SUMMARY_FIELDS["alternatives"]}
+            for alternative in alternatives
+        ]
+        self._postings, self._labels = postings, labels
+        self._all = (1 << len(alternatives)) - 1
+        # Result order: best rated first, most reviewed breaking ties
+        self._rank = sorted(
+            range(len(alternatives)),
+            key=lambda position: (-(alternatives[position].get("rating") or 0), -(alternatives[position].get("review_count") or 0))
+        )
+        logger.info(f"Facet index built with {len(alternatives)} alternatives")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: rebuild after alternatives change."""
+        await self.build()
+
+    def query(
+        self,
+        filters: Dict[str, Iterable[str]],
+        exclude_allergens: Iterable[str] = (),
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Filter alternatives and count every facet value in one pass over the bitsets."""
+        unknown = set(filters) - set(FACET_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown facet: {', '.join(sorted(unknown))}")
+
+        excluded = 0
+        for allergen in exclude_allergens:
+            excluded |= self._postings["allergen"].get(facet_key(allergen), 0)
+        base = self._all & ~excluded
+
+        # One bitset per filtered dimension: the OR of its selected values
+        selected = {}
+        for dimension, values in filters.items():
+            values = list(values)
+            if values:
+                bits = 0
+                for value in values:
+                    bits |= self._postings[dimension].get(facet_key(value), 0)
+                selected[dimension] = bits
+
+        matches = base
+        for bits in selected.values():
+            matches &= bits
+
+        facets = {}
+        for dimension, postings in self._postings.items():
+            # Disjunctive counts: apply every filter except this dimension's own
+            scope = matches
+            if dimension in selected:
+                scope = base
+                for other, bits in selected.items():
+                    if other != dimension:
+                        scope &= bits
+            counts = {}
+            for key, bits in postings.items():
+                count = (scope & bits).bit_count()
+                if count:
+                    counts[self._labels[dimension][key]] = count
+            facets[dimension] = dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+        items = []
+        skipped = 0
+        if matches:
+            # Byte view of the result bitset for O(1) membership tests in rank order
+            member = matches.to_bytes((len(self._documents) + 7) // 8, "little")
+            for position in self._rank:
+                if not member[position >> 3] >> (position & 7) & 1:
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                items.append(self._documents[position])
+                if len(items) >= limit:
+                    break
+
+        return {"total": matches.bit_count(), "facets": facets, "items": items}
+
+    @staticmethod
+    def _values(alternative: Dict[str, Any]) -> Dict[str, List[Any]]:
+        values = {}
+        for dimension, field in FACET_FIELDS.items():
+            value = alternative.get(field)
+            if dimension == "price_range":
+                value = price_bucket(value)
+            if value is None or value == "":
+                values[dimension] = []
+            elif isinstance(value, list):
+                values[dimension] = value
+            else:
+                values[dimension] = [value]
+        return values
+
+# Create global instance
+facet_index = FacetIndex()
+catalog_events.subscribe("alternatives", facet_index.reload)
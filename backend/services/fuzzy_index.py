@@ -0,0 +1,194 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import heapq
+import logging
+
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.search_index import SUMMARY_FIELDS, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Trigrams always counted per query, however common
+MIN_TRIGRAMS = 3
+# Posting lists this short are always counted
+SMALL_POSTINGS = 1000
+
+# Short strings users misspell: alternative names and brands, recipe titles
+FUZZY_FIELDS: Dict[str, List[str]] = {
+    "alternatives": ["name", "brand"],
+    "recipes": ["title"],
+}
+
+
+def trigrams(word: str) -> List[str]:
+    """Character trigrams of a word padded so its start weighs more than its end."""
+    padded = f"  {word} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, or `limit + 1` once it is known to exceed `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def max_typos(word: str) -> int:
+    """Edits tolerated in a query word: none up to 3 characters, one up to 6, then two."""
+    return 0 if len(word) <= 3 else 1 if len(word) <= 6 else 2
+
+
+class FuzzyIndex:
+    """Typo-tolerant lookup of catalog names through a trigram index.
+
+    Each distinct normalized name is an entry. A query collects candidate
+    entries by counting shared trigrams (one posting-list pass, no
+    collection scan), then re-ranks the best candidates by edit distance
+    per query word. A query word may also match the start of a longer word,
+    so "tempe" finds "tempeh" while it is still being typed.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache, candidates: int = 50, common_fraction: float = 0.1):
+        self.cache = cache
+        self.candidates = candidates
+        self.common_fraction = common_fraction
+        self._entries: List[Tuple[str, ...]] = []
+        self._owners: List[List[Tuple[str, str]]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._summaries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    async def build(self):
+        """Rebuild the index from all active catalog documents."""
+        self.load({
+            collection_name: await self.cache.find(collection_name, {"is_active": {"$ne": False}})
+            for collection_name in FUZZY_FIELDS
+        })
+
+    def load(self, catalog: Dict[str, List[Dict[str, Any]]]):
+        """Replace the index contents with the given documents per collection."""
+        entry_ids: Dict[Tuple[str, ...], int] = {}
+        entries: List[Tuple[str, ...]] = []
+        owners: List[List[Tuple[str, str]]] = []
+        postings: Dict[str, List[int]] = defaultdict(list)
+        summaries = {}
+
+        for collection_name, fields in FUZZY_FIELDS.items():
+            for document in catalog.get(collection_name, []):
+                key = (collection_name, document["id"])
+                summaries[key] = {field: document.get(field) for field in SUMMARY_FIELDS[collection_name]}
+                for field in fields:
+                    words = tuple(tokenize(document.get(field)))
+                    if not words:
+                        continue
+                    entry_id = entry_ids.get(words)
+                    if entry_id is None:
+                        entry_id = entry_ids[words] = len(entries)
+                        entries.append(words)
+                        owners.append([])
+                        for trigram in {trigram for word in words for trigram in trigrams(word)}:
+                            postings[trigram].append(entry_id)
+                    if not owners[entry_id] or owners[entry_id][-1] != key:
+                        owners[entry_id].append(key)
+
+        self._entries, self._owners, self._postings, self._summaries = entries, owners, dict(postings), summaries
+        logger.info(f"Fuzzy index built with {len(entries)} names")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: rebuild after any change to an indexed collection."""
+        await self.build()
+
+    def search(self, query: str, collection_name: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Documents whose name (or brand) is within a few typos of `query`, closest first."""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # In a large catalog, trigrams found in a big share of the names say
+        # little about which name was meant; count the rarer ones only (and
+        # always at least the rarest few).
+        lists = sorted(
+            (self._postings[trigram] for trigram in {t for word in words for t in trigrams(word)} if trigram in self._postings),
+            key=len
+        )
+        common = max(self.common_fraction * len(self._entries), SMALL_POSTINGS)
+        selected = [postings for index, postings in enumerate(lists) if index < MIN_TRIGRAMS or len(postings) <= common]
+
+        shared: Counter = Counter()
+        for postings in selected:
+            shared.update(postings)
+
+        scored = []
+        distances: Dict[Tuple[str, str], float] = {}
+        for entry_id, _ in shared.most_common(self.candidates):
+            score = self._similarity(words, self._entries[entry_id], distances)
+            if score is not None:
+                scored.append((score, entry_id))
+
+        results = []
+        seen = set()
+        for score, entry_id in heapq.nlargest(len(scored), scored):
+            for key in self._owners[entry_id]:
+                if key in seen or (collection_name is not None and key[0] != collection_name):
+                    continue
+                seen.add(key)
+                results.append({
+                    "collection": key[0],
+                    "id": key[1],
+                    "score": round(score, 4),
+                    "document": self._summaries[key],
+                })
+                if len(results) >= limit:
+                    return results
+        return results
+
+    @staticmethod
+    def _similarity(
+        words: List[str],
+        entry: Tuple[str, ...],
+        distances: Dict[Tuple[str, str], float]
+    ) -> Optional[float]:
+        """Mean per-word similarity, or None when fewer than half of the query words match.
+
+        `distances` memoizes word distances across the candidates of one query.
+        """
+        total = 0.0
+        matched = 0
+        for word in words:
+            limit = max_typos(word)
+            best = float(limit + 1)
+            for candidate in entry:
+                distance = distances.get((word, candidate))
+                if distance is None:
+                    distance = float(edit_distance(word, candidate, limit))
+                    if len(candidate) > len(word):
+                        # The start of a longer word, as if still being typed, costs half an edit
+                        distance = min(distance, edit_distance(word, candidate[:len(word)], limit) + 0.5)
+                    distances[(word, candidate)] = distance
+                best = min(best, distance)
+                if best == 0:
+                    break
+            if best <= limit:
+                matched += 1
+                total += 1 - best / (len(word) + 1)
+        if matched * 2 < len(words):
+            return None
+        return total / len(words)
+
+# Create global instance
+fuzzy_index = FuzzyIndex()
+
+for _collection_name in FUZZY_FIELDS:
+    catalog_events.subscribe(_collection_name, fuzzy_index.reload)
@@ -0,0 +1,321 @@
+from typing import Any, Dict, List, Optional
+import logging
+import os
+import re
+import time
+
+from bson.binary import Binary, UUID_SUBTYPE
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+ID_STORAGE_MODES = ("string", "dual", "binary")
+
+# Fields (at any depth, or the last part of a dotted path) that hold document ids
+ID_FIELDS = {
+    "id", "user_id", "target_id", "contact_id", "alternative_id",
+    "source_id", "admin_id", "lease_id", "favorites",
+}
+
+# Canonical UUID strings, the only ones stored as binary (they decode back unchanged)
+UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+# Collections the migration leaves alone
+SKIPPED_COLLECTIONS = {"locks"}
+
+# Comparisons that cannot span both id forms: BSON compares strings and binaries by type first
+RANGE_OPERATORS = {"$lt", "$lte", "$gt", "$gte"}
+
+
+def is_id_field(field: str) -> bool:
+    return field.rsplit(".", 1)[-1] in ID_FIELDS
+
+
+def binary_id(value: str) -> Optional[Binary]:
+    """16-byte BSON UUID for a canonical (lowercase, hyphenated) UUID string, else None."""
+    if len(value) != 36 or not UUID_PATTERN.fullmatch(value):
+        return None
+    return Binary(bytes.fromhex(value.replace("-", "")), UUID_SUBTYPE)
+
+
+def decode_ids(value: Any) -> Any:
+    """Replace every binary UUID in a document (or list of them) with its string form."""
+    if isinstance(value, dict):
+        return {key: decode_ids(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_ids(item) for item in value]
+    if isinstance(value, Binary) and value.subtype == UUID_SUBTYPE:
+        return str(value.as_uuid())
+    return value
+
+
+class IdCodec:
+    """Stores document ids as 16-byte binary UUIDs while the application keeps string ids.
+
+    The mode comes from ID_STORAGE:
+
+    - "string" (the default) stores ids as given and adds no overhead.
+    - "dual" writes binary ids and matches both forms when reading. Use it
+      while `manage.py migrate-ids` converts existing documents.
+    - "binary" writes and matches binary ids only, once the migration is done.
+
+    Outside "string" mode, `wrap` puts a collection behind
+    `IdCodecCollection`. That encodes the UUID strings of `ID_FIELDS` in
+    filters, documents, updates and pipelines, and turns every binary UUID
+    read back into a string. Strings that are not canonical UUIDs are
+    stored as they are. Binary UUIDs sort in the same order as their
+    strings. In "dual" mode, converted and unconverted ids sort as two
+    separate groups, so range operators (`$lt`, `$gte`, ...) on id fields
+    raise ValueError instead of silently matching one group. `$ne`/`$nin`
+    exclude both forms, `$all` accepts either form of each id and
+    `$pull`/`$pullAll` remove both; `$addToSet` and `$push` add the binary
+    form, so an id already stored as a string can end up in an array twice
+    until `migrate-ids` has converted that document.
+    """
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode or os.getenv("ID_STORAGE", "string")
+        if self.mode not in ID_STORAGE_MODES:
+            raise ValueError(f"Invalid ID_STORAGE: {self.mode}")
+
+    def wrap(self, collection: AsyncIOMotorCollection):
+        if self.mode == "string":
+            return collection
+        return IdCodecCollection(collection, self)
+
+    def encode(self, value: Any, field: Optional[str] = None) -> Any:
+        """Encode the id values of a document, update or pipeline for storage."""
+        if isinstance(value, dict):
+            return {key: self.encode(item, field if key.startswith("$") else key) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.encode(item, field) for item in value]
+        if isinstance(value, str) and field is not None and is_id_field(field):
+            return binary_id(value) or value
+        return value
+
+    def encode_query(self, value: Any, field: Optional[str] = None) -> Any:
+        """Encode a filter; in "dual" mode an id matches its string and its binary form."""
+        if self.mode != "dual":
+            return self.encode(value, field)
+        if isinstance(value, dict):
+            encoded = {}
+            for key, item in value.items():
+                if key in ("$in", "$nin") and isinstance(item, list):
+                    encoded[key] = encoded.get(key, []) + [form for element in item for form in self._forms(element, field)]
+                elif key in ("$eq", "$ne") and isinstance(item, str) and field is not None and is_id_field(field):
+                    forms = self._forms(item, field)
+                    operator = "$in" if key == "$eq" else "$nin"
+                    encoded[operator] = encoded.get(operator, []) + forms
+                elif key == "$all" and isinstance(item, list) and field is not None and is_id_field(field):
+                    # Each id must be present in either form
+                    encoded[key] = [{"$elemMatch": {"$in": self._forms(element, field)}} for element in item]
+                elif key in RANGE_OPERATORS and field is not None and is_id_field(field):
+                    raise ValueError(f"Cannot compare {field} with {key} while ids are stored in both forms")
+                elif not key.startswith("$") and isinstance(item, str) and is_id_field(key):
+                    forms = self._forms(item, key)
+                    encoded[key] = {"$in": forms} if len(forms) > 1 else item
+                else:
+                    encoded[key] = self.encode_query(item, field if key.startswith("$") else key)
+            return encoded
+        if isinstance(value, list):
+            return [self.encode_query(item, field) for item in value]
+        return self.encode(value, field)
+
+    def encode_update(self, update: Any) -> Any:
+        """Encode an update; in "dual" mode `$pull` and `$pullAll` remove an id in either form."""
+        if self.mode != "dual" or not isinstance(update, dict) or not any(key.startswith("$") for key in update):
+            return self.encode(update)
+        encoded = {}
+        for operator, fields in update.items():
+            if operator == "$pull" and isinstance(fields, dict):
+                encoded[operator] = {
+                    field: {"$in": self._forms(value, field)} if isinstance(value, str) else self.encode_query(value, field)
+                    for field, value in fields.items()
+                }
+            elif operator == "$pullAll" and isinstance(fields, dict):
+                encoded[operator] = {
+                    field: [form for element in values for form in self._forms(element, field)]
+                    for field, values in fields.items()
+                }
+            else:
+                encoded[operator] = self.encode(fields)
+        return encoded
+
+    def _forms(self, value: Any, field: Optional[str]) -> List[Any]:
+        encoded = self.encode(value, field)
+        return [encoded, value] if encoded is not value else [value]
+
+
+class IdCodecCursor:
+    """A cursor whose documents come back with string ids; chained modifiers return the wrapper."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, *args, **kwargs):
+        self._cursor = self._cursor.skip(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs):
+        self._cursor = self._cursor.limit(*args, **kwargs)
+        return self
+
+    def batch_size(self, *args, **kwargs):
+        self._cursor = self._cursor.batch_size(*args, **kwargs)
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return decode_ids(await self._cursor.to_list(length=length))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        return decode_ids(await self._cursor.__anext__())
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+
+class IdCodecCollection:
+    """The collection methods the application uses, with ids encoded on the way in and decoded on the way out."""
+
+    def __init__(self, collection: AsyncIOMotorCollection, codec: IdCodec):
+        self._collection = collection
+        self.codec = codec
+
+    def find(self, filter: Optional[Dict[str, Any]] = None, *args, **kwargs) -> IdCodecCursor:
+        return IdCodecCursor(self._collection.find(self.codec.encode_query(filter or {}), *args, **kwargs))
+
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        return decode_ids(await self._collection.find_one(self.codec.encode_query(filter or {}), *args, **kwargs))
+
+    async def find_one_and_update(self, filter: Dict[str, Any], update: Any, *args, **kwargs):
+        return decode_ids(await self._collection.find_one_and_update(
+            self.codec.encode_query(filter), self.codec.encode_update(update), *args, **kwargs
+        ))
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], *args, **kwargs) -> IdCodecCursor:
+        return IdCodecCursor(self._collection.aggregate(self.codec.encode_query(pipeline), *args, **kwargs))
+
+    async def count_documents(self, filter: Dict[str, Any], *args, **kwargs) -> int:
+        return await self._collection.count_documents(self.codec.encode_query(filter), *args, **kwargs)
+
+    async def distinct(self, key: str, filter: Optional[Dict[str, Any]] = None, *args, **kwargs):
+        return decode_ids(await self._collection.distinct(key, self.codec.encode_query(filter or {}), *args, **kwargs))
+
+    async def insert_one(self, document: Dict[str, Any], *args, **kwargs):
+        return await self._collection.insert_one(self.codec.encode(document), *args, **kwargs)
+
+    async def insert_many(self, documents: List[Dict[str, Any]], *args, **kwargs):
+        return await self._collection.insert_many([self.codec.encode(document) for document in documents], *args, **kwargs)
+
+    async def replace_one(self, filter: Dict[str, Any], replacement: Dict[str, Any], *args, **kwargs):
+        return await self._collection.replace_one(
+            self.codec.encode_query(filter), self.codec.encode(replacement), *args, **kwargs
+        )
+
+    async def update_one(self, filter: Dict[str, Any], update: Any, *args, **kwargs):
+        return await self._collection.update_one(self.codec.encode_query(filter), self.codec.encode_update(update), *args, **kwargs)
+
+    async def update_many(self, filter: Dict[str, Any], update: Any, *args, **kwargs):
+        return await self._collection.update_many(self.codec.encode_query(filter), self.codec.encode_update(update), *args, **kwargs)
+
+    async def delete_one(self, filter: Dict[str, Any], *args, **kwargs):
+        return await self._collection.delete_one(self.codec.encode_query(filter), *args, **kwargs)
+
+    async def delete_many(self, filter: Dict[str, Any], *args, **kwargs):
+        return await self._collection.delete_many(self.codec.encode_query(filter), *args, **kwargs)
+
+    async def bulk_write(self, requests: List[Any], *args, **kwargs):
+        return await self._collection.bulk_write([self._encode_request(request) for request in requests], *args, **kwargs)
+
+    def _encode_request(self, request: Any) -> Any:
+        """A new bulk operation with the request's ids encoded; the request itself is left as it is.
+
+        PyMongo has no public accessors for an operation's contents, so
+        they are read from its attributes and passed back through the
+        operation's constructor.
+        """
+        encode_query, encode_update = self.codec.encode_query, self.codec.encode_update
+        if isinstance(request, InsertOne):
+            return InsertOne(self.codec.encode(request._doc))
+        if isinstance(request, (UpdateOne, UpdateMany)):
+            return type(request)(
+                encode_query(request._filter), encode_update(request._doc), upsert=request._upsert,
+                collation=request._collation, array_filters=request._array_filters, hint=request._hint
+            )
+        if isinstance(request, ReplaceOne):
+            return ReplaceOne(
+                encode_query(request._filter), self.codec.encode(request._doc), upsert=request._upsert,
+                collation=request._collation, hint=request._hint
+            )
+        if isinstance(request, (DeleteOne, DeleteMany)):
+            return type(request)(encode_query(request._filter), collation=request._collation, hint=request._hint)
+        raise TypeError(f"Unsupported bulk write operation: {request!r}")
+
+    def __getattr__(self, name: str):
+        return getattr(self._collection, name)
+
+
+async def migrate_ids(
+    db: AsyncIOMotorDatabase,
+    to: str = "binary",
+    batch_size: int = 1000,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Rewrite stored ids in every collection to binary UUIDs (or back to strings with `to="string"`).
+
+    Safe to run while the application serves with ID_STORAGE=dual, and to
+    re-run: documents already in the target form are not written.
+    """
+    if to not in ("binary", "string"):
+        raise ValueError(f"Cannot migrate ids to {to}")
+    start = time.perf_counter()
+    codec = IdCodec("binary")
+    results = []
+    for collection_name in sorted(await db.list_collection_names()):
+        if collection_name.startswith("system.") or collection_name in SKIPPED_COLLECTIONS:
+            continue
+        collection_start = time.perf_counter()
+        collection = db[collection_name]
+        scanned = updated = 0
+        operations = []
+        async for document in collection.find({}):
+            scanned += 1
+            changes = {}
+            for key, value in document.items():
+                if key == "_id":
+                    continue
+                converted = codec.encode(value, key) if to == "binary" else decode_ids(value)
+                if converted != value:
+                    changes[key] = converted
+            if changes:
+                updated += 1
+                operations.append(UpdateOne({"_id": document["_id"]}, {"$set": changes}))
+            if len(operations) >= batch_size:
+                if not dry_run:
+                    await collection.bulk_write(operations, ordered=False)
+                operations = []
+        if operations and not dry_run:
+            await collection.bulk_write(operations, ordered=False)
+        results.append({
+            "collection": collection_name,
+            "scanned": scanned,
+            "updated": updated,
+            "ms": round((time.perf_counter() - collection_start) * 1000, 1),
+        })
+        logger.info(f"Id migration of {collection_name}: {updated} of {scanned} documents to {to}")
+
+    return {
+        "to": to,
+        "dry_run": dry_run,
+        "collections": results,
+        "updated": sum(result["updated"] for result in results),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
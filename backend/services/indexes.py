@@ -0,0 +1,201 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Every index the application relies on, per collection. Names are PyMongo's
+# defaults, so indexes created before this manifest existed are recognized.
+INDEX_MANIFEST: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel("email", unique=True),
+        IndexModel("verification_token"),
+        IndexModel("reset_token"),
+        IndexModel("created_at"),
+        IndexModel("updated_at"),
+    ],
+    "contacts": [
+        IndexModel("id", unique=True),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "alternatives": [
+        IndexModel("meat_type"),
+        IndexModel("brand"),
+        IndexModel("type"),
+        IndexModel("is_active"),
+        IndexModel("rating"),
+        IndexModel([("name", TEXT), ("brand", TEXT), ("description", TEXT)]),
+        IndexModel([("updated_at", ASCENDING), ("id", ASCENDING)]),
+    ],
+    "recipes": [
+        IndexModel("meat_type"),
+        IndexModel("difficulty"),
+        IndexModel("cuisine_type"),
+        IndexModel("is_active"),
+        IndexModel("is_featured"),
+        IndexModel("rating"),
+        IndexModel([("title", TEXT), ("description", TEXT)]),
+        IndexModel([("updated_at", ASCENDING), ("id", ASCENDING)]),
+    ],
+    "reviews": [
+        IndexModel("user_id"),
+        IndexModel("target_id"),
+        IndexModel("type"),
+        IndexModel("status"),
+        IndexModel("is_featured"),
+        IndexModel("created_at"),
+    ],
+    "analytics": [
+        IndexModel("user_id"),
+        IndexModel("event_type"),
+        IndexModel("timestamp"),
+        IndexModel("session_id"),
+        IndexModel([("event_type", ASCENDING), ("timestamp", ASCENDING)]),
+    ],
+    "analytics_daily": [
+        IndexModel("day"),
+    ],
+    "testimonials": [
+        IndexModel("is_featured"),
+        IndexModel("rating"),
+        IndexModel("created_at"),
+    ],
+    "email_outbox": [
+        IndexModel("id", unique=True),
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+        IndexModel("lease_id"),
+    ],
+    "meat_cravings": [
+        IndexModel("meat_type", unique=True),
+        IndexModel([("updated_at", ASCENDING), ("id", ASCENDING)]),
+    ],
+    "recommendation_runs": [
+        IndexModel("started_at"),
+    ],
+}
+
+# Options that change what an index enforces; an existing index that differs in these is reported
+SIGNIFICANT_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+LOCK_COLLECTION = "locks"
+RECONCILE_LOCK = "index_reconciliation"
+
+
+def index_name(model: IndexModel) -> str:
+    return model.document["name"]
+
+
+async def reconcile_collection(
+    db: AsyncIOMotorDatabase,
+    collection_name: str,
+    models: List[IndexModel],
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Diff one collection's manifest against `list_indexes()` and create what is missing in one call."""
+    start = time.perf_counter()
+    collection = db[collection_name]
+    existing = {index["name"]: index async for index in collection.list_indexes()}
+
+    missing, conflicts = [], []
+    for model in models:
+        index = existing.get(index_name(model))
+        if index is None:
+            missing.append(model)
+            continue
+        wanted = {option: model.document.get(option) for option in SIGNIFICANT_OPTIONS}
+        actual = {option: index.get(option) for option in SIGNIFICANT_OPTIONS}
+        if wanted != actual:
+            conflicts.append(index_name(model))
+
+    result: Dict[str, Any] = {
+        "collection": collection_name,
+        "existing": len(models) - len(missing),
+        "missing": [index_name(model) for model in missing],
+        "conflicts": conflicts,
+        "created": [],
+        "error": None,
+    }
+    if missing and not dry_run:
+        try:
+            result["created"] = await collection.create_indexes(missing)
+        except Exception as e:
+            result["error"] = str(e)
+    result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def reconcile_indexes(
+    db: AsyncIOMotorDatabase,
+    manifest: Dict[str, List[IndexModel]] = INDEX_MANIFEST,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Bring every collection's indexes in line with `manifest`, collections in parallel.
+
+    Existing indexes not in the manifest are left alone, and so are
+    conflicting ones (same name, different options): those need a
+    deliberate drop. Returns a per-collection report.
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        reconcile_collection(db, collection_name, models, dry_run)
+        for collection_name, models in manifest.items()
+    ))
+    report = {
+        "dry_run": dry_run,
+        "collections": list(results),
+        "created": sum(len(result["created"]) for result in results),
+        "missing": sum(len(result["missing"]) for result in results),
+        "errors": sum(result["error"] is not None for result in results),
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    for result in results:
+        if result["error"]:
+            logger.error(f"Failed to create indexes on {result['collection']}: {result['error']}")
+        if result["conflicts"]:
+            logger.warning(f"Indexes on {result['collection']} differ from the manifest: {', '.join(result['conflicts'])}")
+    return report
+
+
+def lease_holder() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def acquire_leadership(db: AsyncIOMotorDatabase, ttl: float = 300) -> bool:
+    """Take the reconciliation lease if no other worker holds a live one.
+
+    A successful reconciliation keeps the lease until it expires, so the
+    other workers of the same deploy skip it; workers started after `ttl`
+    reconcile again (a cheap diff once indexes exist).
+    """
+    now = datetime.utcnow()
+    locks = db[LOCK_COLLECTION]
+    try:
+        await locks.find_one_and_update(
+            {"_id": RECONCILE_LOCK, "expires_at": {"$lt": now}},
+            {"$set": {
+                "holder": lease_holder(),
+                "acquired_at": now,
+                "expires_at": now + timedelta(seconds=ttl),
+            }},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # The lease document exists and has not expired
+        return False
+    return True
+
+
+async def release_leadership(db: AsyncIOMotorDatabase):
+    """Give up a lease this worker holds (after a failed reconciliation), so another worker can retry."""
+    await db[LOCK_COLLECTION].update_one(
+        {"_id": RECONCILE_LOCK, "holder": lease_holder()},
+        {"$set": {"expires_at": datetime.utcnow()}}
+    )
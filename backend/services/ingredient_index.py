@@ -0,0 +1,123 @@
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+import numpy as np
+
+from models.recipes import PANTRY_STAPLES, normalize_ingredient, normalize_ingredients
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.search_index import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class IngredientIndex:
+    """Inverted index from canonical ingredient to the recipes that use it.
+
+    Each ingredient keeps a sorted array of recipe positions. A query
+    concatenates the postings of the ingredients the user has and counts
+    them per recipe (one `bincount`), which gives every recipe's number of
+    covered ingredients at once; coverage is that count over the recipe's
+    ingredient count, and "can make it" is coverage 1.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache):
+        self.cache = cache
+        self._postings: Dict[str, np.ndarray] = {}
+        self._ingredients: List[List[str]] = []
+        self._sizes = np.zeros(0, dtype=np.int32)
+        self._documents: List[Dict[str, Any]] = []
+        self._rank = np.zeros(0)
+
+    async def build(self):
+        """Rebuild the index from all active recipes."""
+        self.load(await self.cache.find("recipes", {"is_active": {"$ne": False}}))
+
+    def load(self, recipes: List[Dict[str, Any]]):
+        """Replace the index contents with `recipes`."""
+        postings: Dict[str, List[int]] = {}
+        ingredients = []
+        for position, recipe in enumerate(recipes):
+            names = normalize_ingredients(recipe.get("ingredients"))
+            ingredients.append(names)
+            for name in names:
+                postings.setdefault(name, []).append(position)
+
+        self._postings = {name: np.array(positions, dtype=np.int32) for name, positions in postings.items()}
+        self._ingredients = ingredients
+        self._sizes = np.array([len(names) for names in ingredients], dtype=np.int32)
+        self._documents = [
+            {field: recipe.get(field) for field in SUMMARY_FIELDS["recipes"]}
+            for recipe in recipes
+        ]
+        # Tie-break for equal coverage: best rated, then most reviewed
+        self._rank = np.array(
+            [(recipe.get("rating") or 0) * 1e6 + min(recipe.get("review_count") or 0, 999_999) for recipe in recipes],
+            dtype=np.float64
+        )
+        logger.info(f"Ingredient index built with {len(recipes)} recipes and {len(postings)} ingredients")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: rebuild after recipes change."""
+        await self.build()
+
+    def query(
+        self,
+        have: Iterable[str],
+        max_missing: Optional[int] = None,
+        min_coverage: float = 0.0,
+        assume_staples: bool = True,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Recipes ranked by the share of their ingredients in `have`.
+
+        `max_missing=0` keeps only recipes that can be made from `have`
+        alone (set containment). With `assume_staples`, salt, pepper, oil
+        and water count as available.
+        """
+        names = {name for text in have for name in normalize_ingredient(text)}
+        available = names | PANTRY_STAPLES if assume_staples else names
+
+        lists = [self._postings[name] for name in available if name in self._postings]
+        counts = np.bincount(
+            np.concatenate(lists) if lists else np.zeros(0, dtype=np.int32),
+            minlength=len(self._documents)
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coverage = np.where(self._sizes > 0, counts / self._sizes, 0.0)
+
+        # A recipe must use at least one thing the user named, not only staples
+        named = [self._postings[name] for name in names if name in self._postings]
+        mask = np.zeros(len(self._documents), dtype=bool)
+        if named:
+            mask[np.concatenate(named)] = True
+        mask &= coverage >= min_coverage
+        if max_missing is not None:
+            mask &= self._sizes - counts <= max_missing
+        rows = np.flatnonzero(mask)
+        total = int(rows.size)
+
+        # Only the requested page needs ordering: keep the rows at or above the
+        # page's lowest coverage (ties included), then sort those
+        wanted = offset + limit
+        if wanted < rows.size:
+            cutoff = np.partition(coverage[rows], rows.size - wanted)[rows.size - wanted]
+            rows = rows[coverage[rows] >= cutoff]
+
+        # Highest coverage, then fewest missing, then rating
+        missing = (self._sizes - counts)[rows]
+        order = np.lexsort((-self._rank[rows], missing, -coverage[rows]))
+        items = []
+        for row in rows[order][offset:offset + limit]:
+            item = dict(self._documents[row])
+            item["coverage"] = round(float(coverage[row]), 4)
+            item["matched"] = [name for name in self._ingredients[row] if name in available]
+            item["missing"] = [name for name in self._ingredients[row] if name not in available]
+            items.append(item)
+
+        return {"ingredients": sorted(names), "total": total, "items": items}
+
+# Create global instance
+ingredient_index = IngredientIndex()
+catalog_events.subscribe("recipes", ingredient_index.reload)
@@ -0,0 +1,189 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import logging
+import operator
+import re
+
+import numpy as np
+from pymongo import UpdateOne
+
+from models.alternatives import NUTRIENT_UNITS, normalize_nutrition, parse_quantity
+from services.database import db_service, DatabaseService
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.search_index import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+NUTRIENTS: List[str] = list(NUTRIENT_UNITS)
+
+COMPARISONS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+}
+
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(>=|<=|>|<|=)\s*(.+?)\s*$")
+SORT_PATTERN = re.compile(r"^\s*(\w+)\s*(?:/\s*(\w+))?\s*$")
+
+
+class Condition(NamedTuple):
+    nutrient: str
+    comparison: str
+    value: float
+
+
+def parse_condition(text: str) -> Condition:
+    """Parse "protein>=15g" (units optional, converted to the nutrient's canonical unit)."""
+    match = CONDITION_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid nutrition condition: {text!r}")
+    nutrient, comparison, amount = match.groups()
+    nutrient = nutrient.lower()
+    if nutrient not in NUTRIENT_UNITS:
+        raise ValueError(f"Unknown nutrient: {nutrient}")
+    value = parse_quantity(amount, NUTRIENT_UNITS[nutrient])
+    if value is None:
+        raise ValueError(f"Invalid amount for {nutrient}: {amount!r}")
+    return Condition(nutrient, comparison, value)
+
+
+def parse_sort(text: str) -> Tuple[str, Optional[str]]:
+    """Parse "protein" or a ratio like "protein/calories"."""
+    match = SORT_PATTERN.match(text)
+    if match is None:
+        raise ValueError(f"Invalid nutrition sort: {text!r}")
+    numerator, denominator = (part.lower() if part else None for part in match.groups())
+    for nutrient in (numerator, denominator):
+        if nutrient is not None and nutrient not in NUTRIENT_UNITS:
+            raise ValueError(f"Unknown nutrient: {nutrient}")
+    return numerator, denominator
+
+
+class NutritionStore:
+    """Nutrients of all active alternatives as one float matrix (documents x nutrients).
+
+    Values are in the canonical units of `NUTRIENT_UNITS`; missing values are
+    NaN, which fails every comparison and sorts last. Filters and sort keys
+    are evaluated as NumPy vector operations over whole columns.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache, database: DatabaseService = db_service):
+        self.cache = cache
+        self.db = database
+        self.matrix = np.empty((0, len(NUTRIENTS)))
+        self._documents: List[Dict[str, Any]] = []
+
+    async def build(self):
+        """Rebuild the matrix from all active alternatives."""
+        self.load(await self.cache.find("alternatives", {"is_active": {"$ne": False}}))
+
+    def load(self, alternatives: List[Dict[str, Any]]):
+        """Replace the store contents with `alternatives`."""
+        matrix = np.full((len(alternatives), len(NUTRIENTS)), np.nan)
+        for row, alternative in enumerate(alternatives):
+            # Documents written before nutrition_values existed are normalized here
+            values = alternative.get("nutrition_values") or normalize_nutrition(alternative.get("nutrition"))
+            for column, nutrient in enumerate(NUTRIENTS):
+                if nutrient in values:
+                    matrix[row, column] = values[nutrient]
+
+        self._documents = [
+            {field: alternative.get(field) for field in SUMMARY_FIELDS["alternatives"]}
+            for alternative in alternatives
+        ]
+        self.matrix = matrix
+        logger.info(f"Nutrition store built with {len(alternatives)} alternatives")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: rebuild after alternatives change."""
+        await self.build()
+
+    async def backfill(self, batch_size: int = 500) -> int:
+        """Store `nutrition_values` on alternatives whose stored values are missing or stale.
+
+        Changed documents get a new `updated_at`, so the catalog delta feed
+        ships them. This runs from `manage.py normalize-nutrition`, outside
+        the server: a running server picks the values up on its next
+        catalog reload (the admin `/cache/invalidate` route or a restart).
+        Returns the number of documents updated.
+        """
+        collection = await self.db.get_collection("alternatives")
+        cursor = collection.find({}, {"_id": 0, "id": 1, "nutrition": 1, "nutrition_values": 1})
+        updated = 0
+        operations = []
+        async for alternative in cursor:
+            values = normalize_nutrition(alternative.get("nutrition"))
+            if alternative.get("nutrition_values") != values:
+                operations.append(UpdateOne(
+                    {"id": alternative["id"]},
+                    {"$set": {"nutrition_values": values, "updated_at": datetime.utcnow()}}
+                ))
+            if len(operations) >= batch_size:
+                updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+                operations = []
+        if operations:
+            updated += (await collection.bulk_write(operations, ordered=False)).modified_count
+        return updated
+
+    def query(
+        self,
+        conditions: List[Condition],
+        sort: Optional[Tuple[str, Optional[str]]] = None,
+        descending: bool = True,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Alternatives meeting every condition, ordered by a nutrient or a nutrient ratio."""
+        mask = np.ones(len(self._documents), dtype=bool)
+        with np.errstate(invalid="ignore"):
+            for condition in conditions:
+                column = self.matrix[:, NUTRIENTS.index(condition.nutrient)]
+                mask &= COMPARISONS[condition.comparison](column, condition.value)
+        rows = np.flatnonzero(mask)
+        total = int(rows.size)
+
+        keys = None
+        if sort is not None:
+            keys = self._sort_keys(*sort)[rows]
+            # NaN (missing or divided by zero) always goes last
+            sortable = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+            wanted = offset + limit
+            if wanted < rows.size:
+                # Only the requested page needs ordering: partition, then sort the head
+                order = np.argpartition(sortable, wanted - 1)[:wanted]
+                order = order[np.argsort(sortable[order], kind="stable")]
+            else:
+                order = np.argsort(sortable, kind="stable")
+            rows, keys = rows[order], keys[order]
+
+        page = slice(offset, offset + limit)
+        items = []
+        for index, row in enumerate(rows[page]):
+            item = dict(self._documents[row])
+            item["nutrition_values"] = {
+                nutrient: float(value)
+                for nutrient, value in zip(NUTRIENTS, self.matrix[row])
+                if not np.isnan(value)
+            }
+            if keys is not None:
+                key = keys[page][index]
+                item["sort_value"] = None if np.isnan(key) else round(float(key), 6)
+            items.append(item)
+
+        return {"total": total, "items": items}
+
+    def _sort_keys(self, numerator: str, denominator: Optional[str]) -> np.ndarray:
+        keys = self.matrix[:, NUTRIENTS.index(numerator)]
+        if denominator is None:
+            return keys
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = keys / self.matrix[:, NUTRIENTS.index(denominator)]
+        ratios[~np.isfinite(ratios)] = np.nan
+        return ratios
+
+# Create global instance
+nutrition_store = NutritionStore()
+catalog_events.subscribe("alternatives", nutrition_store.reload)
@@ -0,0 +1,217 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+import os
+import uuid
+
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from models.email import DeliveryOutcome, OutboxRecord, OutboxStatus
+from services.database import db_service, DatabaseService
+from services.email_dispatcher import email_dispatcher, EmailDispatcher
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_COLLECTION = "email_outbox"
+
+# Server error code for "Transaction numbers are only allowed on a replica set member or mongos"
+ILLEGAL_OPERATION = 20
+
+
+class EmailOutbox:
+    """Record emails in Mongo in the same write as the document that caused them."""
+
+    def __init__(self, database: DatabaseService = db_service):
+        self.db = database
+        self.supports_transactions: Optional[bool] = None
+
+    async def insert_with_emails(self, collection_name: str, document: Dict[str, Any], emails: List[OutboxRecord]):
+        """Insert `document` and its outbox records atomically where the deployment allows it."""
+        collection = await self.db.get_collection(collection_name)
+        outbox_collection = await self.db.get_collection(OUTBOX_COLLECTION)
+        records = [email.model_dump() for email in emails]
+
+        if self.supports_transactions is not False:
+            try:
+                async with await self.db.client.start_session() as session:
+                    async with session.start_transaction():
+                        await collection.insert_one(document, session=session)
+                        await outbox_collection.insert_many(records, session=session)
+                self.supports_transactions = True
+                return
+            except OperationFailure as e:
+                if e.code != ILLEGAL_OPERATION:
+                    raise
+                # Standalone mongod (local development): no multi-document transactions
+                logger.warning("MongoDB transactions unavailable, writing outbox records without a transaction")
+                self.supports_transactions = False
+
+        await collection.insert_one(document)
+        await outbox_collection.insert_many(records)
+
+
+class OutboxRelay:
+    """Drain the email outbox in batches and mark records delivered.
+
+    Records are claimed with a lease so several workers can relay the same
+    outbox without sending an email twice; a claim whose worker died becomes
+    eligible again once its lease runs out. While a full batch keeps coming
+    back the relay loops without sleeping, so a backlog drains at full speed.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseService = db_service,
+        dispatcher: EmailDispatcher = email_dispatcher,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None
+    ):
+        self.db = database
+        self.dispatcher = dispatcher
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))
+        self.lease_seconds = lease_seconds if lease_seconds is not None else float(os.getenv("OUTBOX_LEASE_SECONDS", "120"))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+        self.retry_backoff = retry_backoff if retry_backoff is not None else float(os.getenv("EMAIL_RETRY_BACKOFF", "2.0"))
+
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        self.delivered = 0
+        self.failed = 0
+        self.retried = 0
+
+    async def start(self):
+        """Start relaying in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info("Email outbox relay started")
+
+    async def stop(self):
+        """Stop the relay; claimed but unsent records are picked up again after their lease."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self):
+        """Wake the relay up early, e.g. right after new records were written."""
+        self._wakeup.set()
+
+    async def relay_once(self) -> int:
+        """Claim, send and settle one batch. Returns the number of records processed."""
+        records = await self._claim()
+        if not records:
+            return 0
+
+        # Spread the batch over the SMTP pool so each connection sends its share
+        chunks = [records[i::self.dispatcher.pool_size] for i in range(self.dispatcher.pool_size)]
+        chunks = [chunk for chunk in chunks if chunk]
+        results = await asyncio.gather(*(self.dispatcher.deliver(chunk) for chunk in chunks))
+
+        await self._settle([
+            (record, outcome)
+            for chunk, chunk_results in zip(chunks, results)
+            for record, outcome in zip(chunk, chunk_results)
+        ])
+        return len(records)
+
+    def stats(self) -> Dict[str, Any]:
+        """Relay counters."""
+        return {"delivered": self.delivered, "failed": self.failed, "retried": self.retried}
+
+    async def _run(self):
+        while True:
+            try:
+                processed = await self.relay_once()
+            except Exception as e:
+                logger.error(f"Outbox relay error: {str(e)}")
+                processed = 0
+
+            if processed >= self.batch_size:
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> List[OutboxRecord]:
+        outbox_collection = await self.db.get_collection(OUTBOX_COLLECTION)
+        now = datetime.utcnow()
+        due = {
+            "status": {"$in": [OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]},
+            "next_attempt_at": {"$lte": now}
+        }
+
+        candidates = await outbox_collection.find(due, {"id": 1}).sort("next_attempt_at", 1).limit(self.batch_size).to_list(length=None)
+        if not candidates:
+            return []
+
+        lease_id = str(uuid.uuid4())
+        await outbox_collection.update_many(
+            {**due, "id": {"$in": [candidate["id"] for candidate in candidates]}},
+            {"$set": {
+                "status": OutboxStatus.SENDING.value,
+                "lease_id": lease_id,
+                "next_attempt_at": now + timedelta(seconds=self.lease_seconds),
+                "updated_at": now
+            }}
+        )
+
+        claimed = await outbox_collection.find({"lease_id": lease_id}).to_list(length=None)
+        return [OutboxRecord(**record) for record in claimed]
+
+    async def _settle(self, outcomes):
+        outbox_collection = await self.db.get_collection(OUTBOX_COLLECTION)
+        now = datetime.utcnow()
+        operations = []
+
+        for record, outcome in outcomes:
+            if outcome == DeliveryOutcome.SENT:
+                self.delivered += 1
+                update = {
+                    "status": OutboxStatus.DELIVERED.value,
+                    "delivered_at": now,
+                    "lease_id": None
+                }
+            else:
+                attempts = record.attempts + 1
+                if outcome == DeliveryOutcome.REJECTED:
+                    # Retrying a permanent refusal would only be refused again
+                    self.failed += 1
+                    status = OutboxStatus.FAILED
+                    logger.error(f"Outbox email {record.id} to {record.to_email} was rejected by the SMTP server")
+                elif attempts >= self.max_attempts:
+                    self.failed += 1
+                    status = OutboxStatus.FAILED
+                    logger.error(f"Giving up on outbox email {record.id} to {record.to_email} after {attempts} attempts")
+                else:
+                    self.retried += 1
+                    status = OutboxStatus.PENDING
+                update = {
+                    "status": status.value,
+                    "attempts": attempts,
+                    "next_attempt_at": now + timedelta(seconds=self.retry_backoff * (2 ** (attempts - 1))),
+                    "lease_id": None
+                }
+            update["updated_at"] = now
+            # Only settle records we still hold the lease on
+            operations.append(UpdateOne({"id": record.id, "lease_id": record.lease_id}, {"$set": update}))
+
+        if operations:
+            await outbox_collection.bulk_write(operations, ordered=False)
+
+# Create global instances
+email_outbox = EmailOutbox()
+outbox_relay = OutboxRelay()
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Dict, Any, Tuple
+import base64
+import json
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+
+def encode_cursor(created_at: datetime, doc_id: str) -> str:
+    """Opaque continuation token for the position after (created_at, doc_id)."""
+    payload = json.dumps([created_at.isoformat(), doc_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of `encode_cursor`; raises ValueError for malformed tokens."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, doc_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(doc_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_filter(created_at: datetime, doc_id: str) -> Dict[str, Any]:
+    """Match documents after (created_at, _id) in (created_at desc, _id desc) order.
+
+    The tie-break is on `_id` rather than the application id, which
+    ID_STORAGE=dual may hold as a string or a binary UUID that do not
+    compare with each other. Raises ValueError for a malformed `doc_id`.
+    """
+    try:
+        object_id = ObjectId(doc_id)
+    except (InvalidId, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": object_id}}
+    ]}
@@ -0,0 +1,265 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import json
+import logging
+import threading
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import monitoring
+
+from models.analytics import EventType
+from models.email import OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+# Plan stages that mean a query is not served by an index
+SCAN_STAGES = {
+    "COLLSCAN": "collection scan",
+    "SORT": "in-memory sort",
+}
+
+# Query operators that select one value (or a few) and so lead a compound index
+EQUALITY_OPERATORS = {"$eq", "$in"}
+
+SAMPLE_TIME = datetime(2024, 1, 1)
+
+
+class QueryShape(NamedTuple):
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Tuple[Tuple[str, int], ...] = ()
+    limit: int = 0
+    projection: Optional[Dict[str, Any]] = None
+
+
+# Selective queries the routes and services issue, with sample values.
+# Each must be served by an index in INDEX_MANIFEST; full-collection
+# reads (catalog cache loads, dashboard aggregations) are left out.
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("contact_by_id", "contacts", {"id": "contact-id"}),
+    QueryShape("contacts_newest", "contacts", {}, (("created_at", -1),), 100),
+    QueryShape("contacts_page", "contacts", {}, (("created_at", -1), ("_id", -1)), 51),
+    QueryShape("crm_recent_contacts", "contacts", {}, (("created_at", -1),), 10),
+    QueryShape("analytics_since", "analytics", {"timestamp": {"$gte": SAMPLE_TIME}}),
+    QueryShape(
+        "analytics_logins_since", "analytics",
+        {"event_type": EventType.USER_LOGIN.value, "timestamp": {"$gte": SAMPLE_TIME}}
+    ),
+    QueryShape(
+        "favorite_events_since", "analytics",
+        {"event_type": {"$in": [EventType.ADD_FAVORITE.value, EventType.REMOVE_FAVORITE.value]}, "timestamp": {"$gte": SAMPLE_TIME}}
+    ),
+    QueryShape("rollups_since", "analytics_daily", {"day": {"$gte": SAMPLE_TIME}}, (("day", 1),)),
+    QueryShape(
+        "outbox_due", "email_outbox",
+        {"status": {"$in": [OutboxStatus.PENDING.value, OutboxStatus.SENDING.value]}, "next_attempt_at": {"$lte": SAMPLE_TIME}},
+        (("next_attempt_at", 1),), 50
+    ),
+    QueryShape("outbox_claimed", "email_outbox", {"lease_id": "lease-id"}),
+    QueryShape("users_updated_since", "users", {"updated_at": {"$gte": SAMPLE_TIME}}),
+    QueryShape("latest_recommendation_run", "recommendation_runs", {}, (("started_at", -1),), 1),
+    *[
+        QueryShape(
+            f"{collection}_changes", collection, {"updated_at": {"$gt": SAMPLE_TIME}},
+            (("updated_at", 1), ("id", 1)), 501
+        )
+        for collection in ("alternatives", "recipes", "meat_cravings")
+    ],
+    *[
+        QueryShape(f"{collection}_newest_change", collection, {}, (("updated_at", -1),), 1)
+        for collection in ("alternatives", "recipes", "meat_cravings")
+    ],
+]
+
+
+def shape_signature(value: Any) -> Any:
+    """A filter with its values replaced by "?", keeping field names and operators."""
+    if isinstance(value, dict):
+        return {key: shape_signature(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)) and value and isinstance(value[0], dict):
+        return [shape_signature(item) for item in value]
+    return "?"
+
+
+class QueryRecorder(monitoring.CommandListener):
+    """Records the distinct query shapes the application sends, from PyMongo command events.
+
+    find, count, findAndModify, update and delete commands are recorded
+    by filter and sort; an aggregation by its leading `$match` and `$sort`,
+    the part the query planner runs against indexes. The first occurrence
+    of each shape is kept as a sample to explain.
+    """
+
+    COMMANDS = ("find", "aggregate", "count", "findAndModify", "update", "delete")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._shapes: Dict[str, Dict[str, Any]] = {}
+
+    def started(self, event):
+        if event.command_name not in self.COMMANDS:
+            return
+        try:
+            for shape in self._shapes_of(event.command_name, event.command):
+                key = json.dumps(
+                    [shape.name, shape_signature(shape.filter), shape.sort], sort_keys=True, default=str
+                )
+                with self._lock:
+                    entry = self._shapes.get(key)
+                    if entry is None:
+                        self._shapes[key] = {"shape": shape, "count": 1}
+                    else:
+                        entry["count"] += 1
+        except Exception as e:
+            logger.error(f"Failed to record query shape: {str(e)}")
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def shapes(self) -> List[QueryShape]:
+        """Recorded shapes, most frequent first."""
+        with self._lock:
+            entries = sorted(self._shapes.values(), key=lambda entry: -entry["count"])
+        return [entry["shape"] for entry in entries]
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Recorded shapes with their values masked, and how often each was sent."""
+        with self._lock:
+            entries = sorted(self._shapes.values(), key=lambda entry: -entry["count"])
+        return [
+            {
+                "name": entry["shape"].name,
+                "filter": shape_signature(entry["shape"].filter),
+                "sort": [list(key) for key in entry["shape"].sort],
+                "count": entry["count"],
+            }
+            for entry in entries
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._shapes.clear()
+
+    @staticmethod
+    def _shapes_of(command_name: str, command: Dict[str, Any]) -> Iterable[QueryShape]:
+        collection = command.get(command_name)
+        if not isinstance(collection, str) or collection.startswith("system."):
+            return []
+        name = f"{collection}.{command_name}"
+        if command_name == "find":
+            return [QueryShape(
+                name, collection, command.get("filter", {}), tuple(dict(command.get("sort", {})).items()),
+                command.get("limit", 0), command.get("projection")
+            )]
+        if command_name == "aggregate":
+            pipeline = command.get("pipeline", [])
+            query: Dict[str, Any] = {}
+            sort: Dict[str, int] = {}
+            if pipeline and "$match" in pipeline[0]:
+                query = pipeline[0]["$match"]
+                pipeline = pipeline[1:]
+            if pipeline and "$sort" in pipeline[0]:
+                sort = pipeline[0]["$sort"]
+            return [QueryShape(name, collection, query, tuple(dict(sort).items()))]
+        if command_name == "count":
+            return [QueryShape(name, collection, command.get("query", {}))]
+        if command_name == "findAndModify":
+            return [QueryShape(name, collection, command.get("query", {}), tuple(dict(command.get("sort", {})).items()))]
+        statements = command.get("updates" if command_name == "update" else "deletes", [])
+        return [QueryShape(name, collection, statement.get("q", {})) for statement in statements]
+
+
+def plan_stages(plan: Any) -> List[Dict[str, Any]]:
+    """Every stage node of a winning plan, outermost first (classic and slot-based explain formats)."""
+    stages = []
+    pending = [plan]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, dict):
+            if "stage" in node:
+                stages.append(node)
+            pending.extend(reversed([value for value in node.values() if isinstance(value, (dict, list))]))
+        elif isinstance(node, list):
+            pending.extend(reversed(node))
+    return stages
+
+
+def propose_index(shape: QueryShape) -> List[Tuple[str, int]]:
+    """Compound index keys for a shape by the equality, sort, range rule.
+
+    Fields matched by value (or `$in`) come first so the scan is one
+    contiguous key range, then the sort keys so no in-memory sort is
+    needed, then range-filtered fields. `$or` branches are not considered.
+    """
+    equality, ranges = [], []
+    for field, condition in shape.filter.items():
+        if field.startswith("$"):
+            continue
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            (equality if set(condition) <= EQUALITY_OPERATORS else ranges).append(field)
+        else:
+            equality.append(field)
+
+    keys = [(field, 1) for field in equality]
+    for field, direction in shape.sort:
+        if field not in equality:
+            keys.append((field, direction))
+    fields = {field for field, _ in keys}
+    keys.extend((field, 1) for field in ranges if field not in fields)
+    return keys
+
+
+async def explain_shape(db: AsyncIOMotorDatabase, shape: QueryShape) -> Dict[str, Any]:
+    """Explain a shape as a find and report whether its winning plan scans or sorts in memory."""
+    find: Dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+    if shape.sort:
+        find["sort"] = dict(shape.sort)
+    if shape.limit:
+        find["limit"] = shape.limit
+    if shape.projection:
+        find["projection"] = shape.projection
+    explain = await db.command({"explain": find, "verbosity": "executionStats"})
+
+    stages = plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+    problems = sorted({SCAN_STAGES[stage["stage"]] for stage in stages if stage["stage"] in SCAN_STAGES})
+    execution = explain.get("executionStats", {})
+    return {
+        "name": shape.name,
+        "collection": shape.collection,
+        "filter": shape_signature(shape.filter),
+        "sort": [list(key) for key in shape.sort],
+        "stages": [stage["stage"] for stage in stages],
+        "indexes": sorted({stage["indexName"] for stage in stages if "indexName" in stage}),
+        "problems": problems,
+        "proposed_index": propose_index(shape) if problems else None,
+        "returned": execution.get("nReturned", 0),
+        "keys_examined": execution.get("totalKeysExamined", 0),
+        "docs_examined": execution.get("totalDocsExamined", 0),
+    }
+
+
+async def advise(db: AsyncIOMotorDatabase, shapes: Iterable[QueryShape] = QUERY_SHAPES) -> Dict[str, Any]:
+    """Explain every shape; returns the plans and the compound indexes that would fix the scans."""
+    plans = []
+    for shape in shapes:
+        try:
+            plans.append(await explain_shape(db, shape))
+        except Exception as e:
+            logger.error(f"Failed to explain {shape.name}: {str(e)}")
+            plans.append({"name": shape.name, "collection": shape.collection, "error": str(e), "problems": []})
+
+    proposals: Dict[str, List[List[Tuple[str, int]]]] = {}
+    for plan in plans:
+        keys = plan.get("proposed_index")
+        if keys and keys not in proposals.setdefault(plan["collection"], []):
+            proposals[plan["collection"]].append(keys)
+    return {
+        "plans": plans,
+        "scans": [plan["name"] for plan in plans if plan["problems"]],
+        "errors": [plan["name"] for plan in plans if "error" in plan],
+        "proposed_indexes": proposals,
+    }
@@ -0,0 +1,245 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+import logging
+import os
+import time
+
+import numpy as np
+from pymongo import DeleteMany, ReplaceOne
+from scipy import sparse
+
+from models.analytics import EventType
+from services.database import db_service, DatabaseService
+from services.cache import catalog_cache, CatalogCache
+from services.search_index import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+TABLE_COLLECTION = "item_recommendations"
+RUNS_COLLECTION = "recommendation_runs"
+
+FAVORITE_EVENTS = [EventType.ADD_FAVORITE.value, EventType.REMOVE_FAVORITE.value]
+
+
+class RecommendationService:
+    """The "users who saved this also saved" lists, computed in batch from favorites.
+
+    Who saved what comes from `users.favorites`. Users without favorites in
+    their document are filled in from the latest `add_favorite`/
+    `remove_favorite` analytics event per (user, alternative), with the
+    alternative in `event_data.alternative_id`; only events recorded for an
+    authenticated user count, so anonymous clients cannot add or drop pairs.
+    These form a sparse binary user x item matrix X; item co-occurrence is
+    X.T @ X and similarity is its cosine normalization
+    `common / sqrt(savers_i * savers_j)`. The top `k` per alternative are
+    written to `item_recommendations` and served from there.
+
+    An incremental run recomputes only the rows of alternatives saved or
+    unsaved by users with activity since the previous run, whose
+    co-occurrence counts are the ones that changed, as X[:, changed].T @ X
+    instead of the full product. Other rows keep their counts but their
+    scores drift slightly as saver totals move, and favorites dropped from
+    a user document without an event are missed; a periodic full run
+    (`--full`) settles both.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseService = db_service,
+        cache: CatalogCache = catalog_cache,
+        k: Optional[int] = None,
+        min_common: Optional[int] = None,
+        block_size: int = 2048
+    ):
+        self.db = database
+        self.cache = cache
+        self.k = k if k is not None else int(os.getenv("RECOMMENDATIONS_TOP_K", "20"))
+        self.min_common = min_common if min_common is not None else int(os.getenv("RECOMMENDATIONS_MIN_COMMON", "2"))
+        self.block_size = block_size
+
+    async def compute(self, full: bool = False) -> Dict[str, Any]:
+        """Recompute the precomputed table; incrementally unless `full` or there is no previous run.
+
+        Returns the run summary that is also stored in `recommendation_runs`.
+        """
+        started = datetime.utcnow()
+        clock = time.perf_counter()
+        runs = await self.db.get_collection(RUNS_COLLECTION)
+        previous = None if full else await runs.find_one({}, sort=[("started_at", -1)])
+        since = previous["started_at"] if previous else None
+
+        items = [
+            alternative["id"]
+            for alternative in await self.cache.find("alternatives", {"is_active": {"$ne": False}}, {"_id": 0, "id": 1})
+        ]
+        pairs = await self.load_pairs()
+        matrix, positions = self.matrix(pairs, items)
+
+        if since is None:
+            affected = list(range(len(items)))
+        else:
+            touched = await self._touched_items(since, pairs)
+            affected = sorted(positions[item] for item in touched if item in positions)
+
+        rows = self.neighbours(matrix, affected)
+        written = await self._write(
+            {items[row]: [(items[other], score, common) for other, score, common in neighbours] for row, neighbours in rows.items()},
+            replace_all=since is None
+        )
+
+        run = {
+            "started_at": started,
+            "finished_at": datetime.utcnow(),
+            "mode": "full" if since is None else "incremental",
+            "since": since,
+            "users": matrix.shape[0],
+            "items": matrix.shape[1],
+            "favorites": int(matrix.nnz),
+            "rows_updated": written,
+            "seconds": round(time.perf_counter() - clock, 3),
+        }
+        await runs.insert_one(dict(run))
+        logger.info(
+            f"Recommendations {run['mode']} run: {written} of {len(items)} rows in {run['seconds']}s"
+        )
+        return run
+
+    async def load_pairs(self) -> Set[Tuple[str, str]]:
+        """Current (user, alternative) favorites from user documents and authenticated events."""
+        pairs: Set[Tuple[str, str]] = set()
+        documented: Set[str] = set()
+        users = await self.db.get_collection("users")
+        async for user in users.find({"favorites.0": {"$exists": True}}, {"_id": 0, "id": 1, "favorites": 1}):
+            documented.add(user["id"])
+            pairs.update((user["id"], item) for item in user["favorites"])
+
+        # Latest favorite event per (user, alternative) decides whether it is
+        # saved, for users whose document has no favorites to go by
+        analytics = await self.db.get_collection("analytics")
+        pipeline = [
+            {"$match": {
+                "event_type": {"$in": FAVORITE_EVENTS},
+                "user_id": {"$ne": None},
+                "event_data.alternative_id": {"$exists": True},
+            }},
+            {"$sort": {"timestamp": 1}},
+            {"$group": {
+                "_id": {"actor": "$user_id", "item": "$event_data.alternative_id"},
+                "event_type": {"$last": "$event_type"},
+            }},
+        ]
+        async for row in analytics.aggregate(pipeline, allowDiskUse=True):
+            key = (row["_id"]["actor"], row["_id"]["item"])
+            if key[0] in documented:
+                continue
+            if row["event_type"] == EventType.ADD_FAVORITE.value:
+                pairs.add(key)
+        return pairs
+
+    @staticmethod
+    def matrix(pairs: Set[Tuple[str, str]], items: List[str]) -> Tuple[sparse.csr_matrix, Dict[str, int]]:
+        """Binary CSR matrix of actors x `items`; favorites of unknown items are dropped."""
+        positions = {item: position for position, item in enumerate(items)}
+        actors: Dict[str, int] = {}
+        rows, columns = [], []
+        for actor, item in pairs:
+            column = positions.get(item)
+            if column is not None:
+                rows.append(actors.setdefault(actor, len(actors)))
+                columns.append(column)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(actors), len(items))
+        )
+        return matrix, positions
+
+    def neighbours(self, matrix: sparse.csr_matrix, rows: List[int]) -> Dict[int, List[Tuple[int, float, int]]]:
+        """Top `k` (item, cosine, common savers) for each item in `rows`."""
+        savers = np.asarray(matrix.sum(axis=0)).ravel()
+        by_item = matrix.T.tocsr()
+        results: Dict[int, List[Tuple[int, float, int]]] = {}
+        for start in range(0, len(rows), self.block_size):
+            block = np.asarray(rows[start:start + self.block_size], dtype=np.int64)
+            cooccurrence = (by_item[block] @ matrix).tocsr()
+            for index, row in enumerate(block):
+                begin, end = cooccurrence.indptr[index], cooccurrence.indptr[index + 1]
+                others = cooccurrence.indices[begin:end]
+                common = cooccurrence.data[begin:end]
+                keep = (others != row) & (common >= self.min_common)
+                others, common = others[keep], common[keep]
+                scores = common / np.sqrt(savers[row] * savers[others])
+                if scores.size > self.k:
+                    top = np.argpartition(-scores, self.k - 1)[:self.k]
+                else:
+                    top = np.arange(scores.size)
+                top = top[np.lexsort((others[top], -scores[top]))]
+                results[int(row)] = [
+                    (int(others[position]), round(float(scores[position]), 4), int(common[position]))
+                    for position in top
+                ]
+        return results
+
+    async def also_saved(self, alternative_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Precomputed "users who saved this also saved" alternatives, best first."""
+        table = await self.db.get_collection(TABLE_COLLECTION)
+        row = await table.find_one({"_id": alternative_id})
+        if not row or not row["items"]:
+            return []
+        neighbours = row["items"][:limit]
+        ids = [neighbour["id"] for neighbour in neighbours]
+        projection = {"_id": 0, **{field: 1 for field in SUMMARY_FIELDS["alternatives"]}}
+        documents = await self.cache.find("alternatives", {"id": {"$in": ids}, "is_active": {"$ne": False}}, projection)
+        by_id = {document["id"]: document for document in documents}
+        return [
+            dict(by_id[neighbour["id"]], score=neighbour["score"], common=neighbour["common"])
+            for neighbour in neighbours
+            if neighbour["id"] in by_id
+        ]
+
+    async def _touched_items(self, since: datetime, pairs: Set[Tuple[str, str]]) -> Set[str]:
+        """Alternatives whose co-occurrences may have changed since `since`."""
+        actors: Set[str] = set()
+        touched: Set[str] = set()
+        analytics = await self.db.get_collection("analytics")
+        cursor = analytics.find(
+            {"event_type": {"$in": FAVORITE_EVENTS}, "user_id": {"$ne": None}, "timestamp": {"$gte": since}},
+            {"_id": 0, "user_id": 1, "event_data.alternative_id": 1}
+        )
+        async for event in cursor:
+            actor = event.get("user_id")
+            item = (event.get("event_data") or {}).get("alternative_id")
+            if actor and item:
+                actors.add(actor)
+                touched.add(item)
+
+        users = await self.db.get_collection("users")
+        async for user in users.find({"updated_at": {"$gte": since}}, {"_id": 0, "id": 1}):
+            actors.add(user["id"])
+
+        touched.update(item for actor, item in pairs if actor in actors)
+        return touched
+
+    async def _write(self, rows: Dict[str, List[Tuple[str, float, int]]], replace_all: bool, batch_size: int = 1000) -> int:
+        table = await self.db.get_collection(TABLE_COLLECTION)
+        now = datetime.utcnow()
+        operations: List[Any] = [
+            ReplaceOne(
+                {"_id": item},
+                {
+                    "_id": item,
+                    "items": [{"id": other, "score": score, "common": common} for other, score, common in neighbours],
+                    "updated_at": now,
+                },
+                upsert=True
+            )
+            for item, neighbours in rows.items()
+        ]
+        if replace_all:
+            # Rows of alternatives that are gone or inactive
+            operations.append(DeleteMany({"updated_at": {"$lt": now}}))
+        for start in range(0, len(operations), batch_size):
+            await table.bulk_write(operations[start:start + batch_size], ordered=False)
+        return len(rows)
+
+# Create global instance
+recommendation_service = RecommendationService()
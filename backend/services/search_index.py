@@ -0,0 +1,423 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import heapq
+import logging
+import math
+import re
+import unicodedata
+
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Searchable fields and their boosts per collection (the fields of the Mongo text indexes)
+SEARCH_FIELDS: Dict[str, Dict[str, float]] = {
+    "alternatives": {"name": 3.0, "brand": 2.0, "description": 1.0},
+    "recipes": {"title": 3.0, "description": 1.0},
+}
+
+# Fields kept in memory to render a result without another database read
+SUMMARY_FIELDS: Dict[str, List[str]] = {
+    "alternatives": ["id", "name", "brand", "type", "meat_type", "rating", "review_count", "image_url", "price_range"],
+    "recipes": ["id", "title", "meat_type", "difficulty", "total_time", "rating", "review_count", "image_url"],
+}
+
+DocKey = Tuple[str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents ("Sauté" -> "saute").
+
+    Anything that does not decompose to ASCII is dropped, which is fine for
+    tokenizing since tokens are ASCII letters and digits only.
+    """
+    text = text.lower()
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class SearchIndex:
+    """In-memory inverted index over the catalog with BM25 ranking.
+
+    Each field is scored with BM25 and the field scores are combined with
+    per-field boosts. The boosted, length-normalized term weights ("impacts")
+    are precomputed per posting, so a query only sums `idf * impact` over the
+    postings of its terms. Impacts are refreshed when the average field
+    lengths drift by more than `renormalize_drift`.
+
+    Postings are also kept ranked by impact, and queries run the threshold
+    algorithm over the ranked lists: they stop as soon as no unseen document
+    can beat the current top `limit`, so common terms cost about as much as
+    rare ones. Two bounds keep the worst case around a millisecond at 100k
+    documents: terms in more than `stop_term_ratio` of the documents only add
+    to the scores of documents found through the query's rarer terms, and
+    after `max_rounds` rounds the best documents seen so far are returned, so
+    results can differ from an exhaustive search's (benchmarks/search_index.py
+    reports by how much). Documents with all the query's terms are scored
+    first, which keeps exact names near the top despite the round limit.
+
+    The last query term also matches as a prefix ("tem" -> "tempeh"), which
+    makes the index usable for search-as-you-type.
+    """
+
+    def __init__(
+        self,
+        cache: CatalogCache = catalog_cache,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_prefix_expansions: int = 30,
+        renormalize_drift: float = 0.1,
+        stop_term_ratio: float = 0.2,
+        max_rounds: int = 80,
+        max_conjunction: int = 5000
+    ):
+        self.cache = cache
+        self.k1 = k1
+        self.b = b
+        self.max_prefix_expansions = max_prefix_expansions
+        self.renormalize_drift = renormalize_drift
+        self.stop_term_ratio = stop_term_ratio
+        self.max_rounds = max_rounds
+        self.max_conjunction = max_conjunction
+        self._reset()
+
+    def _reset(self):
+        self._keys: List[Optional[DocKey]] = []
+        self._slots: Dict[DocKey, int] = {}
+        self._free: List[int] = []
+        self._summaries: List[Optional[Dict[str, Any]]] = []
+        self._doc_terms: List[Optional[Dict[str, Counter]]] = []
+        self._postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        self._ranked: Dict[str, List[Tuple[float, int]]] = {}
+        self._unranked: set = set()
+        self._field_length_totals: Counter = Counter()
+        self._field_doc_counts: Counter = Counter()
+        self._impact_averages: Dict[str, float] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._expansions: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    async def build(self):
+        """(Re)build the index from all active catalog documents."""
+        self._reset()
+        for collection_name in SEARCH_FIELDS:
+            self.add_many(collection_name, await self._load(collection_name))
+        logger.info(f"Search index built with {len(self)} documents")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: apply changed documents, or reload the whole collection."""
+        if documents is None:
+            for key in [key for key in self._slots if key[0] == collection_name]:
+                self.remove(*key)
+            documents = await self._load(collection_name)
+        self.add_many(collection_name, documents)
+
+    def add_many(self, collection_name: str, documents: List[Dict[str, Any]]):
+        """Upsert a batch of documents, renormalizing at most once."""
+        inserted = []
+        for document in documents:
+            self.remove(collection_name, document["id"])
+            if document.get("is_active", True):
+                inserted.append(self._insert(collection_name, document))
+        if not self._maybe_renormalize():
+            for slot in inserted:
+                self._weigh(slot)
+        for term in list(self._unranked):
+            self._ranked_postings(term)
+        self._expansions.clear()
+
+    def upsert(self, collection_name: str, document: Dict[str, Any]):
+        """Add or replace one document; inactive documents are removed."""
+        self.add_many(collection_name, [document])
+
+    def remove(self, collection_name: str, doc_id: str):
+        """Drop one document from the index."""
+        slot = self._slots.pop((collection_name, doc_id), None)
+        if slot is None:
+            return
+        for field, terms in self._doc_terms[slot].items():
+            self._field_length_totals[field] -= sum(terms.values())
+            self._field_doc_counts[field] -= 1
+        for term in self._terms_of(slot):
+            postings = self._postings[term]
+            postings.pop(slot, None)
+            self._ranked.pop(term, None)
+            if postings:
+                self._unranked.add(term)
+            else:
+                del self._postings[term]
+                self._unranked.discard(term)
+                self._vocabulary_dirty = True
+                self._expansions.clear()
+        self._keys[slot] = None
+        self._summaries[slot] = None
+        self._doc_terms[slot] = None
+        self._free.append(slot)
+
+    def search(
+        self,
+        query: str,
+        collection_name: Optional[str] = None,
+        limit: int = 10,
+        prefix: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Top `limit` documents for `query`, best first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        document_count = len(self._slots)
+
+        def idf(postings):
+            return math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+
+        # Exact terms: one ranked stream of (contribution, slot) each
+        streams = []
+        weights: List[Tuple[float, Dict[int, float]]] = []
+        stop_terms: List[Tuple[str, float]] = []
+        for term in dict.fromkeys(terms):
+            postings = self._postings.get(term)
+            if postings:
+                factor = idf(postings)
+                weights.append((factor, postings))
+                if len(postings) > self.stop_term_ratio * document_count:
+                    stop_terms.append((term, factor))
+                else:
+                    streams.append(self._stream(term, factor))
+
+        # The last term may still be being typed: its completions form one more
+        # stream, scored by the best completion a document contains (so "ba"
+        # does not add up "bacon" and "barbecue"), at slightly less than full weight.
+        completions: List[Tuple[float, Dict[int, float]]] = []
+        completion_stream = None
+        completion_best = 0.0
+        if prefix and not query[-1:].isspace():
+            ranked_completions = []
+            for term in self._expand_prefix(terms[-1]):
+                postings = self._postings[term]
+                factor = 0.9 * idf(postings)
+                completions.append((factor, postings))
+                ranked_completions.append(self._stream(term, factor))
+                completion_best = max(completion_best, factor * self._ranked_postings(term)[0][0])
+            if ranked_completions:
+                completion_stream = heapq.merge(*ranked_completions, reverse=True)
+                streams.append(completion_stream)
+
+        # Stop terms only rank documents found through the other terms, unless
+        # there are no others; the most they can add still counts towards the threshold
+        stop_bound = 0.0
+        bounded = bool(streams)
+        for term, factor in stop_terms:
+            if bounded:
+                stop_bound += factor * self._ranked_postings(term)[0][0]
+            else:
+                streams.append(self._stream(term, factor))
+
+        top: List[Tuple[float, int]] = []
+        seen = set()
+
+        def consider(slot: int, completion: Optional[float] = None):
+            """Score a newly seen document exactly and keep it if it makes the top."""
+            if slot in seen:
+                return
+            seen.add(slot)
+            if collection_name is not None and self._keys[slot][0] != collection_name:
+                return
+            score = 0.0
+            for factor, postings in weights:
+                impact = postings.get(slot)
+                if impact is not None:
+                    score += factor * impact
+            if completion is not None:
+                score += completion
+            elif completions:
+                # Only look the completions up for documents that could still make the top
+                if len(top) >= limit and score + completion_best <= top[0][0]:
+                    return
+                best = 0.0
+                for factor, postings in completions:
+                    impact = postings.get(slot)
+                    if impact is not None and factor * impact > best:
+                        best = factor * impact
+                score += best
+            if len(top) < limit:
+                heapq.heappush(top, (score, slot))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, slot))
+
+        # Documents with every exact query term (stop terms aside) are the likely
+        # best matches: when the rarest term is in at most `max_conjunction` documents
+        # and few have them all, scoring those first lets the threshold algorithm stop early.
+        by_size = sorted(
+            (postings for _, postings in weights if len(postings) <= self.stop_term_ratio * document_count), key=len
+        )
+        if len(by_size) > 1 and len(by_size[0]) <= self.max_conjunction:
+            candidates = by_size[0].keys()
+            for postings in by_size[1:]:
+                candidates = postings.keys() & candidates
+            if len(candidates) <= self.max_rounds:
+                for slot in candidates:
+                    consider(slot)
+
+        # Threshold algorithm: advance every stream one step per round, score each
+        # newly seen document exactly, and stop once the k-th best score reaches
+        # the most any unseen document could still get, or after `max_rounds`.
+        rounds = 0
+        while streams:
+            threshold = stop_bound
+            for stream in list(streams):
+                item = next(stream, None)
+                if item is None:
+                    streams.remove(stream)
+                    continue
+                bound, slot = item
+                threshold += bound
+                # The merged completion stream is best first, so its bound is the document's best completion
+                consider(slot, bound if stream is completion_stream else None)
+            if len(top) >= limit and top[0][0] >= threshold:
+                break
+            rounds += 1
+            if rounds >= self.max_rounds:
+                break
+
+        return [
+            {
+                "collection": self._keys[slot][0],
+                "id": self._keys[slot][1],
+                "score": round(score, 4),
+                "document": self._summaries[slot],
+            }
+            for score, slot in sorted(top, reverse=True)
+        ]
+
+    async def _load(self, collection_name: str) -> List[Dict[str, Any]]:
+        return await self.cache.find(collection_name, {"is_active": {"$ne": False}})
+
+    def _insert(self, collection_name: str, document: Dict[str, Any]) -> int:
+        """Store a document's terms and lengths; its postings are added by `_weigh`."""
+        key = (collection_name, document["id"])
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._keys)
+            self._keys.append(None)
+            self._summaries.append(None)
+            self._doc_terms.append(None)
+
+        fields = {}
+        for field in SEARCH_FIELDS[collection_name]:
+            tokens = tokenize(document.get(field))
+            if tokens:
+                fields[field] = Counter(tokens)
+                self._field_length_totals[field] += len(tokens)
+                self._field_doc_counts[field] += 1
+
+        self._keys[slot] = key
+        self._slots[key] = slot
+        self._doc_terms[slot] = fields
+        self._summaries[slot] = {field: document.get(field) for field in SUMMARY_FIELDS[collection_name]}
+        return slot
+
+    def _weigh(self, slot: int):
+        """Add the postings of one stored document."""
+        for term, impact in self._impacts(slot).items():
+            if term not in self._postings:
+                self._vocabulary_dirty = True
+            self._postings[term][slot] = impact
+            self._ranked.pop(term, None)
+            self._unranked.add(term)
+
+    def _impacts(self, slot: int) -> Dict[str, float]:
+        """Boosted BM25 term-frequency components for one document."""
+        collection_name = self._keys[slot][0]
+        impacts: Dict[str, float] = defaultdict(float)
+        for field, terms in self._doc_terms[slot].items():
+            boost = SEARCH_FIELDS[collection_name][field]
+            average = self._impact_averages.get(field) or self._average_length(field) or 1.0
+            norm = self.k1 * (1 - self.b + self.b * sum(terms.values()) / average)
+            for term, tf in terms.items():
+                impacts[term] += boost * tf * (self.k1 + 1) / (tf + norm)
+        return impacts
+
+    def _terms_of(self, slot: int):
+        return {term for terms in self._doc_terms[slot].values() for term in terms}
+
+    def _average_length(self, field: str) -> float:
+        count = self._field_doc_counts[field]
+        return self._field_length_totals[field] / count if count else 0.0
+
+    def _maybe_renormalize(self) -> bool:
+        for field in self._field_doc_counts:
+            average = self._impact_averages.get(field)
+            current = self._average_length(field)
+            if current and (not average or abs(current - average) / average > self.renormalize_drift):
+                self._renormalize()
+                return True
+        return False
+
+    def _renormalize(self):
+        """Recompute every impact against the current average field lengths."""
+        self._impact_averages = {field: self._average_length(field) for field in self._field_doc_counts}
+        for slot in self._slots.values():
+            for term, impact in self._impacts(slot).items():
+                self._postings[term][slot] = impact
+        self._ranked.clear()
+        self._unranked = set(self._postings)
+        self._vocabulary_dirty = True
+
+    def _stream(self, term: str, factor: float) -> Iterator[Tuple[float, int]]:
+        """(factor * impact, slot) over the postings of `term`, highest first."""
+        return ((factor * impact, slot) for impact, slot in self._ranked_postings(term))
+
+    def _ranked_postings(self, term: str) -> List[Tuple[float, int]]:
+        """Postings of `term` as (impact, slot), highest impact first."""
+        ranked = self._ranked.get(term)
+        if ranked is None:
+            ranked = sorted(((impact, slot) for slot, impact in self._postings[term].items()), reverse=True)
+            self._ranked[term] = ranked
+            self._unranked.discard(term)
+        return ranked
+
+    def unmatched_terms(self, query: str, prefix: bool = True) -> List[str]:
+        """Query terms that no document contains; a last term still being typed counts if it has completions."""
+        terms = tokenize(query)
+        unmatched = [term for term in dict.fromkeys(terms) if term not in self._postings]
+        if prefix and unmatched and unmatched[-1] == terms[-1] and not query[-1:].isspace() and self._expand_prefix(terms[-1]):
+            unmatched.pop()
+        return unmatched
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        expansions = self._expansions.get(prefix)
+        if expansions is not None:
+            return expansions
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\uffff", start)
+        expansions = [term for term in self._vocabulary[start:end] if term != prefix]
+        if len(expansions) > self.max_prefix_expansions:
+            # Keep the most common completions
+            expansions = heapq.nlargest(self.max_prefix_expansions, expansions, key=lambda term: len(self._postings[term]))
+        self._expansions[prefix] = expansions
+        return expansions
+
+# Create global instance
+search_index = SearchIndex()
+
+for _collection_name in SEARCH_FIELDS:
+    catalog_events.subscribe(_collection_name, search_index.reload)
@@ -0,0 +1,84 @@
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import Response
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+
+def _orjson_default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (ObjectId, bytes)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson; datetimes come out as FastAPI's encoder writes them."""
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(Response):
+    """A JSON response encoded by orjson.
+
+    Returning a Response from an endpoint skips FastAPI's `response_model`
+    validation and `jsonable_encoder`; keep `response_model` on the route
+    for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ResponseSerializer:
+    """Builds a response model's JSON body from documents we wrote ourselves, without validating them.
+
+    `projection` asks Mongo for exactly the model's fields; `document`
+    keeps those fields (under their serialization aliases), filling in
+    the model's defaults for fields the stored document lacks (calling
+    default factories once per document), and required fields it lacks
+    with None. Only use it for documents written
+    through the models, where validation on the way out repeats work done
+    on the way in.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields: List[Tuple[str, str, Any]] = []
+        self.factories: List[Tuple[str, str, Callable[[], Any]]] = []
+        for name, field in model.model_fields.items():
+            key = field.serialization_alias or field.alias or name
+            if field.default_factory is not None:
+                self.fields.append((name, key, None))
+                self.factories.append((name, key, field.default_factory))
+            else:
+                self.fields.append((name, key, None if field.default is PydanticUndefined else field.default))
+        self.projection = {"_id": 0, **{name: 1 for name, _, _ in self.fields}}
+
+    def document(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        body = {key: document.get(name, default) for name, key, default in self.fields}
+        for name, key, factory in self.factories:
+            if name not in document:
+                body[key] = factory()
+        return body
+
+    def documents(self, documents: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.document(document) for document in documents]
+
+    def response(self, document: Dict[str, Any]) -> FastJSONResponse:
+        return FastJSONResponse(self.document(document))
+
+    def list_response(self, documents: Iterable[Dict[str, Any]]) -> FastJSONResponse:
+        return FastJSONResponse(self.documents(documents))
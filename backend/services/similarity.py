@@ -0,0 +1,253 @@
+from typing import Any, Dict, List, Optional
+import logging
+
+import numpy as np
+
+from models.alternatives import MeatType, normalize_nutrition
+from services.cache import catalog_cache, CatalogCache
+from services.catalog_events import catalog_events
+from services.nutrition import NUTRIENTS
+from services.search_index import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Reference daily values: vectors are in "share of a day's amount", so a gram
+# of protein and a milligram of iron are comparable
+DAILY_VALUES: Dict[str, float] = {
+    "protein": 50.0,
+    "iron": 18.0,
+    "calories": 2000.0,
+    "fat": 78.0,
+    "fiber": 28.0,
+    "b12": 2.4,
+    "sodium": 2300.0,
+    "cholesterol": 300.0,
+}
+SCALE = np.array([DAILY_VALUES[nutrient] for nutrient in NUTRIENTS])
+
+# Used for cravings whose deficiencies name none of the tracked nutrients
+DEFAULT_PROFILE = ["protein"]
+
+
+def embed(nutrition_values: Dict[str, float]) -> np.ndarray:
+    """Unit-length vector of daily-value shares (zero vector without nutrition data)."""
+    vector = np.array([nutrition_values.get(nutrient, 0.0) for nutrient in NUTRIENTS]) / SCALE
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm else vector).astype(np.float32)
+
+
+def deficiency_profile(deficiency: Optional[str]) -> np.ndarray:
+    """Target vector for a craving: equal weight on each named, tracked nutrient.
+
+    "Iron, B12, Protein" -> iron, b12 and protein; nutrients we do not track
+    (zinc, B6, omega-3, ...) are ignored.
+    """
+    named = {
+        part.strip().lower().replace("vitamin ", "").replace("-", "")
+        for part in (deficiency or "").split(",")
+    }
+    nutrients = [nutrient for nutrient in NUTRIENTS if nutrient in named] or DEFAULT_PROFILE
+    vector = np.array([1.0 if nutrient in nutrients else 0.0 for nutrient in NUTRIENTS])
+    return vector / np.linalg.norm(vector)
+
+
+class SimilarityIndex:
+    """Nutrient-similarity nearest neighbours between alternatives, and from cravings to alternatives.
+
+    Alternatives are unit vectors of daily-value shares, so cosine similarity
+    is a dot product and a whole catalog is scored with one matrix product.
+    Each alternative's top `k` neighbours are precomputed. When documents
+    change, only the changed rows and the lists they enter or leave are
+    recomputed; a full rebuild happens when too much changed at once.
+    """
+
+    def __init__(self, cache: CatalogCache = catalog_cache, k: int = 10, block_size: int = 1024):
+        self.cache = cache
+        self.k = k
+        self.block_size = block_size
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._documents: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((0, len(NUTRIENTS)), dtype=np.float32)
+        self._neighbours = np.zeros((0, k), dtype=np.int64)
+        self._scores = np.zeros((0, k), dtype=np.float32)
+        self._profiles: Dict[str, np.ndarray] = {}
+
+    async def build(self):
+        """Rebuild vectors, neighbour lists and craving profiles from the catalog."""
+        alternatives, cravings = await self._load()
+        self.load(alternatives, cravings)
+
+    def load(self, alternatives: List[Dict[str, Any]], cravings: Optional[List[Dict[str, Any]]] = None):
+        """Replace the index contents and recompute every neighbour list."""
+        self._ids = [alternative["id"] for alternative in alternatives]
+        self._positions = {alternative_id: position for position, alternative_id in enumerate(self._ids)}
+        self._documents = [self._summary(alternative) for alternative in alternatives]
+        self._vectors = np.array([self._embed(alternative) for alternative in alternatives], dtype=np.float32).reshape(-1, len(NUTRIENTS))
+        if cravings is not None:
+            self._set_profiles(cravings)
+
+        self._rebuild()
+        logger.info(f"Similarity index built with {len(self._ids)} alternatives")
+
+    async def reload(self, collection_name: str, documents: Optional[List[Dict[str, Any]]] = None):
+        """Catalog listener: apply changed alternatives incrementally, or reload cravings."""
+        if collection_name == "meat_cravings":
+            _, cravings = await self._load()
+            self._set_profiles(cravings)
+            return
+        if documents is None:
+            alternatives, _ = await self._load()
+            self.sync(alternatives)
+        else:
+            self.update(documents)
+
+    def sync(self, alternatives: List[Dict[str, Any]]):
+        """Bring the index in line with the full list of active alternatives."""
+        current = {alternative["id"] for alternative in alternatives}
+        removed = [alternative_id for alternative_id in self._ids if alternative_id not in current]
+        changed = [
+            alternative for alternative in alternatives
+            if alternative["id"] not in self._positions
+            or not np.array_equal(self._vectors[self._positions[alternative["id"]]], self._embed(alternative))
+            or self._documents[self._positions[alternative["id"]]] != self._summary(alternative)
+        ]
+        if removed or len(changed) > len(alternatives) // 4:
+            # Removal shifts every position, so it costs a full rebuild anyway
+            self.load(alternatives)
+        elif changed:
+            self.update(changed)
+
+    def update(self, alternatives: List[Dict[str, Any]]):
+        """Upsert alternatives and refresh only the neighbour lists they affect."""
+        inactive = [alternative["id"] for alternative in alternatives if alternative.get("is_active") is False]
+        if inactive:
+            self.remove(inactive)
+        active = [alternative for alternative in alternatives if alternative.get("is_active") is not False]
+
+        changed_rows = []
+        for alternative in active:
+            position = self._positions.get(alternative["id"])
+            if position is None:
+                position = len(self._ids)
+                self._ids.append(alternative["id"])
+                self._positions[alternative["id"]] = position
+                self._documents.append(self._summary(alternative))
+                self._vectors = np.vstack([self._vectors, self._embed(alternative)])
+                self._neighbours = np.vstack([self._neighbours, np.zeros((1, self.k), dtype=np.int64)])
+                self._scores = np.vstack([self._scores, np.full((1, self.k), -np.inf, dtype=np.float32)])
+            else:
+                self._documents[position] = self._summary(alternative)
+                self._vectors[position] = self._embed(alternative)
+            changed_rows.append(position)
+        if not changed_rows:
+            return
+
+        changed = np.array(changed_rows)
+        # Lists that contained a changed alternative may lose it: recompute them.
+        # Lists it now beats the k-th entry of gain it: recompute those too.
+        contains = np.isin(self._neighbours, changed).any(axis=1)
+        similarities = self._vectors @ self._vectors[changed].T
+        similarities[changed, np.arange(len(changed))] = -np.inf
+        similarities[:, ~self._has_nutrition()[changed]] = -np.inf
+        beats = (similarities > self._scores[:, -1:]).any(axis=1)
+        stale = np.flatnonzero(contains | beats)
+        self._refresh_rows(np.union1d(stale, changed))
+
+    def remove(self, alternative_ids: List[str]):
+        """Drop alternatives; positions shift, so every neighbour list is recomputed."""
+        removed = set(alternative_ids) & set(self._positions)
+        if not removed:
+            return
+        keep = [position for position, alternative_id in enumerate(self._ids) if alternative_id not in removed]
+        self._ids = [self._ids[position] for position in keep]
+        self._positions = {alternative_id: position for position, alternative_id in enumerate(self._ids)}
+        self._documents = [self._documents[position] for position in keep]
+        self._vectors = self._vectors[keep]
+        self._rebuild()
+
+    def similar(self, alternative_id: str, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """Precomputed nearest alternatives to one alternative; None if unknown."""
+        position = self._positions.get(alternative_id)
+        if position is None:
+            return None
+        return [
+            dict(self._documents[neighbour], similarity=round(float(score), 4))
+            for neighbour, score in zip(self._neighbours[position][:limit], self._scores[position][:limit])
+            if np.isfinite(score)
+        ]
+
+    def for_craving(self, meat_type: str, limit: int = 10, same_meat_type: bool = False) -> List[Dict[str, Any]]:
+        """Alternatives whose nutrients best match what a craving suggests is missing."""
+        profile = self._profiles.get(meat_type)
+        if profile is None:
+            profile = deficiency_profile(None)
+        scores = np.where(self._has_nutrition(), self._vectors @ profile, -np.inf)
+        if same_meat_type:
+            mask = np.array([document.get("meat_type") == meat_type for document in self._documents], dtype=bool)
+            scores = np.where(mask, scores, -np.inf)
+        top = self._top(scores, limit)
+        return [
+            dict(self._documents[position], similarity=round(float(scores[position]), 4))
+            for position in top
+            if np.isfinite(scores[position])
+        ]
+
+    def _rebuild(self):
+        count = len(self._ids)
+        self._neighbours = np.zeros((count, self.k), dtype=np.int64)
+        self._scores = np.full((count, self.k), -np.inf, dtype=np.float32)
+        self._refresh_rows(np.arange(count))
+
+    def _refresh_rows(self, rows: np.ndarray):
+        """Recompute the top-k neighbour lists of `rows` against every alternative."""
+        for start in range(0, len(rows), self.block_size):
+            block = rows[start:start + self.block_size]
+            similarities = self._vectors[block] @ self._vectors.T
+            has_nutrition = self._has_nutrition()
+            similarities[:, ~has_nutrition] = -np.inf
+            similarities[~has_nutrition[block]] = -np.inf
+            similarities[np.arange(len(block)), block] = -np.inf  # not your own neighbour
+            k = min(self.k, similarities.shape[1])
+            # Partition every row of the block at once, then order the k survivors
+            top = np.argpartition(similarities, -k, axis=1)[:, -k:] if k else np.zeros((len(block), 0), dtype=np.int64)
+            scores = np.take_along_axis(similarities, top, axis=1)
+            order = np.argsort(-scores, axis=1, kind="stable")
+            self._neighbours[block, :k] = np.take_along_axis(top, order, axis=1)
+            self._scores[block, :k] = np.take_along_axis(scores, order, axis=1)
+            self._scores[block, k:] = -np.inf
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the `k` highest scores, best first."""
+        if scores.size <= k:
+            return np.argsort(-scores, kind="stable")
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    def _has_nutrition(self) -> np.ndarray:
+        """Alternatives without nutrition data embed to zero and are never suggested."""
+        return self._vectors.any(axis=1)
+
+    def _set_profiles(self, cravings: List[Dict[str, Any]]):
+        deficiencies = {craving["meat_type"]: craving.get("deficiency") for craving in cravings}
+        self._profiles = {meat_type.value: deficiency_profile(deficiencies.get(meat_type.value)) for meat_type in MeatType}
+
+    async def _load(self):
+        alternatives = await self.cache.find("alternatives", {"is_active": {"$ne": False}})
+        cravings = await self.cache.find("meat_cravings")
+        return alternatives, cravings
+
+    @staticmethod
+    def _embed(alternative: Dict[str, Any]) -> np.ndarray:
+        return embed(alternative.get("nutrition_values") or normalize_nutrition(alternative.get("nutrition")))
+
+    @staticmethod
+    def _summary(alternative: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: alternative.get(field) for field in SUMMARY_FIELDS["alternatives"]}
+
+# Create global instance
+similarity_index = SimilarityIndex()
+
+for _collection_name in ("alternatives", "meat_cravings"):
+    catalog_events.subscribe(_collection_name, similarity_index.reload)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Email Delivery Test for CraveKind Backend
+Sends through EmailDispatcher to a local aiosmtpd server and checks that
+accepted, temporarily refused and permanently refused recipients come
+back as sent, retry and rejected
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from aiosmtpd.controller import Controller
+
+# Point the email service at the local server (set before backend/.env is loaded, which does not override)
+os.environ["EMAIL_BACKEND"] = "smtp"
+os.environ["SMTP_SERVER"] = "127.0.0.1"
+os.environ["SMTP_PORT"] = os.environ.get("TEST_SMTP_PORT", "8025")
+os.environ["SMTP_STARTTLS"] = "false"
+os.environ["SMTP_USERNAME"] = ""
+os.environ["SMTP_PASSWORD"] = ""
+os.environ["SMTP_TIMEOUT"] = "5"
+
+from models.email import DeliveryOutcome, OutgoingEmail
+from services.email import EmailService
+from services.email_dispatcher import EmailDispatcher
+
+class RecordingHandler:
+    """Accepts mail, except "busy" (451) and "bounce" (550) recipients"""
+
+    def __init__(self):
+        self.received = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("busy"):
+            return "451 4.3.0 Mailbox busy, try again later"
+        if address.startswith("bounce"):
+            return "550 5.1.1 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.extend(envelope.rcpt_tos)
+        return "250 Message accepted for delivery"
+
+def message(to_email):
+    return OutgoingEmail(to_email=to_email, subject="Delivery test", html_content="<p>Hello</p>", text_content="Hello")
+
+async def deliver_all():
+    dispatcher = EmailDispatcher(EmailService(), pool_size=2)
+    try:
+        batch = [message("first@example.com"), message("busy@example.com"), message("bounce@example.com"), message("last@example.com")]
+        outcomes = await dispatcher.deliver(batch)
+        # A second batch reuses the pooled connection
+        outcomes += await dispatcher.deliver([message("again@example.com")])
+        return outcomes
+    finally:
+        await dispatcher.close()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("📧 CRAVEKIND EMAIL DELIVERY TESTS")
+    print("=" * 60)
+
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=int(os.environ["SMTP_PORT"]))
+    controller.start()
+    try:
+        outcomes = asyncio.run(deliver_all())
+    except Exception as e:
+        print(f"   ✗ Could not deliver to the local SMTP server: {e}")
+        sys.exit(1)
+    finally:
+        controller.stop()
+
+    expected = [
+        ("first@example.com", DeliveryOutcome.SENT),
+        ("busy@example.com", DeliveryOutcome.RETRY),
+        ("bounce@example.com", DeliveryOutcome.REJECTED),
+        ("last@example.com", DeliveryOutcome.SENT),
+        ("again@example.com", DeliveryOutcome.SENT),
+    ]
+    tests_passed = 0
+    for (to_email, wanted), outcome in zip(expected, outcomes):
+        if outcome == wanted:
+            tests_passed += 1
+            print(f"   ✓ {to_email}: {outcome.value}")
+        else:
+            print(f"   ✗ {to_email}: {outcome.value}, expected {wanted.value}")
+
+    sent = [to_email for to_email, wanted in expected if wanted == DeliveryOutcome.SENT]
+    total_tests = len(expected) + 1
+    if handler.received == sent:
+        tests_passed += 1
+        print(f"   ✓ server received {len(sent)} emails")
+    else:
+        print(f"   ✗ server received {handler.received}, expected {sent}")
+
+    print("\n" + "=" * 60)
+    print("📊 EMAIL DELIVERY TEST SUMMARY")
+    print("=" * 60)
+    print(f"✅ Passed: {tests_passed}/{total_tests}")
+
+    if tests_passed == total_tests:
+        print("🎉 EVERY DELIVERY OUTCOME IS CLASSIFIED CORRECTLY!")
+    else:
+        print(f"⚠️  {total_tests - tests_passed} check(s) failed")
+
+    sys.exit(0 if tests_passed == total_tests else 1)
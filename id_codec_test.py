@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Id Codec Test for CraveKind Backend
+Checks how IdCodec encodes filters and updates in each ID_STORAGE mode,
+that decode_ids turns binary UUIDs back into strings, and that
+migrate_ids converts a local MongoDB to binary ids and back unchanged
+"""
+
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+# A scratch database on a local mongod; it is dropped afterwards
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = f"cravekind_id_codec_{os.getpid()}"
+
+from bson.binary import Binary
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from services.id_codec import IdCodec, binary_id, decode_ids, migrate_ids
+
+USER_ID = str(uuid.uuid4())
+ALTERNATIVE_ID = str(uuid.uuid4())
+OTHER_ID = str(uuid.uuid4())
+LEASE_ID = str(uuid.uuid4())
+
+def b(value):
+    return binary_id(value)
+
+def codec_checks():
+    """(name, actual, expected) for the pure encoding functions"""
+    string, dual, binary = IdCodec("string"), IdCodec("dual"), IdCodec("binary")
+    collection = object()
+    checks = [
+        ("string: collections are not wrapped",
+         string.wrap(collection) is collection,
+         True),
+        ("binary: equality",
+         binary.encode_query({"id": USER_ID}),
+         {"id": b(USER_ID)}),
+        ("binary: $in and $ne",
+         binary.encode_query({"user_id": {"$in": [USER_ID, OTHER_ID]}, "target_id": {"$ne": OTHER_ID}}),
+         {"user_id": {"$in": [b(USER_ID), b(OTHER_ID)]}, "target_id": {"$ne": b(OTHER_ID)}}),
+        ("binary: dotted path",
+         binary.encode_query({"event_data.alternative_id": ALTERNATIVE_ID}),
+         {"event_data.alternative_id": b(ALTERNATIVE_ID)}),
+        ("binary: non-UUID and non-id fields unchanged",
+         binary.encode_query({"id": "contact-1", "name": USER_ID}),
+         {"id": "contact-1", "name": USER_ID}),
+        ("dual: equality matches both forms",
+         dual.encode_query({"id": USER_ID}),
+         {"id": {"$in": [b(USER_ID), USER_ID]}}),
+        ("dual: $in",
+         dual.encode_query({"user_id": {"$in": [USER_ID, "legacy"]}}),
+         {"user_id": {"$in": [b(USER_ID), USER_ID, "legacy"]}}),
+        ("dual: $nin",
+         dual.encode_query({"user_id": {"$nin": [USER_ID]}}),
+         {"user_id": {"$nin": [b(USER_ID), USER_ID]}}),
+        ("dual: $eq",
+         dual.encode_query({"id": {"$eq": USER_ID}}),
+         {"id": {"$in": [b(USER_ID), USER_ID]}}),
+        ("dual: $ne",
+         dual.encode_query({"id": {"$ne": USER_ID}}),
+         {"id": {"$nin": [b(USER_ID), USER_ID]}}),
+        ("dual: $all",
+         dual.encode_query({"favorites": {"$all": [ALTERNATIVE_ID, OTHER_ID]}}),
+         {"favorites": {"$all": [
+             {"$elemMatch": {"$in": [b(ALTERNATIVE_ID), ALTERNATIVE_ID]}},
+             {"$elemMatch": {"$in": [b(OTHER_ID), OTHER_ID]}},
+         ]}}),
+        ("dual: dotted path inside $or",
+         dual.encode_query({"$or": [{"event_data.alternative_id": ALTERNATIVE_ID}, {"user_id": None}]}),
+         {"$or": [{"event_data.alternative_id": {"$in": [b(ALTERNATIVE_ID), ALTERNATIVE_ID]}}, {"user_id": None}]}),
+        ("dual: $set writes binary",
+         dual.encode_update({"$set": {"user_id": USER_ID, "name": "Test"}}),
+         {"$set": {"user_id": b(USER_ID), "name": "Test"}}),
+        ("dual: $addToSet writes binary",
+         dual.encode_update({"$addToSet": {"favorites": ALTERNATIVE_ID}}),
+         {"$addToSet": {"favorites": b(ALTERNATIVE_ID)}}),
+        ("dual: $pull removes both forms",
+         dual.encode_update({"$pull": {"favorites": ALTERNATIVE_ID}}),
+         {"$pull": {"favorites": {"$in": [b(ALTERNATIVE_ID), ALTERNATIVE_ID]}}}),
+        ("dual: $pullAll removes both forms",
+         dual.encode_update({"$pullAll": {"favorites": [ALTERNATIVE_ID]}}),
+         {"$pullAll": {"favorites": [b(ALTERNATIVE_ID), ALTERNATIVE_ID]}}),
+        ("binary: $pull",
+         binary.encode_update({"$pull": {"favorites": ALTERNATIVE_ID}}),
+         {"$pull": {"favorites": b(ALTERNATIVE_ID)}}),
+        ("decode_ids: nested documents and lists",
+         decode_ids({"id": b(USER_ID), "favorites": [b(ALTERNATIVE_ID), "legacy"], "event_data": {"alternative_id": b(OTHER_ID)}}),
+         {"id": USER_ID, "favorites": [ALTERNATIVE_ID, "legacy"], "event_data": {"alternative_id": OTHER_ID}}),
+        ("decode_ids: other binaries unchanged",
+         decode_ids({"blob": Binary(b"\x00\x01")}),
+         {"blob": Binary(b"\x00\x01")}),
+    ]
+
+    try:
+        dual.encode_query({"id": {"$lt": USER_ID}})
+        checks.append(("dual: range on an id field is rejected", "accepted", "ValueError"))
+    except ValueError:
+        checks.append(("dual: range on an id field is rejected", "ValueError", "ValueError"))
+    return checks
+
+def sample_documents():
+    now = datetime(2024, 5, 1)
+    return {
+        "users": [
+            {"id": USER_ID, "name": "Test", "favorites": [ALTERNATIVE_ID, OTHER_ID], "created_at": now},
+        ],
+        "analytics": [
+            {"id": str(uuid.uuid4()), "user_id": USER_ID, "event_type": "add_favorite",
+             "event_data": {"alternative_id": ALTERNATIVE_ID}, "timestamp": now},
+            {"id": str(uuid.uuid4()), "user_id": None, "session_id": "session-1", "event_type": "page_view",
+             "event_data": {}, "timestamp": now},
+        ],
+        "contacts": [
+            {"id": "contact-1", "email": "plan.test@example.com", "created_at": now},
+        ],
+        "locks": [
+            {"_id": "reconcile-indexes", "lease_id": LEASE_ID},
+        ],
+    }
+
+async def snapshot(db):
+    return {
+        name: await db[name].find({}, {"_id": 0}).sort("id", 1).to_list(length=None)
+        for name in sorted(await db.list_collection_names())
+    }
+
+async def migrate_round_trip(db):
+    """(name, actual, expected) for migrate_ids to binary and back"""
+    for name, documents in sample_documents().items():
+        await db[name].insert_many(documents)
+    original = await snapshot(db)
+
+    to_binary = await migrate_ids(db, "binary", batch_size=1)
+    users = db["users"]
+    stored = await users.find_one({}, {"_id": 0})
+    lock = await db["locks"].find_one({})
+    again = await migrate_ids(db, "binary")
+    to_string = await migrate_ids(db, "string")
+    restored = await snapshot(db)
+
+    return [
+        ("migrate to binary: documents converted", to_binary["updated"], 3),
+        ("migrate to binary: ids stored as binary", (stored["id"], stored["favorites"]), (b(USER_ID), [b(ALTERNATIVE_ID), b(OTHER_ID)])),
+        ("migrate to binary: locks left alone", lock["lease_id"], LEASE_ID),
+        ("migrate to binary: re-run converts nothing", again["updated"], 0),
+        ("migrate to string: documents converted back", to_string["updated"], 3),
+        ("migrate to string: round trip unchanged", restored, original),
+    ]
+
+async def run_migration():
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"], serverSelectionTimeoutMS=5000)
+    try:
+        return await migrate_round_trip(client[os.environ["DB_NAME"]])
+    finally:
+        await client.drop_database(os.environ["DB_NAME"])
+        client.close()
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("🪪 CRAVEKIND ID CODEC TESTS")
+    print("=" * 60)
+
+    checks = codec_checks()
+    try:
+        checks += asyncio.run(run_migration())
+    except Exception as e:
+        print(f"   ✗ Could not run the id migration against {os.environ['MONGO_URL']}: {e}")
+        sys.exit(1)
+
+    tests_passed = 0
+    for name, actual, expected in checks:
+        if actual == expected:
+            tests_passed += 1
+            print(f"   ✓ {name}")
+        else:
+            print(f"   ✗ {name}: got {actual!r}, expected {expected!r}")
+
+    total_tests = len(checks)
+    print("\n" + "=" * 60)
+    print("📊 ID CODEC TEST SUMMARY")
+    print("=" * 60)
+    print(f"✅ Passed: {tests_passed}/{total_tests}")
+
+    if tests_passed == total_tests:
+        print("🎉 IDS ENCODE, DECODE AND MIGRATE CORRECTLY!")
+    else:
+        print(f"⚠️  {total_tests - tests_passed} check(s) failed")
+
+    sys.exit(0 if tests_passed == total_tests else 1)